@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark headless batch rendering of calendar PNGs.
+
+Renders the calendars of --profiles attendee profiles, made of random
+keyword mixes from the predefined research profiles, with
+save_calendar.save_calendar_batch from one loaded program (the real
+conference data with --file, or a synthetic program of --sessions rows).
+Reports the time per calendar and the process's peak resident memory
+every --every profiles; the script exits with status 1 if the peak grows
+by more than --max-growth MB after the first checkpoint, i.e. if rendering
+leaks figures or cached scores.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import resource
+import tempfile
+import contextlib
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import load_conference_data
+from corpus import SessionCorpus
+from save_calendar import save_calendar_batch
+from tms_planner import RESEARCH_PROFILES
+from synthetic import make_program
+
+
+def make_profiles(n_profiles, seed=0):
+    """Random attendee profiles of 2-4 focus areas with 3-6 keywords each"""
+    rng = random.Random(seed)
+    keywords = sorted({keyword for profile in RESEARCH_PROFILES.values()
+                       for area_keywords in profile["interests"].values() for keyword in area_keywords})
+    profiles = {}
+    for i in range(n_profiles):
+        profiles[f"attendee_{i:04d}"] = {f"Area {area + 1}": rng.sample(keywords, rng.randint(3, 6))
+                                         for area in range(rng.randint(2, 4))}
+    return profiles
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def main():
+    """Run the batch calendar benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark headless batch rendering of calendar PNGs")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=600,
+                      help="Number of synthetic sessions (default: 600)")
+    parser.add_argument("--profiles", "-p", type=int, default=500, help="Number of profiles (default: 500)")
+    parser.add_argument("--every", type=int, default=50, help="Profiles per checkpoint (default: 50)")
+    parser.add_argument("--min-score", "-m", type=int, default=3,
+                      help="Minimum relevance score (default: 3)")
+    parser.add_argument("--dpi", type=int, default=50, help="Resolution of the PNGs (default: 50)")
+    parser.add_argument("--max-growth", type=float, default=50.0,
+                      help="Allowed growth of the peak memory after the first checkpoint in MB (default: 50)")
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        corpus = load_conference_data(args.file) if args.file else SessionCorpus(make_program(args.sessions))
+    if corpus is None:
+        print(f"Error: Could not load {args.file}")
+        return 1
+
+    profiles = list(make_profiles(args.profiles).items())
+    print(f"Rendering {len(profiles)} calendars of {len(corpus)} sessions at {args.dpi} dpi")
+    print(f"{'profiles':>8} {'s/calendar':>11} {'peak RSS':>10}")
+    checkpoints = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for first in range(0, len(profiles), args.every):
+            chunk = dict(profiles[first:first + args.every])
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                save_calendar_batch(corpus, chunk, min_score=args.min_score, output_dir=tmp_dir, dpi=args.dpi)
+            per_calendar = (time.perf_counter() - start) / len(chunk)
+            checkpoints.append(peak_rss_mb())
+            print(f"{first + len(chunk):>8} {per_calendar:>10.3f}s {checkpoints[-1]:>7.1f} MB")
+
+    growth = checkpoints[-1] - checkpoints[0]
+    print(f"\nPeak memory grew by {growth:.1f} MB after the first {args.every} profiles")
+    if growth > args.max_growth:
+        print(f"Memory grew by more than {args.max_growth:.0f} MB: figures or scores are leaking")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the interactive calendar renderers.
+
+Builds the calendar of one research profile (the small case) and of the whole
+program without focus areas (the full case) with the per-session 'traces'
+renderer and the 'batched' renderer, then writes each figure to HTML. Reports
+the number of traces, the time to build and write the figure, and the HTML
+size. Uses the real conference data (--file) or a synthetic program of
+--sessions rows.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import plotly.io as pio
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import load_conference_data
+from corpus import SessionCorpus
+from plotly_viz import create_interactive_calendar, CALENDAR_RENDERERS
+from tms_planner import RESEARCH_PROFILES
+from synthetic import make_program
+
+def main():
+    """Run the calendar rendering benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-session vs batched calendar traces")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=2000,
+                      help="Number of synthetic sessions (default: 2000)")
+    parser.add_argument("--profile", "-p", choices=list(RESEARCH_PROFILES.keys()), default="battery",
+                      help="Research profile of the small case (default: battery)")
+    parser.add_argument("--min-score", "-m", type=int, default=5,
+                      help="Minimum relevance score of the small case (default: 5)")
+    args = parser.parse_args()
+
+    if args.file:
+        corpus = load_conference_data(args.file)
+        if corpus is None:
+            return 1
+    else:
+        corpus = SessionCorpus(make_program(args.sessions))
+
+    cases = [
+        (f"{args.profile} profile, min score {args.min_score}",
+         dict(focus_areas=RESEARCH_PROFILES[args.profile]["interests"], min_score=args.min_score)),
+        ("full program", dict(focus_areas=None, min_score=0)),
+    ]
+
+    print(f"Rendering calendars of {len(corpus)} sessions")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, options in cases:
+            print(f"\n{label}")
+            results = {}
+            for renderer in CALENDAR_RENDERERS:
+                start = time.perf_counter()
+                fig = create_interactive_calendar(corpus, renderer=renderer, **options)
+                build_time = time.perf_counter() - start
+
+                output_file = os.path.join(tmp_dir, f"{renderer}.html")
+                start = time.perf_counter()
+                pio.write_html(fig, output_file, auto_open=False)
+                write_time = time.perf_counter() - start
+
+                results[renderer] = (build_time + write_time, os.path.getsize(output_file))
+                print(f"{renderer:>8}: {len(fig.data):6d} traces, build {build_time:7.3f} s, "
+                      f"write {write_time:7.3f} s, {results[renderer][1] / 1e6:6.2f} MB")
+
+            total, size = results['traces']
+            batched_total, batched_size = results['batched']
+            print(f"Speedup: {total / batched_total:.1f}x, HTML size: {batched_size / size:.0%} of per-session traces")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk PNG export of the interactive calendars.
+
+Builds the calendars of --profiles random attendee profiles, then exports
+them as PNG files twice: with ``fig.write_image`` per figure, which starts a
+kaleido renderer for every image, and through one image_export.ImageExporter,
+which keeps the renderer running. Reports the time per image of both. Needs
+kaleido (and Chrome for kaleido 1.0 and later).
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import load_conference_data
+from corpus import SessionCorpus
+from image_export import ImageExporter
+from plotly_viz import create_interactive_calendar
+from synthetic import make_program
+from bench_batch_calendar import make_profiles
+
+
+def main():
+    """Run the image export benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-figure vs persistent-renderer PNG export")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=600,
+                      help="Number of synthetic sessions (default: 600)")
+    parser.add_argument("--profiles", "-p", type=int, default=20, help="Number of calendars (default: 20)")
+    parser.add_argument("--min-score", "-m", type=int, default=3,
+                      help="Minimum relevance score (default: 3)")
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        corpus = load_conference_data(args.file) if args.file else SessionCorpus(make_program(args.sessions))
+        if corpus is None:
+            print(f"Error: Could not load {args.file}")
+            return 1
+        figures = [create_interactive_calendar(corpus, min_score=args.min_score, focus_areas=focus_areas,
+                                               title=name)
+                   for name, focus_areas in make_profiles(args.profiles).items()]
+
+    print(f"Exporting {len(figures)} calendars of {len(corpus)} sessions as 1600x900 PNGs at scale 2")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        try:
+            for i, fig in enumerate(figures):
+                fig.write_image(os.path.join(tmp_dir, f"single_{i}.png"), width=1600, height=900, scale=2)
+        except Exception as e:
+            print(f"Error: Static image export does not work here: {e}")
+            return 1
+        per_figure = (time.perf_counter() - start) / len(figures)
+
+        with ImageExporter() as exporter:
+            for i, fig in enumerate(figures):
+                exporter.write(fig, os.path.join(tmp_dir, f"bulk_{i}.png"), width=1600, height=900, scale=2)
+            mode = exporter.mode
+        exported = [entry['seconds'] for entry in exporter.timings if entry['ok']]
+        if len(exported) < len(figures):
+            print(f"Error: {len(figures) - len(exported)} images failed with the exporter")
+            return 1
+
+    bulk = sum(exported) / len(exported)
+    print(f"{'write_image':>14}: {per_figure:6.3f} s per image")
+    print(f"{'ImageExporter':>14}: {bulk:6.3f} s per image (first {exported[0]:.3f} s, "
+          f"then {sum(exported[1:]) / max(len(exported) - 1, 1):.3f} s), mode '{mode}'")
+    print(f"Speedup: {per_figure / bulk:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
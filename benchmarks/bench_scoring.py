@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized keyword scoring engine against the per-row scorer.
+
+Times ``df.apply(score_session_relevance, axis=1)`` against
+``scoring.score_sessions`` on the real conference data (--file) or on a
+synthetic program of --sessions rows, and checks that both give the same scores.
+It then compares the per-keyword substring scan with the KeywordAutomaton and
+the n-gram SearchIndex on a large merged profile (all research profiles, plus
+two-word combinations).
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import score_session_relevance, load_conference_data
+from scoring import score_sessions, build_session_text, keyword_match_matrix
+from search_index import SearchIndex
+from tms_planner import RESEARCH_PROFILES
+from synthetic import WORDS, FILLER
+
+def make_sessions(n_sessions, seed=0):
+    """Create a synthetic conference table with TMS-like text columns"""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS + FILLER * 6)
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2025-03-23') + pd.to_timedelta(rng.integers(0, 5, n_sessions), unit='D'),
+        'Start': [f"{h:02d}:{m:02d}" for h, m in zip(rng.integers(8, 17, n_sessions),
+                                                      rng.choice([0, 20, 40], n_sessions))],
+        'Location': [f"Room - {r}" for r in rng.integers(100, 140, n_sessions)],
+        'Symposium': [f"Symposium {s}" for s in rng.integers(0, 80, n_sessions)],
+        'Title': [' '.join(rng.choice(words, 8)).title() for _ in range(n_sessions)],
+        'Description': [' '.join(rng.choice(words, 120)) for _ in range(n_sessions)],
+        'Speaker': [f"Speaker {i}" for i in range(n_sessions)],
+        'SpeakerAffiliation': [f"University {a}" for a in rng.integers(0, 400, n_sessions)],
+        'Type': rng.choice(['Oral', 'Invited', 'Poster'], n_sessions),
+        'Track': [f"Track {t}" for t in rng.integers(0, 12, n_sessions)],
+    })
+
+def main():
+    """Run the scoring benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs vectorized session scoring")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=20000,
+                      help="Number of synthetic sessions (default: 20000)")
+    parser.add_argument("--profile", "-p", choices=list(RESEARCH_PROFILES.keys()), default="am",
+                      help="Research profile to score against (default: am)")
+    args = parser.parse_args()
+
+    if args.file:
+        corpus = load_conference_data(args.file)
+        if corpus is None:
+            return 1
+        df = corpus.df
+    else:
+        df = make_sessions(args.sessions)
+    focus_areas = RESEARCH_PROFILES[args.profile]["interests"]
+    n_keywords = sum(len(keywords) for keywords in focus_areas.values())
+    print(f"Scoring {len(df)} sessions against {n_keywords} keywords ({args.profile} profile)")
+
+    start = time.perf_counter()
+    row_scores = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+    row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_scores, matches = score_sessions(df, focus_areas)
+    vector_time = time.perf_counter() - start
+
+    if not (row_scores == vector_scores).all():
+        print("Error: vectorized scores differ from per-row scores")
+        return 1
+
+    print(f"df.apply(score_session_relevance): {row_time:8.3f} s")
+    print(f"score_sessions (vectorized):       {vector_time:8.3f} s")
+    print(f"Speedup: {row_time / vector_time:.1f}x  (match matrix: {matches.shape[0]} x {matches.shape[1]})")
+
+    # Large merged profile: every research profile keyword plus two-word phrases
+    merged = {}
+    for name, data in RESEARCH_PROFILES.items():
+        for area, keywords in data["interests"].items():
+            merged[f"{name}: {area}"] = keywords
+    words = sorted({keyword.lower() for keywords in merged.values() for keyword in keywords})
+    merged["Phrases"] = [f"{a} {b}" for a in words[:15] for b in words[:15] if a != b]
+    n_keywords = len({keyword.lower() for keywords in merged.values() for keyword in keywords})
+    print(f"\nMatching {n_keywords} distinct keywords (merged profile)")
+
+    text = build_session_text(df)
+    start = time.perf_counter()
+    search_index = SearchIndex(df, text)
+    print(f"SearchIndex build: {time.perf_counter() - start:8.3f} s")
+
+    timings = {}
+    results = {}
+    for method in ['substring', 'automaton', 'index']:
+        start = time.perf_counter()
+        results[method] = keyword_match_matrix(text, merged, method=method, search_index=search_index)
+        timings[method] = time.perf_counter() - start
+        print(f"{method:>10}: {timings[method]:8.3f} s")
+
+    for method in ['automaton', 'index']:
+        if not results['substring'].equals(results[method]):
+            print(f"Error: {method} matches differ from substring matches")
+            return 1
+        print(f"{method} speedup: {timings['substring'] / timings[method]:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
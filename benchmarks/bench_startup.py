@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the startup time of the command-line entry points.
+
+Runs each command in a fresh interpreter with ``python -X importtime`` and
+reports the best wall time, the total import time and which heavy libraries
+(pandas, numpy, matplotlib, seaborn, plotly) were imported. Commands that
+only need the profile definitions, e.g. ``tms_planner.py --list-profiles``,
+must not import any of them, and schedule commands must not import the
+plotting libraries; the script exits with status 1 if one does.
+
+The schedule commands run on the real conference data (--file) or on a
+synthetic program of --sessions rows.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly')
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'plotly')
+
+
+def commands(data_file, tmp_dir):
+    """The commands to time, as (name, script, arguments, modules it must not import)"""
+    planner = os.path.join(SRC_DIR, 'tms_planner.py')
+    template = os.path.join(tmp_dir, 'template.json')
+    return [
+        ('planner --help', planner, ['--help'], HEAVY_MODULES),
+        ('planner --list-profiles', planner, ['--list-profiles'], HEAVY_MODULES),
+        ('planner --template', planner, ['--template', template], HEAVY_MODULES),
+        ('planner -p battery', planner, ['-p', 'battery', '-f', data_file], PLOTTING_MODULES),
+        ('planner -p battery --optimize', planner, ['-p', 'battery', '--optimize', '-f', data_file],
+         PLOTTING_MODULES),
+        ('planner --profiles all', planner, ['--profiles', 'all', '-f', data_file], PLOTTING_MODULES),
+        ('client --help', os.path.join(SRC_DIR, 'tms_client.py'), ['--help'], HEAVY_MODULES),
+        ('plotly_viz --help', os.path.join(SRC_DIR, 'plotly_viz.py'), ['--help'], PLOTTING_MODULES),
+    ]
+
+
+def parse_importtime(stderr):
+    """
+    Read the output of ``python -X importtime``.
+
+    Parameters:
+    -----------
+    stderr : str
+        Standard error of the process
+
+    Returns:
+    --------
+    tuple
+        (total import time in seconds, set of imported top-level packages)
+    """
+    total_us = 0
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):  # Top-level import; nested ones are in its cumulative time
+            total_us += int(cumulative)
+        packages.add(name.strip().split('.')[0])
+    return total_us / 1e6, packages
+
+
+def time_command(script, arguments, repeat):
+    """Run a command ``repeat`` times, returning the best wall time, its import time and its imports"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', script] + arguments,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                 env=dict(os.environ, MPLBACKEND='Agg'))
+        elapsed = time.perf_counter() - start
+        if process.returncode != 0:
+            raise RuntimeError(f"exit status {process.returncode}: {process.stderr.strip()[-500:]}")
+        if best is None or elapsed < best[0]:
+            best = (elapsed,) + parse_importtime(process.stderr)
+    return best
+
+
+def main():
+    """Time every command and check which libraries it imports"""
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of the planner commands")
+    parser.add_argument("--file", "-f", help="TMS Excel file for the schedule commands (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=2000,
+                      help="Number of synthetic sessions if no file is given (default: 2000)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per command (default: 3)")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = args.file
+        if not data_file:
+            from synthetic import make_program
+            data_file = os.path.join(tmp_dir, 'program.xlsx')
+            make_program(args.sessions).to_excel(data_file, index=False)
+
+        print(f"{'command':<32} {'wall':>8} {'imports':>8}  heavy modules")
+        for name, script, arguments, forbidden in commands(data_file, tmp_dir):
+            try:
+                wall, imports, packages = time_command(script, arguments, args.repeat)
+            except RuntimeError as e:
+                print(f"{name:<32} failed: {e}")
+                failures.append(f"{name}: {e}")
+                continue
+            heavy = [module for module in HEAVY_MODULES if module in packages]
+            unexpected = [module for module in forbidden if module in packages]
+            status = f"  UNEXPECTED: {', '.join(unexpected)}" if unexpected else ""
+            print(f"{name:<32} {wall:7.3f}s {imports:7.3f}s  {', '.join(heavy) or '-'}{status}")
+            if unexpected:
+                failures.append(f"{name} imports {', '.join(unexpected)}")
+
+    if failures:
+        print(f"\n{len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the matplotlib calendar renderers.
+
+Draws the calendar of one research profile and of the whole program without
+focus areas with the per-session 'patches' renderer and the 'collection'
+renderer of visualize_schedule_calendar, then saves each figure as a PNG.
+Reports the number of labels drawn and the time to build and save the
+figure. Uses the real conference data (--file) or a synthetic program of
+--sessions rows; large programs put many rooms on each day, so their blocks
+are too narrow for labels.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import load_conference_data, visualize_schedule_calendar, load_pyplot, MATPLOTLIB_RENDERERS
+from corpus import SessionCorpus
+from tms_planner import RESEARCH_PROFILES
+from synthetic import make_program
+
+def main():
+    """Run the static calendar rendering benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-session patches vs collection calendar rendering")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (default: synthetic data)")
+    parser.add_argument("--sessions", "-n", type=int, default=3000,
+                      help="Number of synthetic sessions (default: 3000)")
+    parser.add_argument("--profile", "-p", choices=list(RESEARCH_PROFILES.keys()), default="battery",
+                      help="Research profile of the focus area case (default: battery)")
+    parser.add_argument("--min-score", "-m", type=int, default=3,
+                      help="Minimum relevance score of the focus area case (default: 3)")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolution of the saved PNG (default: 300)")
+    args = parser.parse_args()
+
+    if args.file:
+        corpus = load_conference_data(args.file)
+        if corpus is None:
+            return 1
+    else:
+        corpus = SessionCorpus(make_program(args.sessions))
+
+    plt = load_pyplot()
+    cases = [
+        (f"{args.profile} profile, min score {args.min_score}",
+         dict(focus_areas=RESEARCH_PROFILES[args.profile]["interests"], min_score=args.min_score)),
+        ("full program", dict(focus_areas=None, min_score=0)),
+    ]
+
+    rooms = corpus.df.groupby(corpus.days)['Location'].nunique().max()
+    print(f"Drawing calendars of {len(corpus)} sessions (up to {rooms} rooms per day) at {args.dpi} dpi")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, options in cases:
+            print(f"\n{label}")
+            totals = {}
+            for renderer in MATPLOTLIB_RENDERERS:
+                start = time.perf_counter()
+                fig = visualize_schedule_calendar(corpus, renderer=renderer, **options)
+                build_time = time.perf_counter() - start
+
+                output_file = os.path.join(tmp_dir, f"{renderer}.png")
+                start = time.perf_counter()
+                fig.savefig(output_file, dpi=args.dpi, bbox_inches='tight')
+                save_time = time.perf_counter() - start
+
+                labels = sum(len(ax.texts) for ax in fig.axes)
+                plt.close(fig)
+                totals[renderer] = build_time + save_time
+                print(f"{renderer:>10}: {labels:6d} labels, build {build_time:7.3f} s, save {save_time:7.3f} s")
+
+            print(f"Speedup: {totals['patches'] / totals['collection']:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Run the planner benchmark suite and write the timings to JSON.
+
+Each benchmark runs on synthetic programs (see synthetic.py) of every size
+given with --sizes, --repeat times; the best and median run times are
+written to --output together with the environment, so runs can be compared
+across commits. With --baseline, the results are compared with an earlier
+JSON file and any benchmark more than --tolerance slower is reported as a
+regression (exit status 1).
+
+Benchmarks:
+
+- load_excel / load_cached: load_conference_data from an Excel file, without
+  and with the binary data cache (up to --max-excel-sessions)
+- build_corpus: SessionCorpus construction (text, dates, times) and the search index
+- score_rows: df.apply(score_session_relevance) (up to --max-row-sessions)
+- score_sessions: the vectorized scorer
+- featurizer: user_customized_featurizer without cached keyword hits or the calendar
+- conflicts: session_conflicts over the whole program
+- symposium_report: generate_symposium_report
+- csv_export: export_sessions_to_csv
+- calendar_<renderer>: create_interactive_calendar and its HTML, for every
+  renderer ('traces' only up to --max-trace-sessions)
+
+Example:
+
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 -o results.json
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --baseline results.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import load_conference_data, score_session_relevance, user_customized_featurizer
+from corpus import SessionCorpus
+from conflicts import session_conflicts
+from keyword_cache import clear_shared_caches
+from plotly_viz import (create_interactive_calendar, export_sessions_to_csv, generate_symposium_report,
+                        CALENDAR_RENDERERS)
+from scoring import score_sessions
+from tms_planner import RESEARCH_PROFILES
+from synthetic import make_program
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+class Skip(Exception):
+    """Raised by a benchmark's setup when it does not run at this size"""
+
+
+def fresh_corpus(context):
+    """A new corpus over the program that shares its text, with no cached keyword hits"""
+    clear_shared_caches()
+    corpus = context['corpus']
+    return SessionCorpus(corpus.df, text=corpus.text, dates=corpus.dates)
+
+
+def excel_file(context):
+    """Write the program to an Excel file once per size (not timed)"""
+    if len(context['df']) > context['args'].max_excel_sessions:
+        raise Skip(f"more than --max-excel-sessions {context['args'].max_excel_sessions}")
+    if 'excel_file' not in context:
+        context['excel_file'] = os.path.join(context['tmp_dir'], f"program_{len(context['df'])}.xlsx")
+        context['df'].to_excel(context['excel_file'], index=False)
+    return context['excel_file']
+
+
+def bench_load_excel(context):
+    path = excel_file(context)
+    return lambda: load_conference_data(path, use_cache=False)
+
+
+def bench_load_cached(context):
+    path = excel_file(context)
+    load_conference_data(path, rebuild_cache=True)
+    return lambda: load_conference_data(path)
+
+
+def bench_build_corpus(context):
+    return lambda: SessionCorpus(context['df']).build_search_index()
+
+
+def bench_score_rows(context):
+    if len(context['df']) > context['args'].max_row_sessions:
+        raise Skip(f"more than --max-row-sessions {context['args'].max_row_sessions}")
+    df, interests = context['corpus'].df, context['interests']
+    return lambda: df.apply(lambda row: score_session_relevance(row, interests), axis=1)
+
+
+def bench_score_sessions(context):
+    corpus, interests, weights = context['corpus'], context['interests'], context['weights']
+    return lambda: score_sessions(corpus.df, interests, weights, text=corpus.text)
+
+
+def bench_featurizer(context):
+    def run():
+        user_customized_featurizer(fresh_corpus(context), context['interests'], context['weights'],
+                                   min_score=context['args'].min_score, show_calendar=False)
+    return run
+
+
+def bench_conflicts(context):
+    return lambda: session_conflicts(context['corpus'])
+
+
+def bench_symposium_report(context):
+    return lambda: generate_symposium_report(context['corpus'], context['interests'], context['args'].min_score)
+
+
+def bench_csv_export(context):
+    output_file = os.path.join(context['tmp_dir'], 'sessions.csv')
+    return lambda: export_sessions_to_csv(context['corpus'], context['interests'], context['args'].min_score,
+                                          output_file)
+
+
+def calendar_benchmark(renderer):
+    """Create the benchmark of one calendar renderer"""
+    def bench(context):
+        if renderer == 'traces' and len(context['df']) > context['args'].max_trace_sessions:
+            raise Skip(f"more than --max-trace-sessions {context['args'].max_trace_sessions}")
+
+        def run():
+            fig = create_interactive_calendar(context['corpus'], min_score=context['args'].min_score,
+                                              focus_areas=context['interests'], renderer=renderer)
+            return pio.to_html(fig, include_plotlyjs=False)
+        return run
+    return bench
+
+
+BENCHMARKS = {
+    'load_excel': bench_load_excel,
+    'load_cached': bench_load_cached,
+    'build_corpus': bench_build_corpus,
+    'score_rows': bench_score_rows,
+    'score_sessions': bench_score_sessions,
+    'featurizer': bench_featurizer,
+    'conflicts': bench_conflicts,
+    'symposium_report': bench_symposium_report,
+    'csv_export': bench_csv_export,
+}
+BENCHMARKS.update({f"calendar_{renderer}": calendar_benchmark(renderer) for renderer in CALENDAR_RENDERERS})
+
+
+def time_runs(func, repeat):
+    """Run a function ``repeat`` times with its output discarded, returning the run times"""
+    times = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def environment():
+    """Describe the machine and library versions the benchmarks ran with"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+    }
+
+
+def compare(results, baseline, tolerance, min_seconds=0.0):
+    """
+    Compare benchmark results with a baseline.
+
+    Parameters:
+    -----------
+    results : list of dict
+        Results of this run
+    baseline : dict
+        Contents of an earlier results file
+    tolerance : float
+        Allowed slowdown of the best run time, e.g. 0.25 for 25%
+    min_seconds : float, optional
+        Slowdowns smaller than this are timer noise, not regressions (default: 0)
+
+    Returns:
+    --------
+    list of str
+        One line per regression
+    """
+    previous = {(result['name'], result['sessions']): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result['name'], result['sessions']))
+        if old is None or 'best' not in old or 'best' not in result:
+            continue
+        ratio = result['best'] / old['best'] if old['best'] > 0 else 1.0
+        slower = ratio > 1 + tolerance and result['best'] - old['best'] > min_seconds
+        status = "REGRESSION" if slower else ""
+        print(f"{result['name']:>20} {result['sessions']:>8}: {old['best']:9.4f} s -> {result['best']:9.4f} s "
+              f"({ratio:5.2f}x) {status}")
+        if status:
+            regressions.append(f"{result['name']} ({result['sessions']} sessions): {ratio:.2f}x slower")
+    return regressions
+
+
+def main():
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark the TMS planner on synthetic programs")
+    parser.add_argument("--sizes", "-s", type=int, nargs="+", default=DEFAULT_SIZES,
+                      help=f"Program sizes in sessions (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), metavar="NAME",
+                      help=f"Only run these benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per benchmark (default: 3)")
+    parser.add_argument("--profile", "-p", choices=list(RESEARCH_PROFILES.keys()), default="battery",
+                      help="Research profile to score against (default: battery)")
+    parser.add_argument("--min-score", "-m", type=float, default=5,
+                      help="Minimum relevance score for reports and calendars (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic programs (default: 0)")
+    parser.add_argument("--max-excel-sessions", type=int, default=20000,
+                      help="Largest program to write to Excel for the load benchmarks (default: 20000)")
+    parser.add_argument("--max-row-sessions", type=int, default=20000,
+                      help="Largest program for the per-row scorer (default: 20000)")
+    parser.add_argument("--max-trace-sessions", type=int, default=20000,
+                      help="Largest program for the per-session 'traces' calendar renderer (default: 20000)")
+    parser.add_argument("--output", "-o", default="benchmark_results.json",
+                      help="JSON file to write the results to (default: benchmark_results.json)")
+    parser.add_argument("--baseline", "-b", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                      help="Allowed slowdown against the baseline (default: 0.25, i.e. 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                      help="Ignore slowdowns smaller than this many seconds (default: 0.01)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read baseline {args.baseline}: {e}")
+            return 1
+
+    profile = RESEARCH_PROFILES[args.profile]
+    names = args.only or list(BENCHMARKS)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_sessions in args.sizes:
+            print(f"\nProgram of {n_sessions} sessions")
+            start = time.perf_counter()
+            df = make_program(n_sessions, args.seed)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                corpus = SessionCorpus(df)
+                corpus.build_search_index()
+            print(f"{'(generate)':>20}: {time.perf_counter() - start:9.4f} s")
+            context = {'df': df, 'corpus': corpus, 'interests': profile['interests'],
+                       'weights': profile.get('weights'), 'tmp_dir': tmp_dir, 'args': args}
+
+            for name in names:
+                result = {'name': name, 'sessions': n_sessions}
+                try:
+                    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                        func = BENCHMARKS[name](context)
+                except Skip as e:
+                    result['skipped'] = str(e)
+                    print(f"{name:>20}: skipped ({e})")
+                    results.append(result)
+                    continue
+
+                times = time_runs(func, args.repeat)
+                result.update(best=min(times), median=statistics.median(times), runs=times)
+                results.append(result)
+                print(f"{name:>20}: {result['best']:9.4f} s (median {result['median']:.4f} s)")
+
+    report = {
+        'environment': environment(),
+        'settings': {'profile': args.profile, 'min_score': args.min_score, 'repeat': args.repeat,
+                     'seed': args.seed},
+        'results': results,
+    }
+    try:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    except OSError as e:
+        print(f"Error: Could not write {args.output}: {e}")
+        return 1
+
+    if baseline is not None:
+        print(f"\nComparison with {args.baseline}:")
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Synthetic TMS-shaped conference programs for the benchmarks.
+
+make_program builds a program with the column schema of the TMS workbook
+(Date, Start, End, Location, Symposium, Session, Title, Description, Speaker,
+SpeakerAffiliation, Type, AbstractType, Track, AllAuthors) and the structure
+of a real meeting: symposia belong to tracks, each session is a half-day
+block of back-to-back 20 minute talks in one room, and rooms run in
+parallel over five days. Text is drawn from a materials-science vocabulary
+that overlaps the research profile keywords, and a small share of rows
+carries the quirks of the real data: end times written in 12-hour format
+and missing descriptions.
+
+Run it directly to write a program to an Excel or CSV file:
+
+    python benchmarks/synthetic.py -n 20000 -o program.xlsx
+"""
+
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+WORDS = ("battery lithium cathode machine learning deep neural network AI titanium aluminum "
+         "defect TEM coating simulation DFT quantum corrosion oxidation additive manufacturing "
+         "LPBF powder microstructure grain phase steel data analysis alloy interface thermal "
+         "mechanical properties residual stress texture fatigue creep").split()
+FILLER = ("the of and in to we for with on by this is are from results study show using "
+          "present approach effect behavior samples during between these high method both "
+          "observed temperature results model novel different process").split()
+
+FIRST_NAMES = ("Alex Maria Wei Priya Jonas Fatima Kenji Laura Omar Sofia Daniel Mei Ahmed Elena "
+               "Lucas Aisha Hiroshi Anna Carlos Ingrid Ravi Chloe Mateo Yuki").split()
+LAST_NAMES = ("Smith Garcia Chen Patel Müller Kim Nguyen Rossi Kowalski Silva Tanaka Johnson "
+              "Ahmed Novak Schmidt Li Okafor Dubois Larsen Gupta Moreau Ivanova Park Costa").split()
+AFFILIATIONS = ("University", "Institute of Technology", "National Laboratory", "Research Center",
+                "Corporation", "State University")
+
+# Talks per half-day session block, and the start of the morning and afternoon blocks
+TALKS_PER_BLOCK = 10
+TALK_MINUTES = 20
+BLOCK_STARTS = (8 * 60 + 30, 14 * 60)
+N_DAYS = 5
+FIRST_DAY = pd.Timestamp('2025-03-23')
+
+
+def _texts(rng, words, n, length):
+    """Join ``length`` random words per row into n strings"""
+    picks = rng.choice(np.asarray(words), size=(n, length))
+    return [' '.join(row) for row in picks]
+
+
+def _format_minutes(minutes):
+    """Format minutes since midnight as 'HH:MM:SS' strings"""
+    minutes = np.asarray(minutes) % (24 * 60)
+    return [f"{h:02d}:{m:02d}:00" for h, m in zip(minutes // 60, minutes % 60)]
+
+
+def make_program(n_sessions, seed=0, reversed_share=0.005, missing_description_share=0.02):
+    """
+    Create a synthetic conference program with the TMS workbook's columns.
+
+    Parameters:
+    -----------
+    n_sessions : int
+        Number of talks (rows) to generate
+    seed : int, optional
+        Random seed; the same seed always gives the same program (default: 0)
+    reversed_share : float, optional
+        Share of talks whose end time is written in 12-hour format, so it
+        appears before the start (default: 0.005)
+    missing_description_share : float, optional
+        Share of talks without a description (default: 0.02)
+
+    Returns:
+    --------
+    pandas DataFrame
+        One row per talk, in program order (day, room, time)
+    """
+    rng = np.random.default_rng(seed)
+    n_blocks = -(-n_sessions // TALKS_PER_BLOCK)
+    blocks_per_room = N_DAYS * len(BLOCK_STARTS)
+    n_rooms = max(1, -(-n_blocks // blocks_per_room))
+    n_symposia = max(1, n_sessions // 60)
+    n_tracks = min(12, n_symposia)
+
+    # Session blocks fill the rooms day by day; each block belongs to one symposium
+    block = np.arange(n_sessions) // TALKS_PER_BLOCK
+    slot = np.arange(n_sessions) % TALKS_PER_BLOCK
+    block_slot = block // n_rooms
+    room = block % n_rooms
+    day = block_slot // len(BLOCK_STARTS)
+    block_symposium = rng.integers(0, n_symposia, n_blocks)
+    symposium = block_symposium[block]
+
+    start = np.asarray(BLOCK_STARTS)[block_slot % len(BLOCK_STARTS)] + slot * TALK_MINUTES
+    end = start + TALK_MINUTES
+    end_text = _format_minutes(end)
+    afternoon = np.flatnonzero((end >= 13 * 60) & (rng.random(n_sessions) < reversed_share * 2))
+    for i in afternoon:
+        end_text[i] = _format_minutes([end[i] - 12 * 60])[0]
+
+    descriptions = _texts(rng, WORDS + FILLER * 6, n_sessions, 90)
+    for i in np.flatnonzero(rng.random(n_sessions) < missing_description_share):
+        descriptions[i] = np.nan
+
+    speakers = [f"{first} {last}" for first, last in zip(rng.choice(FIRST_NAMES, n_sessions),
+                                                         rng.choice(LAST_NAMES, n_sessions))]
+    affiliations = [f"{name} {kind}" for name, kind in zip(rng.choice(LAST_NAMES, n_sessions),
+                                                           rng.choice(AFFILIATIONS, n_sessions))]
+    coauthors = _texts(rng, LAST_NAMES, n_sessions, 3)
+
+    talk_type = rng.choice(['Oral', 'Invited', 'Keynote'], n_sessions, p=[0.8, 0.17, 0.03])
+    return pd.DataFrame({
+        'Date': FIRST_DAY + pd.to_timedelta(day, unit='D'),
+        'Start': _format_minutes(start),
+        'End': end_text,
+        'Location': [f"Room {100 + r}" for r in room],
+        'Symposium': [f"Symposium {s}: {' '.join(WORDS[s % len(WORDS)::7][:3]).title()}" for s in symposium],
+        'Session': [f"Session {b}" for b in block],
+        'Title': [title.title() for title in _texts(rng, WORDS, n_sessions, 8)],
+        'Description': descriptions,
+        'Speaker': speakers,
+        'SpeakerAffiliation': affiliations,
+        'Type': talk_type,
+        'AbstractType': np.where(talk_type == 'Oral', 'Oral Presentation', 'Invited Talk'),
+        'Track': [f"Track {s % n_tracks}" for s in symposium],
+        'AllAuthors': [f"{speaker}; {authors.replace(' ', '; ')}" for speaker, authors in zip(speakers, coauthors)],
+    })
+
+
+def main():
+    """Write a synthetic program to a file"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic TMS-shaped conference program")
+    parser.add_argument("--sessions", "-n", type=int, default=1000,
+                      help="Number of talks (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", "-o", required=True,
+                      help="Output file (.xlsx or .csv)")
+    args = parser.parse_args()
+
+    df = make_program(args.sessions, args.seed)
+    if args.output.endswith('.csv'):
+        df.to_csv(args.output, index=False)
+    else:
+        df.to_excel(args.output, index=False)
+    print(f"Wrote {len(df)} sessions to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
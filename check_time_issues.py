@@ -3,54 +3,54 @@
 Check for time issues in the TMS dataset
 """
 
-import pandas as pd
-from datetime import datetime, timedelta
-
-# Load the data
-df = pd.read_excel('data/TMS2025AI_Excel_02-21-2025.xlsx')
-
-# Function to convert time string to datetime
-def time_to_datetime(time_str):
-    try:
-        if isinstance(time_str, str):
-            # Try standard format
-            return datetime.strptime(time_str, '%H:%M:%S')
-        elif hasattr(time_str, 'hour') and hasattr(time_str, 'minute'):
-            return datetime(1900, 1, 1, time_str.hour, time_str.minute, 0)
-        else:
-            return None
-    except Exception as e:
-        print(f"Error parsing time {time_str}: {e}")
-        return None
-
-# Find extremely short sessions (less than 15 minutes)
-short_sessions = []
-for i in range(len(df)):
-    # Parse times
-    start_time = time_to_datetime(df.iloc[i].Start)
-    end_time = time_to_datetime(df.iloc[i].End)
-    
-    if start_time and end_time:
-        # Calculate duration
-        duration = end_time - start_time
-        
-        # Check if duration is negative or very short
-        if duration.total_seconds() < 900:  # Less than 15 minutes (900 seconds)
-            short_sessions.append((i, duration))
-
-# Report the issues
-print(f"Found {len(short_sessions)} sessions shorter than 15 minutes out of {len(df)} sessions:")
-print()
-
-# Sort by duration
-short_sessions.sort(key=lambda x: x[1])
-
-# Show the shortest sessions
-for i in range(min(20, len(short_sessions))):
-    row_idx, duration = short_sessions[i]
-    print(f"Row {row_idx}: Start={df.iloc[row_idx].Start}, End={df.iloc[row_idx].End}")
-    print(f"Duration: {duration}")
-    print(f"Title: {df.iloc[row_idx].Title}")
-    print(f"Room: {df.iloc[row_idx].Location}")
-    print(f"Symposium: {df.iloc[row_idx].Symposium}")
-    print("-" * 80) 
\ No newline at end of file
+import os
+import sys
+import argparse
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from analyze_tms import load_conference_data, find_data_file
+
+def main():
+    """Report unparseable, reversed and very short sessions"""
+    parser = argparse.ArgumentParser(description="Check the session times of the TMS dataset")
+    parser.add_argument("--file", "-f", help="Path to the TMS Excel file (auto-detected if not specified)")
+    parser.add_argument("--min-minutes", type=int, default=15,
+                      help="Report sessions shorter than this many minutes (default: 15)")
+    parser.add_argument("--limit", "-n", type=int, default=20,
+                      help="Number of short sessions to show (default: 20)")
+    args = parser.parse_args()
+
+    # Load the data; the loader normalizes the times and reports the problems it fixed
+    file_path = args.file or find_data_file()
+    if not file_path:
+        print("Error: Could not find the Excel file. Please provide the file path with --file option.")
+        return 1
+    corpus = load_conference_data(file_path)
+    if corpus is None:
+        return 1
+    df = corpus.df
+
+    # Find extremely short sessions, using the normalized times
+    duration = df['end_minutes'] - df['start_minutes']
+    is_short = duration < args.min_minutes
+    short_sessions = df[is_short].assign(duration=duration[is_short])
+    short_sessions = short_sessions.sort_values('duration', kind='stable')
+
+    # Report the issues
+    print(f"\nFound {len(short_sessions)} sessions shorter than {args.min_minutes} minutes "
+          f"out of {len(df)} sessions:")
+    print()
+
+    # Show the shortest sessions
+    for row_idx, session in short_sessions.head(args.limit).iterrows():
+        print(f"Row {row_idx}: Start={session['Start']}, End={session['End']}")
+        print(f"Duration: {session['duration']} minutes")
+        print(f"Title: {session['Title']}")
+        print(f"Room: {session['Location']}")
+        print(f"Symposium: {session['Symposium']}")
+        print("-" * 80)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
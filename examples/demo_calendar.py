@@ -10,9 +10,9 @@ import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import argparse
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-from src.analyze_tms import visualize_schedule_calendar, find_data_file, load_conference_data
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from analyze_tms import visualize_schedule_calendar, find_data_file, load_conference_data
 
 def create_sample_data():
     """Create a sample dataset for demonstration"""
@@ -126,7 +126,8 @@ def main():
     
     if file_path:
         print(f"Using real conference data from: {file_path}")
-        df = load_conference_data(file_path)
+        corpus = load_conference_data(file_path)
+        df = corpus.df if corpus is not None else None
     else:
         print("Real data file not found. Creating sample data for demonstration.")
         df = create_sample_data()
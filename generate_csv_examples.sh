@@ -10,22 +10,11 @@ mkdir -p examples
 # Define profiles and minimum score
 profiles=("battery" "ml" "am" "quantum" "corrosion")
 min_score=5
+jobs=$(python3 -c "import os; print(os.cpu_count() or 1)")  # Render profiles in parallel
 
-# Process all profiles
-for profile in "${profiles[@]}"; do
-    echo -e "\n=== Generating reports for ${profile} profile ==="
-    # Generate CSV and symposium report
-    python3 src/plotly_viz.py --profile $profile --min-score $min_score --csv --symposium --output examples/${profile}_calendar.html
-    # Move files to examples directory
-    mv ${profile}_sessions.csv examples/${profile}_sessions.csv
-    mv ${profile}_symposiums.txt examples/${profile}_symposiums.txt
-done
-
-# Process NVIDIA profile separately as it uses a custom interests file
-echo -e "\n=== Generating reports for nvidia profile ==="
-python3 src/plotly_viz.py --interests nvidia_profile.json --min-score $min_score --csv --symposium --output examples/nvidia_calendar.html
-mv nvidia_profile_sessions.csv examples/nvidia_profile_sessions.csv
-mv nvidia_profile_symposiums.txt examples/nvidia_profile_symposiums.txt
+# Score all profiles in a single process so the data is loaded and scanned once
+python3 src/generate_examples.py --profiles "${profiles[@]}" --interests nvidia_profile.json \
+    --min-score $min_score --csv --symposium --output-dir examples --jobs $jobs
 
 echo -e "\nAll CSV files and symposium reports have been generated."
 echo "Check the examples directory for the new files:"
@@ -2,17 +2,38 @@
 # Licensed under the Apache License, Version 2.0
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import matplotlib.dates as mdates
-import matplotlib.colors as mcolors
-import matplotlib.patches as mpatches
 import os
 import sys
 
-# Set style for better visualizations
-sns.set_theme(style="whitegrid")
+from scoring import area_match_matrix, interest_matches, matched_keywords
+from corpus import SessionCorpus, as_corpus, print_time_report
+from data_cache import read_excel_cached, keyword_cache_path
+from conflicts import session_conflicts
+from instrumentation import stage
+
+# matplotlib and seaborn take about a second to import, so they are only
+# loaded by the functions that draw (see load_pyplot)
+_pyplot = None
+
+def load_pyplot():
+    """
+    Import matplotlib's pyplot on first use and set the plot style.
+    
+    Returns:
+    --------
+    module
+        matplotlib.pyplot
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        # Set style for better visualizations
+        sns.set_theme(style="whitegrid")
+        _pyplot = plt
+    return _pyplot
 
 def find_data_file(filename='TMS2025AI_Excel_02-21-2025.xlsx'):
     """
@@ -43,10 +64,11 @@ def find_data_file(filename='TMS2025AI_Excel_02-21-2025.xlsx'):
     ]
     
     # Check each path
-    for path in possible_paths:
-        if os.path.exists(path):
-            print(f"Found data file at: {path}")
-            return path
+    with stage('find_data_file'):
+        for path in possible_paths:
+            if os.path.exists(path):
+                print(f"Found data file at: {path}")
+                return path
     
     # If we get here, file was not found
     print(f"Could not find data file: {filename}")
@@ -56,7 +78,32 @@ def find_data_file(filename='TMS2025AI_Excel_02-21-2025.xlsx'):
     
     return None
 
-def load_conference_data(file_path='TMS2025AI_Excel_02-21-2025.xlsx'):
+def load_conference_data(file_path='TMS2025AI_Excel_02-21-2025.xlsx', use_cache=True, rebuild_cache=False):
+    """
+    Load the conference data into a SessionCorpus.
+    
+    The searchable session text, dates and start/end times are derived once
+    here (time problems are reported together) and shared by all analysis
+    functions; the inverted search index is built on first use, by keyword
+    searches and the server (see SessionCorpus.search_index). The parsed
+    workbook is cached in a binary file next to it (see data_cache), so
+    later loads skip openpyxl, and so are the keyword hits of earlier runs
+    (see keyword_cache).
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the TMS Excel file (default: auto-detected)
+    use_cache : bool, optional
+        Whether to read and write the binary data and keyword caches (default: True)
+    rebuild_cache : bool, optional
+        Rebuild the caches from the workbook even if they are valid (default: False)
+        
+    Returns:
+    --------
+    SessionCorpus or None
+        The loaded sessions, or None if the file could not be loaded
+    """
     # If no path provided, attempt to find the file
     if file_path == 'TMS2025AI_Excel_02-21-2025.xlsx':
         file_path = find_data_file(file_path)
@@ -65,14 +112,26 @@ def load_conference_data(file_path='TMS2025AI_Excel_02-21-2025.xlsx'):
             return None
             
     try:
-        df = pd.read_excel(file_path)
+        with stage('read_excel') as timing:
+            df = read_excel_cached(file_path, use_cache=use_cache, rebuild=rebuild_cache)
+            timing.add(rows=len(df))
         print(f"\nLoading TMS 2025 Conference Data...")
         print(f"Dataset contains {len(df)} entries and {len(df.columns)} columns")
         print("\nDataset Structure:")
         print(df.info())
         print("\nFirst few rows:")
         print(df.head())
-        return df
+        with stage('normalize', rows=len(df)):
+            corpus = SessionCorpus(df)
+        print_time_report(corpus.df, corpus.time_issues)
+        if use_cache:
+            # Reuse the keyword hits of earlier runs on the same data; callers
+            # save new ones with corpus.save_keyword_cache()
+            corpus.keyword_cache_file = keyword_cache_path(file_path)
+            if not rebuild_cache:
+                with stage('keyword_cache') as timing:
+                    timing.add(keywords=corpus.load_keyword_cache(corpus.keyword_cache_file))
+        return corpus
     except Exception as e:
         print(f"Error loading file: {e}")
         return None
@@ -81,6 +140,8 @@ def analyze_schedule(df):
     """Analyze the conference schedule."""
     if df is None:
         return
+    corpus = as_corpus(df)
+    df = corpus.df
     
     print("\nConference Overview:")
     print("-" * 50)
@@ -88,7 +149,7 @@ def analyze_schedule(df):
     
     # Date range
     if 'Date' in df.columns:
-        date_range = df['Date'].agg(['min', 'max'])
+        date_range = corpus.dates.agg(['min', 'max'])
         print(f"\nConference dates: {date_range['min'].strftime('%B %d')} - {date_range['max'].strftime('%B %d, %Y')}")
     
     # Session types
@@ -107,41 +168,51 @@ def analyze_schedule(df):
     print(df['Track'].value_counts())
 
 def search_sessions(df, keyword):
-    """Search for sessions containing a specific keyword."""
+    """Search for sessions containing a specific keyword.
+    
+    The keyword is matched case-insensitively as a literal substring, using
+    the corpus's inverted index instead of scanning every column.
+    """
     if df is None:
         return
+    corpus = as_corpus(df)
+    df = corpus.df
+    index = corpus.search_index
     
     print(f"\nSearching for '{keyword}':")
     print("-" * 50)
     
     search_results = {}
-    text_columns = ['Track', 'Symposium', 'Session', 'Title', 'Description', 
-                    'Speaker', 'SpeakerAffiliation', 'AllAuthors']
-    
-    for column in text_columns:
-        if column in df.columns:
-            # Convert to string and handle NaN values
-            matches = df[df[column].astype(str).str.contains(keyword, case=False, na=False)]
-            if not matches.empty:
-                search_results[column] = len(matches)
+    title_matches = None
+    for column in index.fields:
+        matches = index.contains_mask(keyword, field=column)
+        if matches.any():
+            search_results[column] = int(matches.sum())
+            if column == 'Title':
+                title_matches = matches
     
     print("\nNumber of matches found:")
     for column, count in search_results.items():
         print(f"{column}: {count} matches")
     
     # Show detailed results for Title matches
-    if 'Title' in search_results:
+    if title_matches is not None:
         print(f"\nDetailed matches in Titles containing '{keyword}':")
         print("-" * 50)
-        matches = df[df['Title'].astype(str).str.contains(keyword, case=False, na=False)]
-        for _, row in matches.iterrows():
-            print(f"Title: {row['Title']}")
-            print(f"Date: {row['Date'].strftime('%B %d, %Y')} at {row['Start']}")
-            print(f"Location: {row['Location']}")
+        matches = df[title_matches]
+        for title, date, start, location in zip(matches['Title'], corpus.dates[title_matches],
+                                                 matches['Start'], matches['Location']):
+            print(f"Title: {title}")
+            print(f"Date: {date.strftime('%B %d, %Y')} at {start}")
+            print(f"Location: {location}")
             print("-" * 50)
 
 def score_session_relevance(row, focus_areas):
-    """Score the relevance of a session based on focus areas."""
+    """Score the relevance of a session based on focus areas.
+    
+    Scores a single row. To score a whole DataFrame use scoring.score_sessions,
+    which gives the same result in one vectorized pass.
+    """
     score = 0
     text = ' '.join([str(val) for val in row.values if isinstance(val, str)])
     
@@ -153,14 +224,14 @@ def score_session_relevance(row, focus_areas):
 
 def create_targeted_schedule(df, focus_areas):
     """Create a targeted schedule based on focus areas and keywords."""
-    # Convert date strings to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
     
     # Score each session
-    df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+    scored = corpus.scored(focus_areas)
+    area_matches = scored.area_matches
     
     # Filter relevant sessions (score > 0)
-    relevant_sessions = df[df['relevance_score'] > 0].copy()
+    relevant_sessions = scored.select(above=0).frame()
     
     # Sort by date, time, and relevance score
     relevant_sessions = relevant_sessions.sort_values(['Date', 'Start', 'relevance_score'], 
@@ -172,13 +243,9 @@ def create_targeted_schedule(df, focus_areas):
         print(f"Schedule for {date.strftime('%A, %B %d, %Y')}")
         print('='*80)
         
-        for _, session in group.iterrows():
+        for idx, session in group.iterrows():
             # Identify which focus areas match
-            matching_areas = []
-            for area, keywords in focus_areas.items():
-                text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-                if any(keyword.lower() in text.lower() for keyword in keywords):
-                    matching_areas.append(area)
+            matching_areas = [area for area in area_matches.columns if area_matches.at[idx, area]]
             
             print(f"\n{session['Start']} - {session['End']} | Room {session['Location']}")
             print(f"Title: {session['Title']}")
@@ -189,27 +256,36 @@ def create_targeted_schedule(df, focus_areas):
             print(f"Relevance Score: {session['relevance_score']}")
             print('-' * 30)
 
+# Keywords that make a session relevant to each NVIDIA product
+NVIDIA_PRODUCT_KEYWORDS = {
+    'Omniverse': ['digital twin', 'visualization', 'collaboration', 'simulation', 'real-time', 
+                  '3D modeling', 'virtual environment', 'synthetic data', 'virtual worlds'],
+    'AI & HPC': ['GPU', 'accelerator', 'CUDA', 'parallel computing', 'high performance computing',
+                'machine learning', 'deep learning', 'neural network', 'AI', 'transformer', 
+                'large language model', 'generative AI', 'computer vision'],
+    'ALCHEMI': ['materials discovery', 'optimization', 'parameter prediction', 'materials design',
+               'quantum chemistry', 'simulation', 'material informatics', 'computational materials',
+               'materials genomics', 'high-throughput'],
+    'Modulus': ['physics-informed', 'physics-ML', 'differential equations', 'surrogate model',
+               'physics simulation', 'digital twin', 'multiphysics', 'CFD', 'structural mechanics'],
+    'MONAI': ['medical imaging', 'healthcare', 'AI for healthcare', 'medical data',
+             'radiology', 'image segmentation', 'computer vision', 'federated learning'],
+    'DOCA': ['data processing', 'networking', 'DPU', 'BlueField', 'data center', 'accelerated computing',
+            'infrastructure', 'security', 'storage']
+}
+
+# NVIDIA product categories of the business justification report and their keywords
+NVIDIA_PRODUCT_CATEGORIES = {
+    "NVIDIA AI Platform": ["ai", "machine learning", "deep learning", "neural", "vision"],
+    "NVIDIA Omniverse": ["simulation", "digital twin", "model", "visualization"],
+    "NVIDIA HPC & Quantum": ["hpc", "quantum", "dft", "computation", "parallel"],
+    "NVIDIA Modulus": ["material", "physics", "additive manufacturing", "am", "powder bed"]
+}
+
 def identify_nvidia_product_relevance(session_text):
     """Identify which NVIDIA products are relevant to a session."""
-    nvidia_products = {
-        'Omniverse': ['digital twin', 'visualization', 'collaboration', 'simulation', 'real-time', 
-                      '3D modeling', 'virtual environment', 'synthetic data', 'virtual worlds'],
-        'AI & HPC': ['GPU', 'accelerator', 'CUDA', 'parallel computing', 'high performance computing',
-                    'machine learning', 'deep learning', 'neural network', 'AI', 'transformer', 
-                    'large language model', 'generative AI', 'computer vision'],
-        'ALCHEMI': ['materials discovery', 'optimization', 'parameter prediction', 'materials design',
-                   'quantum chemistry', 'simulation', 'material informatics', 'computational materials',
-                   'materials genomics', 'high-throughput'],
-        'Modulus': ['physics-informed', 'physics-ML', 'differential equations', 'surrogate model',
-                   'physics simulation', 'digital twin', 'multiphysics', 'CFD', 'structural mechanics'],
-        'MONAI': ['medical imaging', 'healthcare', 'AI for healthcare', 'medical data',
-                 'radiology', 'image segmentation', 'computer vision', 'federated learning'],
-        'DOCA': ['data processing', 'networking', 'DPU', 'BlueField', 'data center', 'accelerated computing',
-                'infrastructure', 'security', 'storage']
-    }
-    
     relevant_products = {}
-    for product, keywords in nvidia_products.items():
+    for product, keywords in NVIDIA_PRODUCT_KEYWORDS.items():
         for keyword in keywords:
             if keyword.lower() in session_text.lower():
                 if product not in relevant_products:
@@ -220,14 +296,17 @@ def identify_nvidia_product_relevance(session_text):
 
 def create_prioritized_schedule(df, focus_areas, priority_sessions=None):
     """Create a prioritized schedule organized by focus area with business justification."""
-    # Convert date strings to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
     
     # Score each session
-    df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+    scored = corpus.scored(focus_areas)
+    area_matches = scored.area_matches
     
     # Filter relevant sessions (score > 0)
-    relevant_sessions = df[df['relevance_score'] > 0].copy()
+    relevant_sessions = scored.select(above=0).frame()
+    
+    # NVIDIA products relevant to each session, from the shared keyword hits
+    product_relevance = interest_matches(corpus.score(NVIDIA_PRODUCT_KEYWORDS)[1])
     
     # Add priority flag if session is in priority_sessions list
     if priority_sessions:
@@ -250,13 +329,7 @@ def create_prioritized_schedule(df, focus_areas, priority_sessions=None):
         print(f"{'#'*100}")
         
         # Find sessions relevant to this focus area
-        area_sessions = relevant_sessions.copy()
-        area_sessions['is_relevant_to_area'] = area_sessions.apply(
-            lambda row: any(keyword.lower() in ' '.join([str(val) for val in row.values if isinstance(val, str)]).lower() 
-                           for keyword in focus_areas[focus_area]),
-            axis=1
-        )
-        area_sessions = area_sessions[area_sessions['is_relevant_to_area']]
+        area_sessions = relevant_sessions[area_matches.loc[relevant_sessions.index, focus_area]]
         
         # Sort by priority first, then by relevance score
         area_sessions = area_sessions.sort_values(['is_priority', 'relevance_score'], ascending=[False, False])
@@ -277,8 +350,7 @@ def create_prioritized_schedule(df, focus_areas, priority_sessions=None):
                 print(f"Description: {description}")
             
             # Identify NVIDIA product relevance
-            session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-            nvidia_products = identify_nvidia_product_relevance(session_text)
+            nvidia_products = product_relevance.at[session.name]
             
             if nvidia_products:
                 print("\nNVIDIA Product Relevance:")
@@ -290,14 +362,10 @@ def create_prioritized_schedule(df, focus_areas, priority_sessions=None):
 
 def generate_business_justification(df, focus_areas):
     """Generate business justification for NVIDIA products based on conference sessions."""
-    # Convert date strings to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
-    
-    # Score each session
-    df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+    corpus = as_corpus(df)
     
-    # Filter relevant sessions (score > 0)
-    relevant_sessions = df[df['relevance_score'] > 0].copy()
+    # Score each session and keep the relevant ones (score > 0)
+    relevant_sessions = corpus.scored(focus_areas).select(above=0).frame()
     
     # Define NVIDIA products and their value propositions
     nvidia_products = {
@@ -321,25 +389,25 @@ def generate_business_justification(df, focus_areas):
     
     # Analyze each session for product relevance
     for _, session in relevant_sessions.iterrows():
-        session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
+        session_text = corpus.session_text(session)
         
         # Check Omniverse relevance
-        if any(keyword in session_text.lower() for keyword in ['digital twin', 'visualization', 'simulation']):
+        if any(keyword in session_text for keyword in ['digital twin', 'visualization', 'simulation']):
             application = f"{session['Title']} - {session['Date'].strftime('%B %d')}"
             nvidia_products['Omniverse']['applications'].append(application)
         
         # Check Holoscan relevance
-        if any(keyword in session_text.lower() for keyword in ['monitoring', 'quality control', 'vision']):
+        if any(keyword in session_text for keyword in ['monitoring', 'quality control', 'vision']):
             application = f"{session['Title']} - {session['Date'].strftime('%B %d')}"
             nvidia_products['Holoscan']['applications'].append(application)
         
         # Check ALCHEMI relevance
-        if any(keyword in session_text.lower() for keyword in ['materials discovery', 'optimization', 'simulation']):
+        if any(keyword in session_text for keyword in ['materials discovery', 'optimization', 'simulation']):
             application = f"{session['Title']} - {session['Date'].strftime('%B %d')}"
             nvidia_products['ALCHEMI']['applications'].append(application)
         
         # Check BioNeMo relevance
-        if any(keyword in session_text.lower() for keyword in ['knowledge graph', 'data extraction', 'literature']):
+        if any(keyword in session_text for keyword in ['knowledge graph', 'data extraction', 'literature']):
             application = f"{session['Title']} - {session['Date'].strftime('%B %d')}"
             nvidia_products['BioNeMo']['applications'].append(application)
     
@@ -394,22 +462,26 @@ def create_day_by_day_optimized_schedule(df, focus_areas, priority_sessions=None
         print("No data available to create schedule.")
         return
     
-    # First, get the dates from the DataFrame
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
+    
+    # Score each session based on relevance to focus areas
+    scores, matches = corpus.score(focus_areas)
+    area_matches = area_match_matrix(matches)
     
     # Sort by date and start time
-    df = df.sort_values(by=['Date', 'Start'])
+    df = corpus.df.assign(RelevanceScore=scores).sort_values(by=['Date', 'Start'])
     
     # Group by date
     grouped_by_date = df.groupby(df['Date'].dt.date)
     
-    # Score each session based on relevance to focus areas
-    df['RelevanceScore'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
-    
     # Filter to show only high priority sessions (score 4 or higher) for the summary
     high_priority_df = df[df['RelevanceScore'] >= 4].copy()
     
-    # Check for time conflicts between high priority sessions
+    # Find time conflicts between high priority sessions, grouped by day
+    conflicts_by_day = {}
+    for group in session_conflicts(corpus, high_priority_df.index):
+        conflicts_by_day.setdefault(corpus.dates.at[group[0]].date(), []).append(group)
+    
     print("\n\n" + "="*80)
     print("CONFERENCE PLANNER: PRIORITY SESSIONS AND CONFLICTS")
     print("="*80)
@@ -422,38 +494,27 @@ def create_day_by_day_optimized_schedule(df, focus_areas, priority_sessions=None
             print(f"DAY: {date}")
             print(f"{'=' * 80}")
             
-            # Find conflicts
-            conflicts = []
-            for i, (idx1, session1) in enumerate(day_high_priority.iterrows()):
-                for j, (idx2, session2) in enumerate(day_high_priority.iterrows()):
-                    if i >= j:  # Skip self-comparisons and duplicates
-                        continue
-                    
-                    start1, end1 = session1['Start'], session1['End']
-                    start2, end2 = session2['Start'], session2['End']
-                    
-                    # Check if sessions overlap
-                    if (start1 <= end2 and end1 >= start2):
-                        conflicts.append((session1, session2))
-            
             # Print conflicts if any
-            if conflicts:
+            day_conflicts = conflicts_by_day.get(date, [])
+            if day_conflicts:
                 print("\n⚠️ SCHEDULE CONFLICTS BETWEEN HIGH PRIORITY SESSIONS ⚠️")
                 print("-" * 60)
-                for session1, session2 in conflicts:
-                    print(f"\nConflict:")
-                    print(f"1. {session1['Start']} - {session1['End']} | Room {session1['Location']} | Score: {session1['RelevanceScore']}")
-                    print(f"   {session1['Title']}")
-                    print(f"2. {session2['Start']} - {session2['End']} | Room {session2['Location']} | Score: {session2['RelevanceScore']}")
-                    print(f"   {session2['Title']}")
+                for group in day_conflicts:
+                    sessions = high_priority_df.loc[group]
+                    print(f"\nConflict: {len(sessions)} overlapping sessions")
+                    for option, (idx, session) in enumerate(sessions.iterrows(), start=1):
+                        print(f"{option}. {session['Start']} - {session['End']} | Room {session['Location']} | Score: {session['RelevanceScore']}")
+                        print(f"   {session['Title']}")
                     
                     # Provide recommendation based on relevance score
-                    if session1['RelevanceScore'] > session2['RelevanceScore']:
-                        recommended = "Option 1"
-                    elif session2['RelevanceScore'] > session1['RelevanceScore']:
-                        recommended = "Option 2"
-                    else:
+                    group_scores = sessions['RelevanceScore'].to_numpy()
+                    best_options = np.flatnonzero(group_scores == group_scores.max()) + 1
+                    if len(best_options) == 1:
+                        recommended = f"Option {best_options[0]}"
+                    elif len(best_options) == len(sessions) == 2:
                         recommended = "Either option"
+                    else:
+                        recommended = "Options " + ", ".join(str(option) for option in best_options)
                     
                     print(f"Recommendation: {recommended} (based on relevance score)")
                     print("-" * 40)
@@ -465,14 +526,13 @@ def create_day_by_day_optimized_schedule(df, focus_areas, priority_sessions=None
             # Sort by start time
             day_high_priority = day_high_priority.sort_values(by='Start')
             
-            for _, session in day_high_priority.iterrows():
+            for idx, session in day_high_priority.iterrows():
                 start_time = session['Start']
                 end_time = session['End']
                 room = session['Location']
                 title = session['Title']
                 score = session['RelevanceScore']
-                focus_tags = ", ".join([area for area, keywords in focus_areas.items() 
-                                      if any(keyword.lower() in str(session).lower() for keyword in keywords)])
+                focus_tags = ", ".join([area for area in area_matches.columns if area_matches.at[idx, area]])
                 
                 # Determine NVIDIA product relevance
                 nvidia_products = []
@@ -518,18 +578,17 @@ def create_day_by_day_optimized_schedule(df, focus_areas, priority_sessions=None
             slot_df = day_df[day_df['Start'] == time_slot]
             
             # For each session in this time slot
-            for _, session in slot_df.iterrows():
+            for idx, session in slot_df.iterrows():
                 start_time = session['Start']
                 end_time = session['End']
                 room = session['Location']
                 title = session['Title']
                 
                 # Determine the focus areas for this session
-                focus_tags = ", ".join([area for area, keywords in focus_areas.items() 
-                                      if any(keyword.lower() in str(session).lower() for keyword in keywords)])
+                focus_tags = ", ".join([area for area in area_matches.columns if area_matches.at[idx, area]])
                 
-                # Score the session's relevance
-                relevance_score = score_session_relevance(session, focus_areas)
+                # Look up the session's relevance score
+                relevance_score = session['RelevanceScore']
                 
                 # Highlight high priority sessions
                 priority_marker = "⭐ HIGH PRIORITY ⭐ " if relevance_score >= 4 else ""
@@ -546,8 +605,8 @@ def display_priority_sessions_details(df, priority_sessions, focus_areas):
     print("DETAILED INFORMATION ABOUT PRIORITY SESSIONS")
     print("="*100)
     
-    # Convert date strings to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
+    df = corpus.df
     
     # Find sessions that match or partially match the priority sessions
     matched_sessions = []
@@ -685,8 +744,8 @@ def display_priority_sessions_details(df, priority_sessions, focus_areas):
         area_sessions = []
         for priority_title, session in matched_sessions:
             # Check if session is relevant to this focus area
-            session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-            is_relevant = any(keyword.lower() in session_text.lower() for keyword in focus_areas[focus_area])
+            session_text = corpus.session_text(session)
+            is_relevant = any(keyword.lower() in session_text for keyword in focus_areas[focus_area])
             
             if is_relevant:
                 area_sessions.append((priority_title, session))
@@ -745,7 +804,7 @@ def display_priority_sessions_details(df, priority_sessions, focus_areas):
                 
             print(f"\nRelevance to {focus_area}:")
             relevant_keywords = [keyword for keyword in focus_areas[focus_area] 
-                               if keyword.lower() in session_text.lower()]
+                               if keyword.lower() in session_text]
             for keyword in relevant_keywords:
                 print(f"  - Contains keyword: '{keyword}'")
                 
@@ -761,37 +820,24 @@ def display_nvidia_relevant_sessions(df, focus_areas):
     print("NVIDIA BUSINESS JUSTIFICATION: PRIORITY SESSIONS BY PRODUCT")
     print("="*80)
     
+    corpus = as_corpus(df)
+    
     # Score sessions
-    df['RelevanceScore'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+    scored = corpus.scored(focus_areas)
+    area_matches = scored.area_matches
     
     # High priority sessions (score >= 4)
-    high_priority_df = df[df['RelevanceScore'] >= 4].copy()
+    high_priority_df = scored.select(min_score=4).frame('RelevanceScore')
     
-    # NVIDIA product categories to track
-    nvidia_products = {
-        "NVIDIA AI Platform": [],
-        "NVIDIA Omniverse": [],
-        "NVIDIA HPC & Quantum": [],
-        "NVIDIA Modulus": []
-    }
+    # NVIDIA product categories to track, matched from the shared keyword hits
+    nvidia_products = {product: [] for product in NVIDIA_PRODUCT_CATEGORIES}
+    product_matches = corpus.scored(NVIDIA_PRODUCT_CATEGORIES).area_matches
     
     # Categorize sessions by NVIDIA product
-    for _, session in high_priority_df.iterrows():
-        title = session['Title'].lower()
-        desc = str(session).lower()
-        
-        # Determine which NVIDIA products are relevant
-        if any(kw in desc for kw in ["ai", "machine learning", "deep learning", "neural", "vision"]):
-            nvidia_products["NVIDIA AI Platform"].append(session)
-        
-        if any(kw in desc for kw in ["simulation", "digital twin", "model", "visualization"]):
-            nvidia_products["NVIDIA Omniverse"].append(session)
-            
-        if any(kw in desc for kw in ["hpc", "quantum", "dft", "computation", "parallel"]):
-            nvidia_products["NVIDIA HPC & Quantum"].append(session)
-            
-        if any(kw in desc for kw in ["material", "physics", "additive manufacturing", "am", "powder bed"]):
-            nvidia_products["NVIDIA Modulus"].append(session)
+    for idx, session in high_priority_df.iterrows():
+        for product, sessions in nvidia_products.items():
+            if product_matches.at[idx, product]:
+                sessions.append(session)
     
     # Print sessions by NVIDIA product
     for product, sessions in nvidia_products.items():
@@ -831,8 +877,8 @@ def display_nvidia_relevant_sessions(df, focus_areas):
                 print(f"   Title: {session['Title']}")
                 
                 # Extract focus areas
-                focus_tags = ", ".join([area for area, keywords in focus_areas.items() 
-                                    if any(keyword.lower() in str(session).lower() for keyword in keywords)])
+                focus_tags = ", ".join([area for area in area_matches.columns
+                                        if area_matches.at[session.name, area]])
                 print(f"   Focus Areas: {focus_tags}")
                 
                 # Add more details if available
@@ -846,13 +892,25 @@ def display_nvidia_relevant_sessions(df, focus_areas):
             if len(sorted_sessions) > 5:
                 print(f"\n... and {len(sorted_sessions) - 5} more sessions relevant to {product}")
 
-def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Conference Schedule"):
+# Ways of drawing the session blocks of visualize_schedule_calendar: one
+# collection of rectangles per day with labels only where they fit, or a
+# separate patch and label for every session (slow for large schedules)
+MATPLOTLIB_RENDERERS = ('collection', 'patches')
+
+# Font size of the session labels, and the smallest block in points that gets
+# a label in the 'collection' renderer
+LABEL_FONT_SIZE = 8
+MIN_LABEL_HEIGHT = 1.2 * LABEL_FONT_SIZE
+MIN_LABEL_WIDTH = 1.5 * LABEL_FONT_SIZE
+
+def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Conference Schedule",
+                                renderer='collection', fig=None):
     """
     Visualize the schedule as a calendar view with time slots and sessions.
     
     Parameters:
     -----------
-    df : pandas DataFrame
+    df : SessionCorpus or pandas DataFrame
         DataFrame containing the schedule information with at least Date, Start, End, Location, and Title columns
     min_score : int, optional
         Minimum relevance score to include sessions (default: 0, show all sessions)
@@ -860,21 +918,31 @@ def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Confer
         Dictionary mapping focus areas to lists of keywords, used for coloring (default: None)
     title : str, optional
         Title for the visualization (default: "Conference Schedule")
+    renderer : str, optional
+        'collection' (default) draws each day's sessions as one collection and
+        skips the labels of blocks too small to show them; 'patches' draws a
+        separate rectangle and label for every session
+    fig : matplotlib Figure, optional
+        Figure to draw into, e.g. one reused for many calendars in a batch;
+        it is cleared first (default: None, a new pyplot figure)
         
     Returns:
     --------
     fig : matplotlib Figure
         The figure containing the calendar visualization
     """
+    if renderer not in MATPLOTLIB_RENDERERS:
+        print(f"Error: Unknown renderer '{renderer}'. Choose from: {', '.join(MATPLOTLIB_RENDERERS)}")
+        return None
+    
     if df is None or df.empty:
         print("No data available to visualize.")
         return None
     
-    # Convert date strings to datetime if needed
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
     
     # Get unique dates and create a figure with subplots for each day
-    unique_dates = sorted(df['Date'].dt.date.unique())
+    unique_dates = sorted(corpus.days.unique())
     
     if not unique_dates:
         print("No valid dates found in the schedule.")
@@ -882,60 +950,74 @@ def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Confer
     
     # Score sessions if focus areas are provided
     if focus_areas:
-        df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+        scores, matches = corpus.score(focus_areas)
+        area_matches = area_match_matrix(matches)
         # Filter by minimum score
         if min_score > 0:
-            df = df[df['relevance_score'] >= min_score].copy()
+            corpus = corpus.subset(scores >= min_score)
     else:
         # If no focus areas, just include all sessions
-        df['relevance_score'] = 1
+        scores = pd.Series(1, index=corpus.index)
+    
+    df = corpus.df.assign(relevance_score=scores.loc[corpus.index])
     
     if df.empty:
         print(f"No sessions with relevance score >= {min_score} found.")
         return None
     
-    # Create a color map for focus areas
+    plt = load_pyplot()
+    import matplotlib
+    import matplotlib.patches as mpatches
+    from matplotlib.collections import PolyCollection
+    from matplotlib.colors import to_rgba
+    
+    # Session blocks as arrays: times in hours, colors and labels
+    starts = df['start_minutes'].to_numpy(dtype=float) / 60.0
+    ends = df['end_minutes'].to_numpy(dtype=float) / 60.0
+    durations = ends - starts
+    labels = [title if len(title) <= 30 else title[:27] + '...' for title in df['Title'].fillna('').astype(str)]
+    
     if focus_areas:
-        focus_area_colors = {}
-        cmap = plt.cm.get_cmap('tab10', len(focus_areas))
-        for i, area in enumerate(focus_areas.keys()):
-            focus_area_colors[area] = cmap(i)
+        # One color per focus area; sessions take the color of their first
+        # matching area (gray if none), and higher scores are more opaque
+        cmap = matplotlib.colormaps['tab10'].resampled(len(focus_areas))
+        focus_area_colors = {area: cmap(i) for i, area in enumerate(focus_areas.keys())}
+        area_columns = list(area_matches.columns)
+        matched = area_matches.loc[df.index].to_numpy(dtype=bool).reshape(len(df), len(area_columns))
+        has_area = matched.any(axis=1)
+        primary = np.where(has_area, matched.argmax(axis=1) if area_columns else 0, len(area_columns))
+        palette = np.array([focus_area_colors[area] for area in area_columns] + [to_rgba('gray')])
+        colors = palette[primary]
+        relevance = df['relevance_score'].to_numpy(dtype=float)
+        alphas = np.where(has_area, np.minimum(0.4 + 0.1 * relevance, 0.9), 0.3)
+        labels = [f"{label} ({score})" for label, score in zip(labels, df['relevance_score'].tolist())]
+    else:
+        colors = np.tile(to_rgba('steelblue'), (len(df), 1))
+        alphas = np.full(len(df), 0.7)
+    
+    # Faces and edges are faded together, as the alpha of a patch does
+    facecolors = colors.copy()
+    facecolors[:, 3] = alphas
+    edgecolors = np.zeros_like(colors)
+    edgecolors[:, 3] = alphas
     
-    # Set up the figure
+    # Set up the figure, one column of axes per day
     n_days = len(unique_dates)
-    fig, axes = plt.subplots(1, n_days, figsize=(5*n_days, 10), sharey=True)
-    
-    # Handle case of a single day
-    if n_days == 1:
-        axes = [axes]
-    
-    # Time to float conversion function - Convert HH:MM to hours as float
-    def time_to_float(time_str):
-        try:
-            if isinstance(time_str, str):
-                # Handle different time formats
-                if ':' in time_str:
-                    hours, minutes = map(int, time_str.split(':'))
-                else:
-                    # Try to handle other formats or set default
-                    print(f"Warning: Unexpected time format: {time_str}, using default")
-                    return 12.0  # Default to noon
-                
-                return hours + minutes / 60.0
-            elif hasattr(time_str, 'hour') and hasattr(time_str, 'minute'):
-                # Handle time objects
-                return time_str.hour + time_str.minute / 60.0
-            else:
-                print(f"Warning: Unknown time format: {time_str}, using default")
-                return 12.0  # Default to noon
-        except Exception as e:
-            print(f"Error parsing time '{time_str}': {e}")
-            return 12.0  # Default to noon
+    if fig is None:
+        fig = plt.figure(figsize=(5*n_days, 10))
+    else:
+        fig.clear()
+        fig.set_size_inches(5*n_days, 10)
+    axes = fig.subplots(1, n_days, sharey=True, squeeze=False)[0]
     
     # Set y-axis limits (time range in hours)
     time_min = 7.0  # 7:00 AM
     time_max = 19.0  # 7:00 PM
     
+    # Legend entries of the focus areas, in the order they first appear
+    legend_handles = []
+    seen_areas = set()
+    
     # Process each day
     for i, date in enumerate(unique_dates):
         ax = axes[i]
@@ -954,13 +1036,14 @@ def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Confer
         ax.set_yticklabels([f"{h:02d}:00" for h in hour_ticks])
         
         # Configure x-axis (rooms)
-        day_data = df[df['Date'].dt.date == date]
-        if day_data.empty:
+        on_day = np.flatnonzero((corpus.days == date).to_numpy())
+        if len(on_day) == 0:
             continue
-            
-        # Group by location (room)
-        room_groups = day_data.groupby('Location')
-        unique_rooms = sorted(day_data['Location'].unique())
+        
+        # Sessions of the day room by room, in sorted room order
+        unique_rooms, room_idx = np.unique(df['Location'].to_numpy()[on_day].astype(str), return_inverse=True)
+        order = np.argsort(room_idx, kind='stable')
+        sessions, x = on_day[order], room_idx[order]
         
         # Set x-axis ticks for rooms
         ax.set_xlim(-0.5, len(unique_rooms) - 0.5)
@@ -970,118 +1053,75 @@ def visualize_schedule_calendar(df, min_score=0, focus_areas=None, title="Confer
         # Add horizontal grid lines
         ax.grid(axis='y', linestyle='--', alpha=0.7)
         
-        # Plot each session as a rectangle
-        legend_handles = []
-        seen_areas = set()
+        # Sessions without a positive duration are drawn 15 minutes long so they stay visible
+        duration = durations[sessions]
+        for pos in sessions[duration <= 0]:
+            print(f"Warning: Invalid duration for session {df['Title'].iat[pos]}: {durations[pos]}")
+        duration = np.where(duration <= 0, 0.25, duration)
         
-        for room_idx, room in enumerate(unique_rooms):
-            room_sessions = day_data[day_data['Location'] == room]
+        # Blocks run from the end time up to end - duration on the reversed axis
+        bottom = ends[sessions]
+        top = bottom - duration
+        middle = bottom - duration / 2
+        drawable = np.isfinite(bottom) & np.isfinite(top)
+        
+        if renderer == 'patches':
+            for pos, room, y, height in zip(sessions[drawable], x[drawable], bottom[drawable], duration[drawable]):
+                ax.add_patch(mpatches.Rectangle((room - 0.4, y), 0.8, -height, facecolor=colors[pos],
+                                                alpha=alphas[pos], edgecolor='black', linewidth=1))
+                ax.text(room, y - height / 2, labels[pos], horizontalalignment='center',
+                        verticalalignment='center', fontsize=LABEL_FONT_SIZE, color='black', wrap=True)
+        else:
+            # All blocks of the day as one collection of rectangles
+            verts = np.stack([np.column_stack([x - 0.4, bottom]), np.column_stack([x + 0.4, bottom]),
+                              np.column_stack([x + 0.4, top]), np.column_stack([x - 0.4, top])], axis=1)
+            ax.add_collection(PolyCollection(verts[drawable], facecolors=facecolors[sessions[drawable]],
+                                             edgecolors=edgecolors[sessions[drawable]], linewidths=1,
+                                             joinstyle='miter'), autolim=False)
             
-            for _, session in room_sessions.iterrows():
-                try:
-                    # Convert start and end times to float (hours)
-                    start_float = time_to_float(session['Start'])
-                    end_float = time_to_float(session['End'])
-                    
-                    # Calculate duration
-                    duration = end_float - start_float
-                    
-                    # Skip if invalid duration
-                    if duration <= 0:
-                        print(f"Warning: Invalid duration for session {session['Title']}: {duration}")
-                        # Use a minimum duration to make the session visible
-                        duration = 0.25  # 15 minutes minimum
-                    
-                    # Create rectangle properties
-                    rect_x = room_idx - 0.4
-                    rect_width = 0.8
-                    
-                    # Since the y-axis is reversed (time_max at the top),
-                    # the rectangle's y position should be at end_float (the bottom)
-                    rect_y = end_float
-                    rect_height = -duration  # Negative height since we're drawing upward in a reversed axis
-                    
-                    # Determine color based on focus areas
-                    if focus_areas:
-                        session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-                        matching_areas = []
-                        for area, keywords in focus_areas.items():
-                            if any(keyword.lower() in session_text.lower() for keyword in keywords):
-                                matching_areas.append(area)
-                        
-                        if matching_areas:
-                            # Use color of the first matching area
-                            primary_area = matching_areas[0]
-                            color = focus_area_colors[primary_area]
-                            alpha = min(0.4 + 0.1 * session['relevance_score'], 0.9)  # Higher score = more opaque
-                            
-                            # Add to legend if not already seen
-                            if primary_area not in seen_areas:
-                                seen_areas.add(primary_area)
-                                patch = mpatches.Patch(color=color, alpha=alpha, label=primary_area)
-                                legend_handles.append(patch)
-                        else:
-                            color = 'gray'
-                            alpha = 0.3
-                    else:
-                        color = 'steelblue'
-                        alpha = 0.7
-                    
-                    # Create rectangle
-                    rect = plt.Rectangle(
-                        (rect_x, rect_y), rect_width, rect_height,
-                        facecolor=color, alpha=alpha, edgecolor='black', linewidth=1
-                    )
-                    ax.add_patch(rect)
-                    
-                    # Add session title text
-                    title_text = session['Title']
-                    if len(title_text) > 30:
-                        title_text = title_text[:27] + '...'
-                    
-                    # Add score if focus areas provided
-                    if focus_areas:
-                        title_text += f" ({session['relevance_score']})"
-                    
-                    # Position the text in the middle of the rectangle
-                    # With the reversed y-axis and negative height, we need to position from the bottom up
-                    text_y = rect_y - rect_height/2
-                    
-                    ax.text(
-                        rect_x + rect_width/2, 
-                        text_y,
-                        title_text,
-                        horizontalalignment='center',
-                        verticalalignment='center',
-                        fontsize=8,
-                        color='black',
-                        wrap=True
-                    )
-                except (ValueError, TypeError) as e:
-                    print(f"Error processing session: {e} - Start: {session['Start']}, End: {session['End']}")
-                    continue  # Skip this session
+            # Label only the blocks tall and wide enough to show a line of text
+            position = ax.get_position()
+            points_per_hour = position.height * fig.get_figheight() * 72 / (time_max - time_min)
+            points_per_room = position.width * fig.get_figwidth() * 72 / len(unique_rooms)
+            labeled = drawable & (duration * points_per_hour >= MIN_LABEL_HEIGHT)
+            if 0.8 * points_per_room < MIN_LABEL_WIDTH:
+                labeled[:] = False
+            for pos, room, y in zip(sessions[labeled], x[labeled], middle[labeled]):
+                ax.text(room, y, labels[pos], horizontalalignment='center', verticalalignment='center',
+                        fontsize=LABEL_FONT_SIZE, color='black')
+        
+        # Add the focus areas drawn for the first time to the legend
+        if focus_areas:
+            drawn = sessions[drawable & has_area[sessions]]
+            for first in np.sort(np.unique(primary[drawn], return_index=True)[1]):
+                pos = drawn[first]
+                area = area_columns[primary[pos]]
+                if area not in seen_areas:
+                    seen_areas.add(area)
+                    legend_handles.append(mpatches.Patch(color=colors[pos], alpha=alphas[pos], label=area))
     
     # Add legend if using focus areas
     if focus_areas and legend_handles:
         fig.legend(handles=legend_handles, loc='lower center', ncol=min(len(legend_handles), 3), bbox_to_anchor=(0.5, 0))
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     if focus_areas:
-        plt.subplots_adjust(bottom=0.15)  # Make room for legend
+        fig.subplots_adjust(bottom=0.15)  # Make room for legend
     
     # Add overall title
     fig.suptitle(title, fontsize=16, y=0.98)
     
     return fig
 
-def user_customized_featurizer(df, user_interests, interest_weights=None, min_score=3, show_calendar=True):
+def user_customized_featurizer(df, user_interests, interest_weights=None, min_score=3, show_calendar=True,
+                               top_k=None):
     """
     Generate a personalized schedule based on user-defined interests and optional weights.
     
     Parameters:
     -----------
-    df : pandas DataFrame
+    df : SessionCorpus or pandas DataFrame
         The conference data
     user_interests : dict
         Dictionary with interest areas as keys and lists of keywords as values
@@ -1094,6 +1134,9 @@ def user_customized_featurizer(df, user_interests, interest_weights=None, min_sc
         Minimum relevance score to include a session (default: 3)
     show_calendar : bool, optional
         Whether to display a calendar visualization (default: True)
+    top_k : int, optional
+        Only keep the top_k highest scoring sessions of each day, selected
+        without sorting the others (default: None, all relevant sessions)
         
     Returns:
     --------
@@ -1108,48 +1151,27 @@ def user_customized_featurizer(df, user_interests, interest_weights=None, min_sc
     print("PERSONALIZED TMS SCHEDULE BASED ON YOUR INTERESTS")
     print("="*80)
     
-    # Normalize date format
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
     
     # If no weights provided, use equal weights
     if interest_weights is None:
         interest_weights = {interest: 1.0 for interest in user_interests.keys()}
     
-    # Calculate relevance scores
-    df['user_relevance'] = 0.0
+    # Calculate weighted relevance scores for all interest areas in one pass
+    scored = corpus.scored(user_interests, interest_weights)
     
-    # Detailed scoring info for explanation
-    df['interest_matches'] = df.apply(lambda row: {}, axis=1)
-    
-    # Calculate score for each interest area
-    for interest, keywords in user_interests.items():
-        weight = interest_weights.get(interest, 1.0)
+    with stage('filter_sort') as timing:
+        scored = scored.select(min_score=min_score)
+        if top_k is not None:
+            scored = scored.top(top_k, by_day=True)
         
-        # Score each session based on keywords
-        def score_for_interest(row):
-            text = ' '.join([str(val) for val in row.values if isinstance(val, str)]).lower()
-            matches = []
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    matches.append(keyword)
-            
-            # Update the interest_matches dictionary with this interest's matches
-            if matches:
-                row['interest_matches'][interest] = matches
-            
-            # Return weighted score based on number of matches
-            return len(matches) * weight
+        # Filter to sessions with minimum relevance, with detailed scoring info for explanation
+        relevant_sessions = scored.frame('user_relevance', interest_matches=interest_matches(scored.matches))
         
-        # Apply scoring
-        interest_score = df.apply(score_for_interest, axis=1)
-        df['user_relevance'] += interest_score
-    
-    # Filter to sessions with minimum relevance
-    relevant_sessions = df[df['user_relevance'] >= min_score].copy()
-    
-    # Sort by date, start time, and relevance
-    relevant_sessions = relevant_sessions.sort_values(['Date', 'Start', 'user_relevance'], 
-                                                     ascending=[True, True, False])
+        # Sort by date, start time, and relevance
+        relevant_sessions = relevant_sessions.sort_values(['Date', 'Start', 'user_relevance'], 
+                                                         ascending=[True, True, False])
+        timing.add(rows=len(relevant_sessions))
     
     if relevant_sessions.empty:
         print("\nNo sessions match your interests with the specified minimum score.")
@@ -1209,9 +1231,10 @@ def user_customized_featurizer(df, user_interests, interest_weights=None, min_sc
     # Display calendar visualization if requested
     if show_calendar:
         print("\nGenerating calendar visualization...")
-        visualize_schedule_calendar(relevant_sessions, min_score=min_score, 
-                                    focus_areas=user_interests, 
-                                    title=f"Your Personalized TMS Schedule (min score: {min_score})")
+        with stage('figure_build'):
+            visualize_schedule_calendar(corpus.subset(relevant_sessions.index), min_score=min_score, 
+                                        focus_areas=user_interests, 
+                                        title=f"Your Personalized TMS Schedule (min score: {min_score})")
     
     # Return the DataFrame for further processing if needed
     return relevant_sessions
@@ -1219,6 +1242,8 @@ def user_customized_featurizer(df, user_interests, interest_weights=None, min_sc
 def main():
     """Main function to run the analysis."""
     # Set the style for plots
+    load_pyplot()
+    import seaborn as sns
     sns.set_theme()
     
     # Load conference data
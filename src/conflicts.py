@@ -0,0 +1,213 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Schedule conflict detection for the TMS Conference Planner.
+
+Sessions are treated as half-open intervals of integer minutes, so a session
+ending at 10:20 does not clash with one starting at 10:20. Conflicts are found
+with a single sort-and-sweep instead of comparing every pair of sessions:
+groups of overlapping sessions and per-session clash counts in O(n log n),
+and all overlapping pairs in O(n log n + k) for k pairs. The session-level
+helpers offset each session by its date, so one sweep covers the whole
+conference without clashes between different days.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from corpus import as_corpus
+from instrumentation import stage
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def absolute_minutes(dates, minutes):
+    """
+    Convert session dates and times of day to minutes since the epoch.
+
+    Parameters:
+    -----------
+    dates : pandas Series
+        Session dates as datetimes
+    minutes : array-like
+        Times of day as integer minutes since midnight, aligned with ``dates``
+
+    Returns:
+    --------
+    numpy ndarray
+        Absolute times as integer minutes
+    """
+    days = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+    return days * MINUTES_PER_DAY + np.asarray(minutes, dtype=np.int64)
+
+
+def _sweep_order(starts, ends):
+    """Order intervals by start, then end, keeping the input order for ties"""
+    return np.lexsort((np.arange(len(starts)), ends, starts))
+
+
+def conflict_groups(starts, ends, labels=None):
+    """
+    Find the groups of overlapping intervals.
+
+    A group is a maximal chain of intervals in which each interval overlaps
+    at least one other, i.e. a stretch of time during which two or more
+    intervals are continuously running. Intervals that overlap nothing, and
+    empty intervals (end <= start), are not reported.
+
+    Parameters:
+    -----------
+    starts, ends : array-like
+        Interval start and end times (e.g., integer minutes)
+    labels : sequence, optional
+        Label for each interval (default: None, the interval positions)
+
+    Returns:
+    --------
+    list of lists
+        The labels of each group, ordered by start time
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    if labels is None:
+        labels = range(len(starts))
+    labels = list(labels)
+
+    groups = []
+    current = []
+    group_end = None
+    for pos in _sweep_order(starts, ends):
+        if ends[pos] <= starts[pos]:
+            continue  # Empty intervals overlap nothing
+        if current and starts[pos] >= group_end:
+            if len(current) > 1:
+                groups.append(current)
+            current = []
+        if not current:
+            group_end = ends[pos]
+        current.append(labels[pos])
+        group_end = max(group_end, ends[pos])
+
+    if len(current) > 1:
+        groups.append(current)
+    return groups
+
+
+def conflict_pairs(starts, ends, labels=None):
+    """
+    Find every pair of overlapping intervals.
+
+    Parameters:
+    -----------
+    starts, ends : array-like
+        Interval start and end times (e.g., integer minutes)
+    labels : sequence, optional
+        Label for each interval (default: None, the interval positions)
+
+    Returns:
+    --------
+    list of tuples
+        (earlier, later) label pairs, grouped by the later interval in start order
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    if labels is None:
+        labels = range(len(starts))
+    labels = list(labels)
+
+    pairs = []
+    active = []  # Heap of (end, sweep rank, position) for intervals still running
+    for rank, pos in enumerate(_sweep_order(starts, ends)):
+        if ends[pos] <= starts[pos]:
+            continue  # Empty intervals overlap nothing
+        while active and active[0][0] <= starts[pos]:
+            heapq.heappop(active)
+        for _, _, other in active:
+            pairs.append((labels[other], labels[pos]))
+        heapq.heappush(active, (ends[pos], rank, pos))
+    return pairs
+
+
+def session_minutes(data, index=None):
+    """
+    Get session start and end times as absolute minutes.
+
+    Each session's times (the normalized start_minutes/end_minutes columns)
+    are offset by its date, so sessions on different days never overlap.
+
+    Parameters:
+    -----------
+    data : SessionCorpus or pandas DataFrame
+        Conference data
+    index : index labels, optional
+        Sessions to include (default: None, all sessions)
+
+    Returns:
+    --------
+    tuple of (numpy ndarray, numpy ndarray, pandas Index)
+        Start minutes, end minutes and the session labels
+    """
+    corpus = as_corpus(data)
+    if index is None:
+        index = corpus.index
+    index = pd.Index(index)
+
+    dates = corpus.dates.loc[index]
+    starts = absolute_minutes(dates, corpus.df.loc[index, 'start_minutes'])
+    ends = absolute_minutes(dates, corpus.df.loc[index, 'end_minutes'])
+    return starts, ends, index
+
+
+def session_conflicts(data, index=None):
+    """
+    Find the groups of overlapping sessions on each day.
+
+    Parameters:
+    -----------
+    data : SessionCorpus or pandas DataFrame
+        Conference data
+    index : index labels, optional
+        Sessions to check, e.g. the high priority ones (default: None, all sessions)
+
+    Returns:
+    --------
+    list of lists
+        The session labels of each conflict group, in chronological order
+    """
+    with stage('conflicts') as timing:
+        starts, ends, labels = session_minutes(data, index)
+        timing.add(rows=len(labels))
+        return conflict_groups(starts, ends, labels)
+
+
+def conflict_counts(data, index=None):
+    """
+    Count the other sessions each session overlaps.
+
+    Parameters:
+    -----------
+    data : SessionCorpus or pandas DataFrame
+        Conference data
+    index : index labels, optional
+        Sessions to check (default: None, all sessions)
+
+    Returns:
+    --------
+    pandas Series
+        Number of clashing sessions per session (0 if it has no conflicts)
+    """
+    with stage('conflicts') as timing:
+        starts, ends, labels = session_minutes(data, index)
+        timing.add(rows=len(labels))
+
+        # Session j overlaps session i when start_j < end_i and end_j > start_i; the
+        # sessions with end_j <= start_i are a subset of those with start_j < end_i,
+        # so both counts come from binary searches over the sorted times
+        valid = ends > starts
+        sorted_starts = np.sort(starts[valid])
+        sorted_ends = np.sort(ends[valid])
+        counts = (np.searchsorted(sorted_starts, ends, side='left')
+                  - np.searchsorted(sorted_ends, starts, side='right') - 1)
+        return pd.Series(np.where(valid, counts, 0), index=labels)
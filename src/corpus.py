@@ -0,0 +1,633 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Session corpus for the TMS Conference Planner.
+
+A SessionCorpus wraps the conference DataFrame together with the values every
+analysis step derives from it: the lowercased searchable text of each session,
+the parsed session dates and the start/end times as integer minutes. They are
+computed once when the data is loaded and shared by the scorers, exporters and
+visualizers. The corpus also caches the keyword matches of the focus areas it
+scored (see keyword_cache), and scoring returns a ScoredView instead of
+modifying it.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from scoring import (area_keyword_counts, area_match_matrix, build_session_text, iter_ranked_positions,
+                     keyword_match_matrix, score_profiles, scores_from_area_counts, top_k_positions)
+from search_index import SearchIndex
+from keyword_cache import shared_hit_cache
+from instrumentation import stage
+
+
+# Minutes used for session times that cannot be parsed (noon)
+DEFAULT_TIME_MINUTES = 12 * 60
+
+# Number of sets of focus areas whose match matrices a corpus keeps; the
+# oldest are dropped first, so scoring hundreds of attendee profiles in one
+# process does not grow memory (their keyword hits stay in the hit cache)
+MAX_CACHED_FOCUS_AREAS = 64
+
+# Columns added to the conference data with the normalized start/end times
+TIME_COLUMNS = ['start_minutes', 'end_minutes']
+
+# 'HH:MM' or 'HH:MM:SS', optionally after a date (as str() gives for datetimes)
+_TIME_PATTERN = r'^\s*(?:\d{4}-\d{2}-\d{2}[ T])?(\d{1,2}):(\d{2})(?::\d{2}(?:\.\d+)?)?\s*$'
+
+
+def parse_time_minutes(column):
+    """
+    Convert a Start or End column to minutes since midnight (e.g., '09:30' → 570).
+
+    Accepts 'HH:MM' and 'HH:MM:SS' strings and time objects. Each distinct
+    value is parsed once, with vectorized string operations.
+
+    Parameters:
+    -----------
+    column : pandas Series
+        Session times
+
+    Returns:
+    --------
+    tuple of (pandas Series, pandas Series)
+        Minutes since midnight as floats (NaN where a value cannot be parsed),
+        and a mask of the values whose hour was above 23 and was clamped to 23
+    """
+    codes, uniques = pd.factorize(column)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(_TIME_PATTERN)
+    hours = pd.to_numeric(parts[0]).to_numpy(dtype=float)
+    minutes = pd.to_numeric(parts[1]).to_numpy(dtype=float)
+
+    # Missing values have code -1, which picks the trailing NaN/False
+    values = np.append(np.minimum(hours, 23) * 60 + minutes, np.nan)[codes]
+    clamped = np.append(hours > 23, False)[codes]
+    return pd.Series(values, index=column.index), pd.Series(clamped, index=column.index)
+
+
+def normalize_times(df, default=DEFAULT_TIME_MINUTES):
+    """
+    Normalize the Start and End columns to integer minutes since midnight.
+
+    Unparseable times are replaced by ``default``. An end time before the
+    start is most likely a PM time written in 12-hour format (e.g.,
+    '12:40' - '1:20'), so it is moved 12 hours later.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Conference data with Start and End columns
+    default : int, optional
+        Minutes to use for times that cannot be parsed (default: 720, noon)
+
+    Returns:
+    --------
+    tuple of (pandas Series, pandas Series, pandas DataFrame)
+        Start and end minutes, and one boolean column per kind of problem
+        flagging the affected sessions (see print_time_report)
+    """
+    start, start_clamped = parse_time_minutes(df['Start'])
+    end, end_clamped = parse_time_minutes(df['End'])
+
+    issues = {
+        'Unparseable start time (using the default)': start.isna(),
+        'Unparseable end time (using the default)': end.isna(),
+        'Hour above 23 (clamped to 23)': start_clamped | end_clamped,
+    }
+    start = start.fillna(default).astype(np.int64)
+    end = end.fillna(default).astype(np.int64)
+
+    reversed_times = end < start
+    end = end.where(~reversed_times, end + 12 * 60)
+    issues['End before start (moved 12 hours later)'] = reversed_times
+    issues['No duration after the fix'] = end <= start
+    return start, end, pd.DataFrame(issues)
+
+
+def print_time_report(df, issues, max_examples=3):
+    """
+    Print how many sessions have each kind of time problem, with a few examples.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Conference data with the original Start and End columns
+    issues : pandas DataFrame or None
+        Problem flags, as returned by normalize_times (nothing is printed if None)
+    max_examples : int, optional
+        Sessions to show per kind of problem (default: 3)
+    """
+    if issues is None:
+        return
+
+    counts = issues.sum()
+    if not counts.any():
+        return
+
+    print(f"\nTime issues in {int(issues.any(axis=1).sum())} of {len(issues)} sessions:")
+    for issue, count in counts[counts > 0].items():
+        examples = df.loc[issues[issue], ['Start', 'End']].head(max_examples)
+        example_text = ", ".join(f"row {idx}: {row.Start} - {row.End}" for idx, row in examples.iterrows())
+        print(f"  {issue}: {count} (e.g., {example_text})")
+
+
+class SessionCorpus:
+    """
+    Conference sessions with normalized text, dates and times computed once.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        The conference data
+    text : pandas Series, optional
+        Pre-built lowercased session text (default: None, built from ``df``)
+    dates : pandas Series, optional
+        Pre-parsed session dates (default: None, parsed from ``df['Date']``)
+
+    Attributes:
+    -----------
+    df : pandas DataFrame
+        The conference data, with the Date column parsed to datetimes and
+        the start_minutes/end_minutes columns added (if missing). Treat it as
+        read-only: it is shared by every view of the corpus, so derived
+        columns go into a ``df.assign(...)`` copy or a ScoredView instead
+    text : pandas Series
+        Lowercased searchable text per session
+    dates : pandas Series
+        Session dates as datetimes
+    time_issues : pandas DataFrame or None
+        Sessions with time problems found while normalizing the times (see
+        normalize_times), or None if the times were already normalized
+    keyword_cache_file : str or None
+        File the keyword hit cache was loaded from and is saved to by
+        save_keyword_cache (see load_keyword_cache)
+    """
+
+    def __init__(self, df, text=None, dates=None):
+        if dates is None and 'Date' in df.columns:
+            dates = pd.to_datetime(df['Date'])
+        if dates is not None and ('Date' not in df.columns or not df['Date'].equals(dates)):
+            df = df.assign(Date=dates)
+
+        self.time_issues = None
+        if {'Start', 'End'} <= set(df.columns) and not set(TIME_COLUMNS) <= set(df.columns):
+            start_minutes, end_minutes, self.time_issues = normalize_times(df)
+            df = df.assign(start_minutes=start_minutes, end_minutes=end_minutes)
+
+        self.df = df
+        self.text = build_session_text(df) if text is None else text
+        self.dates = dates
+
+        # Keyword hit cache (shared with other corpora of the same data, see
+        # hit_cache), and match matrices and per-area keyword counts by focus areas
+        self._hits = None
+        self.keyword_cache_file = None
+        self._matches = {}
+        self._area_counts = {}
+        self._search_index = None
+        # Corpus this one is a subset of, and the positions of its sessions
+        # there; a subset scores through the parent's caches (see subset)
+        self._parent = None
+        self._positions = None
+        # Guards the caches above when server threads score the same corpus
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def empty(self):
+        """True if the corpus has no sessions"""
+        return self.df.empty
+
+    @property
+    def index(self):
+        """Index of the sessions"""
+        return self.df.index
+
+    @property
+    def search_index(self):
+        """Inverted index over the sessions, built on first use"""
+        if self._search_index is None:
+            self.build_search_index()
+        return self._search_index
+
+    def build_search_index(self):
+        """
+        Build the inverted index over the sessions.
+
+        Returns:
+        --------
+        SearchIndex
+            The new index, also used from now on to match scoring keywords
+        """
+        with stage('search_index', rows=len(self.df)):
+            self._search_index = SearchIndex(self.df, self.text)
+        return self._search_index
+
+    @property
+    def hit_cache(self):
+        """
+        KeywordHitCache of the sessions, shared by every corpus with the same
+        text; a subset returns its parent's, whose hits cover the parent's sessions
+        """
+        if self._parent is not None:
+            return self._parent.hit_cache
+        with self._lock:
+            if self._hits is None:
+                self._hits = shared_hit_cache(self.text)
+            return self._hits
+
+    def load_keyword_cache(self, path):
+        """
+        Load saved keyword hits and remember the file for save_keyword_cache.
+
+        Parameters:
+        -----------
+        path : str
+            Cache file (hits saved for different data are ignored)
+
+        Returns:
+        --------
+        int
+            Number of keywords loaded
+        """
+        self.keyword_cache_file = path
+        return self.hit_cache.load(path)
+
+    def save_keyword_cache(self, path=None):
+        """
+        Save the keyword hits if keywords were matched since they were loaded.
+
+        Parameters:
+        -----------
+        path : str, optional
+            Cache file (default: None, the file given to load_keyword_cache)
+
+        Returns:
+        --------
+        bool
+            True if the cache was written
+        """
+        path = path or self.keyword_cache_file
+        if path is None or not self.hit_cache.modified:
+            return False
+        return self.hit_cache.save(path)
+
+    @property
+    def start_hours(self):
+        """Session start times as float hours"""
+        return self.df['start_minutes'] / 60.0
+
+    @property
+    def end_hours(self):
+        """Session end times as float hours (after the 12-hour fix)"""
+        return self.df['end_minutes'] / 60.0
+
+    @property
+    def days(self):
+        """Session dates as datetime.date objects"""
+        return self.dates.dt.date
+
+    def subset(self, index):
+        """
+        Select a subset of sessions without recomputing the derived data.
+
+        The subset is scored by slicing the scores of this corpus, so it
+        reuses the keyword matches already cached here and the keywords it
+        matches are cached for this corpus as well.
+
+        Parameters:
+        -----------
+        index : index labels or boolean Series
+            Sessions to keep (anything accepted by ``DataFrame.loc``)
+
+        Returns:
+        --------
+        SessionCorpus
+            A corpus over the selected sessions
+        """
+        df = self.df.loc[index]
+
+        def select(values):
+            return None if values is None else values.loc[df.index]
+
+        corpus = SessionCorpus(df, text=select(self.text), dates=select(self.dates))
+        if self.df.index.is_unique:
+            positions = self.df.index.get_indexer(df.index)
+            if self._parent is not None:
+                corpus._parent, corpus._positions = self._parent, self._positions[positions]
+            else:
+                corpus._parent, corpus._positions = self, positions
+        return corpus
+
+    def session_text(self, session):
+        """
+        Get the lowercased text of one session.
+
+        Parameters:
+        -----------
+        session : pandas Series
+            A row of the corpus, or a session built elsewhere
+
+        Returns:
+        --------
+        str
+            The cached text for corpus rows, built on the fly otherwise
+        """
+        if session.name is not None and session.name in self.text.index:
+            return self.text.at[session.name]
+        return ' '.join([val for val in session.values if isinstance(val, str)]).lower()
+
+    def score(self, focus_areas, weights=None, method='auto'):
+        """
+        Score all sessions against a set of focus areas.
+
+        Parameters:
+        -----------
+        focus_areas : dict
+            Dictionary mapping focus areas to lists of keywords
+        weights : dict, optional
+            Dictionary mapping focus areas to weights (default: None, unweighted)
+        method : str, optional
+            Keyword matching method (default: 'auto', see scoring.keyword_match_matrix;
+            uses the search index once it has been built)
+
+        Returns:
+        --------
+        tuple of (pandas Series, pandas DataFrame)
+            The relevance score per session and the per-keyword match matrix
+            (shared with later calls for the same focus areas; do not modify it)
+        """
+        with stage('score', rows=len(self.df)) as timing:
+            matches, area_counts = self._cached_matches(focus_areas, method, timing)
+            return scores_from_area_counts(area_counts, weights), matches
+
+    def _cached_matches(self, focus_areas, method, timing):
+        """Get the match matrix and per-area keyword counts of a set of focus areas, matching them if needed"""
+        if self._parent is not None:
+            matches, area_counts = self._parent._cached_matches(focus_areas, method, timing)
+            return matches.iloc[self._positions], area_counts.iloc[self._positions]
+
+        key = _focus_areas_key(focus_areas)
+        with self._lock:
+            matches = self._matches.get(key)
+            area_counts = self._area_counts.get(key)
+        if matches is None or area_counts is None:
+            matches = keyword_match_matrix(self.text, focus_areas, method=method,
+                                           search_index=self._search_index, hits=self.hit_cache)
+            area_counts = self._store_matches(key, matches, focus_areas)
+            timing.add(keywords=matches.shape[1])
+        return matches, area_counts
+
+    def _store_matches(self, key, matches, focus_areas):
+        """Cache the match matrix and per-area keyword counts of a set of focus areas, returning the counts"""
+        area_counts = area_keyword_counts(matches, focus_areas)
+        with self._lock:
+            self._matches[key] = matches
+            self._area_counts[key] = area_counts
+            for old_key in list(self._matches)[:-MAX_CACHED_FOCUS_AREAS]:
+                self._matches.pop(old_key, None)
+                self._area_counts.pop(old_key, None)
+        return area_counts
+
+    def scored(self, focus_areas, weights=None, method='auto'):
+        """
+        Score all sessions against a set of focus areas, without modifying the corpus.
+
+        Parameters:
+        -----------
+        focus_areas : dict
+            Dictionary mapping focus areas to lists of keywords
+        weights : dict, optional
+            Dictionary mapping focus areas to weights (default: None, unweighted)
+        method : str, optional
+            Keyword matching method (default: 'auto', see score)
+
+        Returns:
+        --------
+        ScoredView
+            The corpus with the scores and keyword matches held alongside
+        """
+        scores, matches = self.score(focus_areas, weights, method)
+        return ScoredView(self, scores, matches)
+
+    def search(self, query, fields=None):
+        """
+        Find the sessions matching a multi-term query (see SearchIndex.search).
+
+        Parameters:
+        -----------
+        query : str
+            Words and "quoted phrases" combined with AND, OR and parentheses
+        fields : list, optional
+            Columns to search (default: None, all indexed fields)
+
+        Returns:
+        --------
+        SessionCorpus
+            The matching sessions
+        """
+        return self.subset(self.search_index.search(query, fields))
+
+    def score_profiles(self, profiles, method='auto'):
+        """
+        Score all sessions against several interest profiles in one pass.
+
+        Parameters:
+        -----------
+        profiles : dict
+            Dictionary mapping profile names to {"interests": ..., "weights": ...}
+            dictionaries, as in RESEARCH_PROFILES
+        method : str, optional
+            Keyword matching method (default: 'auto', see scoring.keyword_match_matrix)
+
+        Returns:
+        --------
+        dict
+            Dictionary mapping profile names to (scores, matches) tuples
+        """
+        if self._parent is not None:
+            results = self._parent.score_profiles(profiles, method)
+            return {name: (scores.iloc[self._positions], matches.iloc[self._positions])
+                    for name, (scores, matches) in results.items()}
+
+        with stage('score', rows=len(self.df), profiles=len(profiles)):
+            results = score_profiles(self.df, profiles, text=self.text, method=method,
+                                     search_index=self._search_index, hits=self.hit_cache)
+            for name, (_, matches) in results.items():
+                self._store_matches(_focus_areas_key(profiles[name]["interests"]), matches,
+                                    profiles[name]["interests"])
+        return results
+
+
+class ScoredView:
+    """
+    Relevance scores of the sessions of a SessionCorpus.
+
+    The scores are a separate Series aligned with the corpus index, so a view
+    is cheap to build and never changes the corpus. Use ``frame`` to get a
+    DataFrame with the scores as a column.
+
+    Parameters:
+    -----------
+    corpus : SessionCorpus
+        The scored sessions
+    scores : pandas Series
+        Relevance score per session, indexed like the corpus
+    matches : pandas DataFrame, optional
+        Per-keyword match matrix, indexed like the corpus (default: None)
+
+    Attributes:
+    -----------
+    corpus : SessionCorpus
+        The scored sessions
+    scores : pandas Series
+        Relevance score per session
+    matches : pandas DataFrame or None
+        Per-keyword match matrix
+    """
+
+    def __init__(self, corpus, scores, matches=None):
+        self.corpus = corpus
+        self.scores = scores
+        self.matches = matches
+
+    def __len__(self):
+        return len(self.corpus)
+
+    @property
+    def empty(self):
+        """True if the view has no sessions"""
+        return self.corpus.empty
+
+    @property
+    def index(self):
+        """Index of the sessions"""
+        return self.corpus.index
+
+    @property
+    def area_matches(self):
+        """One boolean column per focus area (see scoring.area_match_matrix)"""
+        return area_match_matrix(self.matches)
+
+    def select(self, min_score=None, above=None):
+        """
+        Keep the sessions with a high enough score.
+
+        Parameters:
+        -----------
+        min_score : float, optional
+            Keep sessions scoring at least this much (default: None)
+        above : float, optional
+            Keep sessions scoring strictly more than this (default: None)
+
+        Returns:
+        --------
+        ScoredView
+            A view over the selected sessions
+        """
+        keep = pd.Series(True, index=self.scores.index)
+        if min_score is not None:
+            keep &= self.scores >= min_score
+        if above is not None:
+            keep &= self.scores > above
+        if keep.all():
+            return self
+        matches = None if self.matches is None else self.matches[keep]
+        return ScoredView(self.corpus.subset(keep), self.scores[keep], matches)
+
+    def top(self, k, by_day=False):
+        """
+        Keep the k best sessions, overall or per day, without sorting all of them.
+
+        Parameters:
+        -----------
+        k : int
+            Number of sessions to keep (per day if ``by_day``)
+        by_day : bool, optional
+            Keep the k best sessions of each day (default: False)
+
+        Returns:
+        --------
+        ScoredView
+            A view over the selected sessions in rank order (days in
+            corpus order); equal scores keep their corpus order
+        """
+        groups = self.corpus.days.to_numpy() if by_day else None
+        labels = self.scores.index[top_k_positions(self.scores.to_numpy(), k, groups)]
+        matches = None if self.matches is None else self.matches.loc[labels]
+        return ScoredView(self.corpus.subset(labels), self.scores.loc[labels], matches)
+
+    def ranked(self, first=20):
+        """
+        Yield the sessions best first, ranking only as many as are consumed.
+
+        Parameters:
+        -----------
+        first : int, optional
+            Number of sessions ranked before the first one is yielded (default: 20)
+
+        Yields:
+        -------
+        tuple of (index label, float)
+            Session label and score; look the session up in ``corpus.df``
+        """
+        labels, values = self.scores.index, self.scores.to_numpy()
+        for position in iter_ranked_positions(values, first):
+            yield labels[position], values[position].item()
+
+    def frame(self, score_column='relevance_score', **columns):
+        """
+        Build a DataFrame of the sessions with the scores as a column.
+
+        Parameters:
+        -----------
+        score_column : str, optional
+            Name of the score column (default: 'relevance_score')
+        **columns
+            Further columns to add, as for ``DataFrame.assign``
+
+        Returns:
+        --------
+        pandas DataFrame
+            A new DataFrame; the corpus DataFrame is left unchanged
+        """
+        return self.corpus.df.assign(**{score_column: self.scores}, **columns)
+
+
+def _focus_areas_key(focus_areas):
+    """Hashable identity of a set of focus areas and their keywords"""
+    return tuple((area, tuple(keywords)) for area, keywords in focus_areas.items())
+
+
+def as_corpus(data):
+    """
+    Return a SessionCorpus for a corpus or a plain DataFrame.
+
+    Parameters:
+    -----------
+    data : SessionCorpus, pandas DataFrame or None
+        Conference data
+
+    Returns:
+    --------
+    SessionCorpus or None
+        ``data`` itself if it is already a corpus, a new corpus built from a
+        DataFrame, or None if ``data`` is None
+    """
+    if data is None or isinstance(data, SessionCorpus):
+        return data
+    return SessionCorpus(data)
@@ -0,0 +1,241 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Binary cache for the conference Excel file.
+
+Parsing the TMS workbook with openpyxl takes seconds. The first load converts
+it to a columnar NumPy archive next to the source (<file>.cache.npz) plus a
+small JSON metadata file. Numeric and datetime columns are stored as they are,
+text columns as one UTF-8 buffer with offsets, and time-of-day columns as ISO
+strings; the archive is read with allow_pickle=False, so a cache file found in
+a data folder never runs code. Other columns (e.g. mixed numbers and text) are
+stored as text, and the uncached load returns them as text as well, so every
+run sees the same data. The cache is keyed by the source path, modification
+time and size, so editing or replacing the workbook invalidates it
+automatically.
+"""
+
+import os
+import json
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# Bump when the cached representation changes
+CACHE_VERSION = 3
+
+
+def cache_paths(file_path):
+    """
+    Get the cache file locations for a source file.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source Excel file
+
+    Returns:
+    --------
+    tuple of (str, str)
+        The metadata file path and the cache data path prefix
+    """
+    return f"{file_path}.cache.json", f"{file_path}.cache"
+
+
+def keyword_cache_path(file_path):
+    """
+    Get the keyword hit cache location for a source file (see keyword_cache).
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source Excel file
+
+    Returns:
+    --------
+    str
+        Path of the saved keyword hits
+    """
+    return f"{file_path}.hits.npz"
+
+
+def _cache_key(file_path):
+    """Identify the current version of the source file"""
+    stat = os.stat(file_path)
+    return {
+        'source': os.path.abspath(file_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'version': CACHE_VERSION,
+    }
+
+
+def _text_kind(col):
+    """'text' or 'time' if every value of an object column is a str or a time, else None"""
+    present = col.dropna().tolist()
+    if all(isinstance(value, str) for value in present):
+        return 'text'
+    if all(isinstance(value, datetime.time) for value in present):
+        return 'time'
+    return None
+
+
+def storable_frame(df):
+    """
+    Convert the columns the cache cannot store as they are to text.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Data as read from the workbook
+
+    Returns:
+    --------
+    pandas DataFrame
+        The same data, with every non-null value of columns mixing value
+        types (e.g. numbers and text) converted to str
+    """
+    mixed = [name for name in df.columns
+             if not (isinstance(df[name].dtype, np.dtype) and df[name].dtype.kind in 'biufcmM')
+             and _text_kind(df[name]) is None]
+    if not mixed:
+        return df
+    return df.assign(**{name: df[name].astype(object).where(df[name].isna(), df[name].astype(str))
+                        for name in mixed})
+
+
+def _encode_column(name, col, arrays, prefix):
+    """
+    Add the arrays storing one column to arrays, and return its description.
+
+    Raises ValueError if the column holds values the cache cannot store.
+    """
+    if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'biufcmM':
+        arrays[prefix] = col.to_numpy()
+        return {'name': name, 'kind': 'native'}
+
+    kind = _text_kind(col)
+    if kind is None:
+        raise ValueError(f"column '{name}' mixes value types (see storable_frame)")
+    values = col.to_numpy(dtype=object)
+    null = col.isna().to_numpy()
+    texts = ['' if missing else value.isoformat() if kind == 'time' else value
+             for value, missing in zip(values, null)]
+
+    # One buffer for the whole column; the offsets count characters
+    arrays[prefix] = np.frombuffer(''.join(texts).encode('utf-8'), dtype=np.uint8)
+    arrays[prefix + '_offsets'] = np.cumsum([0] + [len(text) for text in texts], dtype=np.int64)
+    arrays[prefix + '_null'] = null
+    return {'name': name, 'kind': kind, 'dtype': str(col.dtype)}
+
+
+def _decode_column(column, data, prefix):
+    """Rebuild one column from its description and the loaded archive"""
+    if column['kind'] == 'native':
+        return pd.Series(data[prefix])
+
+    buffer = data[prefix].tobytes().decode('utf-8')
+    offsets = data[prefix + '_offsets'].tolist()
+    null = data[prefix + '_null'].tolist()
+    convert = datetime.time.fromisoformat if column['kind'] == 'time' else str
+    values = [np.nan if missing else convert(buffer[begin:end])
+              for begin, end, missing in zip(offsets[:-1], offsets[1:], null)]
+    return pd.Series(values, dtype=column['dtype'])
+
+
+def _load_cache(file_path, key):
+    """Load the cached DataFrame if the cache matches the source, else return None"""
+    meta_path, data_prefix = cache_paths(file_path)
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('key') != key or meta.get('format') != 'npz':
+        return None
+
+    data_path = data_prefix + '.npz'
+    try:
+        with np.load(data_path, allow_pickle=False) as data:
+            columns = {column['name']: _decode_column(column, data, f"c{i}")
+                       for i, column in enumerate(meta['columns'])}
+        return pd.DataFrame(columns, index=pd.RangeIndex(meta['rows']))
+    except Exception as e:
+        print(f"Warning: Could not read data cache {data_path}: {e}")
+    return None
+
+
+def _replace_file(path, write, mode):
+    """Write a file through a temporary file, so an interrupted write never leaves a partial one"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_cache(file_path, key, df):
+    """Write the DataFrame cache (see storable_frame) and its metadata next to the source file"""
+    meta_path, data_prefix = cache_paths(file_path)
+
+    arrays = {}
+    try:
+        if not df.index.equals(pd.RangeIndex(len(df))):
+            raise ValueError("the rows are not numbered from 0")
+        if not all(isinstance(name, (str, int, float)) and not isinstance(name, bool) for name in df.columns):
+            raise ValueError("a column name is not text or a number")
+        columns = [_encode_column(name, df[name], arrays, f"c{i}") for i, name in enumerate(df.columns)]
+    except ValueError as e:
+        print(f"Warning: Not caching {file_path}: {e}")
+        return False
+
+    # The metadata is written last, so it never describes a partly written archive
+    meta = {'key': key, 'format': 'npz', 'rows': len(df), 'columns': columns}
+    try:
+        _replace_file(data_prefix + '.npz', lambda f: np.savez(f, **arrays), 'wb')
+        _replace_file(meta_path, lambda f: json.dump(meta, f, indent=2), 'w')
+    except OSError as e:
+        print(f"Warning: Could not write data cache next to {file_path}: {e}")
+        return False
+    return True
+
+
+def read_excel_cached(file_path, use_cache=True, rebuild=False):
+    """
+    Read the conference Excel file, using the binary cache when it is valid.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the Excel file
+    use_cache : bool, optional
+        Whether to read and write the cache at all (default: True)
+    rebuild : bool, optional
+        Ignore any existing cache and rebuild it from the workbook (default: False)
+
+    Returns:
+    --------
+    pandas DataFrame
+        The conference data as pd.read_excel returns it, with columns mixing
+        value types converted to text (see storable_frame)
+    """
+    if not use_cache:
+        return storable_frame(pd.read_excel(file_path))
+
+    key = _cache_key(file_path)
+    if not rebuild:
+        df = _load_cache(file_path, key)
+        if df is not None:
+            print(f"Loaded conference data from cache: {cache_paths(file_path)[1]}")
+            return df
+
+    df = storable_frame(pd.read_excel(file_path))
+    if _write_cache(file_path, key, df):
+        print(f"Saved conference data cache next to {file_path}")
+    return df
@@ -8,76 +8,41 @@ mkdir -p examples
 profiles=("battery" "ml" "am" "quantum" "corrosion")
 custom_profiles=("nvidia")
 min_score=5  # Use a higher minimum score for less cluttered visualizations
+jobs=$(python3 -c "import os; print(os.cpu_count() or 1)")  # Render profiles in parallel
 
 echo "Generating visualizations for profiles: ${profiles[@]} ${custom_profiles[@]}"
 
-# Process standard profiles
-for profile in "${profiles[@]}"
-do
-  echo
-  echo "=== Generating visualization for ${profile} profile ==="
-  
-  # Generate HTML visualizations
-  echo "Creating standard calendar view (HTML)..."
-  python3 src/plotly_viz.py --profile ${profile} --min-score ${min_score} \
-    --output examples/${profile}_calendar.html --csv --symposium
-  
-  echo "Creating symposium view (HTML)..."
-  python3 src/plotly_viz.py --profile ${profile} --min-score ${min_score} \
-    --output examples/${profile}_calendar_symposiums.html --symposium-view
-  
-  # Generate PNG visualization (if needed)
-  if command -v kaleido >/dev/null 2>&1 || python3 -c "import kaleido" >/dev/null 2>&1; then
-    echo "Creating PNG visualization..."
+# Generate the HTML visualizations, CSV exports and symposium reports for all
+# profiles in one process each, so the data is loaded and scanned once
+echo
+echo "=== Creating standard calendar views (HTML) ==="
+python3 src/generate_examples.py --profiles "${profiles[@]}" \
+  --interests $(printf "%s_profile.json " "${custom_profiles[@]}") \
+  --min-score ${min_score} --output-dir examples --jobs ${jobs} --csv --symposium
+
+echo
+echo "=== Creating symposium views (HTML) ==="
+python3 src/generate_examples.py --profiles "${profiles[@]}" \
+  --interests $(printf "%s_profile.json " "${custom_profiles[@]}") \
+  --min-score ${min_score} --output-dir examples --jobs ${jobs} --symposium-view
+
+# Generate PNG visualizations (if needed)
+if command -v kaleido >/dev/null 2>&1 || python3 -c "import kaleido" >/dev/null 2>&1; then
+  for profile in "${profiles[@]}"
+  do
+    echo "Creating PNG visualization for ${profile}..."
     python3 src/save_calendar.py --profile ${profile} --min-score ${min_score} \
       --output examples/${profile}_calendar.png
-  else
-    echo "Skipping PNG generation (kaleido package not found)"
-  fi
-  
-  # Move CSV and txt files to examples directory
-  if [ -f "${profile}_sessions.csv" ]; then
-    mv ${profile}_sessions.csv examples/
-  fi
-  
-  if [ -f "${profile}_symposiums.txt" ]; then
-    mv ${profile}_symposiums.txt examples/
-  fi
-done
-
-# Process custom profile files
-for profile in "${custom_profiles[@]}"
-do
-  echo
-  echo "=== Generating visualization for ${profile} profile ==="
-  
-  # Generate HTML visualizations
-  echo "Creating standard calendar view (HTML)..."
-  python3 src/plotly_viz.py --interests ${profile}_profile.json --min-score ${min_score} \
-    --output examples/${profile}_calendar.html --csv --symposium
-  
-  echo "Creating symposium view (HTML)..."
-  python3 src/plotly_viz.py --interests ${profile}_profile.json --min-score ${min_score} \
-    --output examples/${profile}_calendar_symposiums.html --symposium-view
-  
-  # Generate PNG visualization (if needed)
-  if command -v kaleido >/dev/null 2>&1 || python3 -c "import kaleido" >/dev/null 2>&1; then
-    echo "Creating PNG visualization..."
+  done
+  for profile in "${custom_profiles[@]}"
+  do
+    echo "Creating PNG visualization for ${profile}..."
     python3 src/save_calendar.py --interests ${profile}_profile.json --min-score ${min_score} \
       --output examples/${profile}_calendar.png
-  else
-    echo "Skipping PNG generation (kaleido package not found)"
-  fi
-  
-  # Move CSV and txt files to examples directory
-  if [ -f "${profile}_profile_sessions.csv" ]; then
-    mv ${profile}_profile_sessions.csv examples/${profile}_sessions.csv
-  fi
-  
-  if [ -f "${profile}_profile_symposiums.txt" ]; then
-    mv ${profile}_profile_symposiums.txt examples/${profile}_symposiums.txt
-  fi
-done
+  done
+else
+  echo "Skipping PNG generation (kaleido package not found)"
+fi
 
 echo
 echo "All visualizations generated in the 'examples' directory."
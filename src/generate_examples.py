@@ -5,16 +5,25 @@ Generate example visualizations for all available research profiles
 
 import os
 import sys
+import io
+import time
 import argparse
+import contextlib
+from multiprocessing import util as multiprocessing_util
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Import from tms-planner modules
-from tms_planner import RESEARCH_PROFILES
-from plotly_viz import save_interactive_calendar, create_interactive_calendar, find_data_file
+from tms_planner import RESEARCH_PROFILES, select_profiles
+from plotly_viz import save_interactive_calendar, find_data_file, write_session_table
 from analyze_tms import load_conference_data
-import plotly.io as pio
+from image_export import ImageExporter, print_export_summary
+import instrumentation
+from instrumentation import add_timings_argument, start_timings, finish_timings, stage
 
-def generate_all_examples(output_dir="examples", min_score=3, format="html", open_browser=False):
+def generate_all_examples(output_dir="examples", min_score=3, format="html", open_browser=False, data_file=None,
+                          profiles=None, interests_files=None, gen_csv=False, gen_symposium=False,
+                          symposium_view=False, jobs=1, compact=False, gzip_output=False):
     """
     Generate visualizations for all available research profiles
     
@@ -28,76 +37,253 @@ def generate_all_examples(output_dir="examples", min_score=3, format="html", ope
         Output format ("html" or "png" or "both")
     open_browser : bool
         Whether to open the first visualization in a browser
+    data_file : str, optional
+        Path to the conference data Excel file (default: auto-detect)
+    profiles : list, optional
+        Names of the pre-defined profiles to generate, or ["all"] (default: None, all profiles
+        unless interests files are given)
+    interests_files : list, optional
+        Paths to custom interests JSON files to generate as well (default: None)
+    gen_csv : bool, optional
+        Whether to generate a CSV export of sessions per profile (default: False)
+    gen_symposium : bool, optional
+        Whether to generate a symposium report per profile (default: False)
+    symposium_view : bool, optional
+        If True, group sessions by symposium in the visualizations (default: False)
+    jobs : int, optional
+        Number of worker processes rendering profiles in parallel (default: 1, serial)
+    compact : bool, optional
+        Write compact HTML files sharing one plotly.js bundle and session table (default: False)
+    gzip_output : bool, optional
+        Write gzip-compressed HTML files (default: False)
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Get available profiles
-    profiles = list(RESEARCH_PROFILES.keys())
+    # Load the conference data once for all profiles
+    if data_file is None:
+        data_file = find_data_file()
+        if not data_file:
+            print("Error: Could not find TMS data file.")
+            return False
+    df = load_conference_data(data_file)
+    if df is None:
+        print("Error: Failed to load conference data.")
+        return False
+    
+    # Collect the requested profiles
+    if profiles is None and not interests_files:
+        profiles = ["all"]
+    profile_data = select_profiles(profiles, interests_files)
+    if not profile_data:
+        return False
+    profiles = list(profile_data.keys())
     print(f"Generating {format} visualizations for {len(profiles)} profiles: {', '.join(profiles)}")
     
-    # Track if we successfully generated at least one visualization
-    success = False
-    
-    # Generate visualization for each profile
-    for i, profile in enumerate(profiles):
-        print(f"\n[{i+1}/{len(profiles)}] Generating visualization for profile: {profile}")
-        
-        # HTML output filename
-        html_file = os.path.join(output_dir, f"{profile}_calendar.html")
-        
-        # Create title with capitalized profile name
-        title = f"TMS 2025 - {profile.title()} Focus Areas"
-        
-        # Generate the visualization
-        result = save_interactive_calendar(
-            profile=profile,
-            min_score=min_score,
-            output_file=html_file,
-            title=title
-        )
-        
-        if result:
-            success = True
-            print(f"Successfully saved HTML visualization to: {html_file}")
-            
-            # Generate PNG if requested
-            if format == "png" or format == "both":
-                try:
-                    # Get data and create figure directly
-                    print(f"Generating PNG visualization...")
-                    data_file = find_data_file()
-                    df = load_conference_data(data_file)
-                    
-                    # Import again to get access to the function
-                    from tms_planner import RESEARCH_PROFILES
-                    user_interests = RESEARCH_PROFILES[profile]["interests"]
-                    
-                    # Create the figure
-                    fig = create_interactive_calendar(
-                        df, 
-                        min_score=min_score, 
-                        focus_areas=user_interests, 
-                        title=title
-                    )
-                    
-                    # Save as PNG
-                    png_file = os.path.join(output_dir, f"{profile}_calendar.png")
-                    print(f"Saving PNG visualization to: {png_file}")
-                    fig.write_image(png_file, width=1600, height=900, scale=2)
-                    print(f"Successfully saved PNG visualization to: {png_file}")
-                except Exception as e:
-                    print(f"Error generating PNG: {e}")
-            
-            # Open the first successful visualization if requested
-            if open_browser and i == 0:
-                import webbrowser
-                print(f"Opening visualization in browser: {html_file}")
-                webbrowser.open_new_tab(f"file://{os.path.abspath(html_file)}")
-        else:
-            print(f"Failed to generate visualization for profile: {profile}")
-    
-    return success
+    # Match the keywords of all profiles in one pass; the corpus keeps the
+    # results, so the per-profile exports and visualizations reuse them
+    df.score_profiles(profile_data)
+    df.save_keyword_cache()
+    
+    # Write the shared session table of the compact files before rendering them
+    if compact:
+        write_session_table(df, output_dir)
+    
+    # Render every profile, serially or across a pool of worker processes
+    tasks = [dict(profile=profile, profile_data=profile_data[profile], output_dir=output_dir,
+                  min_score=min_score, format=format, gen_csv=gen_csv, gen_symposium=gen_symposium,
+                  symposium_view=symposium_view, compact=compact, gzip_output=gzip_output)
+             for profile in profiles]
+    
+    # PNG files are exported through one long-lived kaleido renderer per process
+    export_png = format in ("png", "both")
+    start_time = time.perf_counter()
+    if jobs > 1:
+        results, image_timings = render_profiles_parallel(df, tasks, jobs, export_png)
+    else:
+        results = []
+        with (ImageExporter() if export_png else contextlib.nullcontext()) as png_exporter:
+            for i, task in enumerate(tasks):
+                print(f"\n[{i+1}/{len(tasks)}] Generating visualization for profile: {task['profile']}")
+                task_start = time.perf_counter()
+                with stage('render_profile'):
+                    html_file = render_profile(df, png_exporter=png_exporter, **task)
+                results.append((task['profile'], html_file, time.perf_counter() - task_start))
+        image_timings = png_exporter.timings if png_exporter is not None else []
+    elapsed = time.perf_counter() - start_time
+    
+    print_timing_summary(results, elapsed, jobs)
+    print_export_summary(image_timings)
+    
+    # Open the first visualization if requested
+    html_files = [html_file for _, html_file, _ in results if html_file]
+    if open_browser and html_files:
+        import webbrowser
+        print(f"Opening visualization in browser: {html_files[0]}")
+        webbrowser.open_new_tab(f"file://{os.path.abspath(html_files[0])}")
+    
+    return bool(html_files)
+
+def render_profile(df, profile, profile_data, output_dir, min_score=3, format="html",
+                   gen_csv=False, gen_symposium=False, symposium_view=False, compact=False, gzip_output=False,
+                   png_exporter=None):
+    """
+    Generate the visualizations and reports of one profile
+    
+    Parameters:
+    -----------
+    df : SessionCorpus
+        Conference data, already scored for the profile
+    profile : str
+        Profile name, used for titles and file names
+    profile_data : dict
+        The profile's {"interests": ..., "weights": ...} dictionary
+    output_dir : str
+        Directory to save the files to
+    min_score : int
+        Minimum relevance score to include sessions
+    format : str
+        Output format ("html" or "png" or "both")
+    gen_csv, gen_symposium : bool
+        Whether to also write the CSV export and the symposium report
+    symposium_view : bool
+        If True, group sessions by symposium in the visualizations
+    compact, gzip_output : bool
+        Whether to write a compact and/or gzip-compressed HTML file
+    png_exporter : image_export.ImageExporter, optional
+        Exporter that keeps the kaleido renderer running between profiles
+        (default: None, start a renderer for this profile's PNG)
+    
+    Returns:
+    --------
+    str or None
+        Path of the HTML visualization, or None if it could not be generated
+    """
+    # HTML output filename
+    view_suffix = "_symposiums" if symposium_view else ""
+    html_file = os.path.join(output_dir, f"{profile}_calendar{view_suffix}.html")
+    
+    # Create title with capitalized profile name
+    title = f"TMS 2025 - {profile.title()} Focus Areas"
+    
+    # Generate the visualization; the PNG is exported from the same figure
+    result = save_interactive_calendar(
+        df=df,
+        profile_data=profile_data,
+        profile_name=profile,
+        min_score=min_score,
+        output_file=html_file,
+        title=title,
+        gen_csv=gen_csv,
+        gen_symposium=gen_symposium,
+        symposium_view=symposium_view,
+        report_dir=output_dir,
+        compact=compact,
+        gzip_output=gzip_output,
+        export_png=format in ("png", "both"),
+        png_exporter=png_exporter,
+        png_width=1600,
+        png_height=900
+    )
+    
+    if not result:
+        print(f"Failed to generate visualization for profile: {profile}")
+        return None
+    if gzip_output:
+        html_file += ".gz"
+    
+    print(f"Successfully saved HTML visualization to: {html_file}")
+    
+    return html_file
+
+# Conference data and PNG exporter of a worker process, set once by _init_worker
+_worker_df = None
+_worker_exporter = None
+
+def _init_worker(df, timings=False, export_png=False):
+    """Keep the scored conference data and a PNG exporter in the worker process, and record stages if timings are on"""
+    global _worker_df, _worker_exporter
+    _worker_df = df
+    if export_png:
+        _worker_exporter = ImageExporter()
+        # Pool workers exit without running atexit handlers, but multiprocessing
+        # runs its finalizers, so the renderer is stopped with the worker
+        multiprocessing_util.Finalize(None, _worker_exporter.close, exitpriority=10)
+    if timings:
+        instrumentation.enable(memory=True)
+
+def _render_profile_task(task):
+    """Render one profile in a worker process, capturing its console output, stage and image export timings"""
+    output = io.StringIO()
+    task_start = time.perf_counter()
+    instrumentation.reset()
+    exported = len(_worker_exporter.timings) if _worker_exporter is not None else 0
+    with contextlib.redirect_stdout(output):
+        try:
+            with stage('render_profile'):
+                html_file = render_profile(_worker_df, png_exporter=_worker_exporter, **task)
+        except Exception as e:
+            print(f"Error rendering profile {task['profile']}: {e}")
+            html_file = None
+    image_timings = _worker_exporter.timings[exported:] if _worker_exporter is not None else []
+    return (task['profile'], html_file, time.perf_counter() - task_start, output.getvalue(),
+            instrumentation.records(), image_timings)
+
+def render_profiles_parallel(df, tasks, jobs, export_png=False):
+    """
+    Render several profiles across a pool of worker processes
+    
+    The conference data is scored before the pool starts and handed to each
+    worker once, so the workers only build figures and write files. Each
+    profile's console output is printed as a block when it finishes. With
+    PNG output, every worker keeps its own kaleido renderer running, so the
+    pool is also a pool of renderers.
+    
+    Parameters:
+    -----------
+    df : SessionCorpus
+        Conference data, already scored for all profiles
+    tasks : list
+        Keyword arguments of render_profile for each profile
+    jobs : int
+        Number of worker processes
+    export_png : bool, optional
+        Whether the tasks write PNG files (default: False)
+    
+    Returns:
+    --------
+    tuple
+        (profile, HTML file or None, seconds) for each profile, in task order,
+        and the image export timings of all workers (see image_export.ImageExporter.timings)
+    """
+    print(f"\nRendering {len(tasks)} profiles with {jobs} worker processes...")
+    results = {}
+    image_timings = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(df, instrumentation.is_enabled(), export_png)) as executor:
+        futures = [executor.submit(_render_profile_task, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            profile, html_file, seconds, output, stage_records, task_image_timings = future.result()
+            print(f"\n[{done}/{len(tasks)}] Finished profile: {profile} ({seconds:.1f}s)")
+            print(output, end="")
+            instrumentation.add_records(stage_records)
+            image_timings.extend(task_image_timings)
+            results[profile] = (profile, html_file, seconds)
+    return [results[task['profile']] for task in tasks], image_timings
+
+def print_timing_summary(results, elapsed, jobs):
+    """Print the time spent on each profile and the total wall time"""
+    print("\n" + "-"*60)
+    print("RENDERING SUMMARY")
+    print("-"*60)
+    for profile, html_file, seconds in results:
+        status = "ok" if html_file else "FAILED"
+        print(f"{profile:<20} {seconds:>8.1f}s  {status}")
+    
+    busy = sum(seconds for _, _, seconds in results)
+    print("-"*60)
+    print(f"{len(results)} profiles in {elapsed:.1f}s wall time with {jobs} job(s) "
+          f"(sum of per-profile times: {busy:.1f}s)")
 
 def main():
     """Command-line interface for generating example visualizations"""
@@ -111,16 +297,45 @@ def main():
                       help="Output format (default: html)")
     parser.add_argument("--open", action="store_true",
                       help="Open the first visualization in a browser")
+    parser.add_argument("--file", help="Path to the TMS Excel file (auto-detected if not specified)")
+    parser.add_argument("--profiles", nargs="+", metavar="PROFILE",
+                      help="Pre-defined profiles to generate, or 'all' (default: all, unless --interests is given)")
+    parser.add_argument("--interests", nargs="+", metavar="FILE",
+                      help="Custom interests JSON files to generate as well")
+    parser.add_argument("--csv", action="store_true",
+                      help="Generate a CSV export of matched sessions per profile")
+    parser.add_argument("--symposium", action="store_true",
+                      help="Generate a report of recommended symposiums per profile")
+    parser.add_argument("--symposium-view", action="store_true",
+                      help="Group sessions by symposium in the visualizations")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                      help="Number of profiles to render in parallel worker processes (default: 1)")
+    parser.add_argument("--compact", action="store_true",
+                      help="Write compact HTML files sharing one plotly.js bundle and session table")
+    parser.add_argument("--gzip", action="store_true",
+                      help="Write gzip-compressed HTML files (.html.gz)")
+    add_timings_argument(parser)
     
     args = parser.parse_args()
+    start_timings(args)
     
     # Generate visualizations
     success = generate_all_examples(
         output_dir=args.output_dir,
         min_score=args.min_score,
         format=args.format,
-        open_browser=args.open
+        open_browser=args.open,
+        data_file=args.file,
+        profiles=args.profiles,
+        interests_files=args.interests,
+        gen_csv=args.csv,
+        gen_symposium=args.symposium,
+        symposium_view=args.symposium_view,
+        jobs=args.jobs,
+        compact=args.compact,
+        gzip_output=args.gzip
     )
+    finish_timings(args)
     
     if success:
         print(f"\nSuccessfully generated visualizations in directory: {args.output_dir}")
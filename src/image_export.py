@@ -0,0 +1,200 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Bulk static image export of Plotly figures.
+
+``fig.write_image`` starts a kaleido renderer (a headless Chrome since
+kaleido 1.0) for every image and stops it again, which takes longer than
+drawing an attendee calendar. An ImageExporter keeps one renderer running for
+all the images it writes and records how long each one took:
+
+    with ImageExporter() as exporter:
+        for profile, fig in figures.items():
+            exporter.write(fig, f"{profile}.png", width=1600, height=900, scale=2)
+    exporter.print_summary()
+
+The first image is exported the usual way, which also checks that kaleido and
+Chrome work; the renderer is then started for the remaining images. kaleido
+1.1 and later provide it (kaleido.start_sync_server), kaleido 0.2 keeps its
+renderer running by itself, and with kaleido 1.0 every image still starts its
+own. Several worker processes, each with its own exporter, make a small pool
+of renderers (see generate_examples.py --jobs).
+"""
+
+import sys
+import time
+
+from instrumentation import stage
+
+
+def kaleido_options():
+    """The options plotly.io.to_image passes to kaleido, for the persistent renderer"""
+    import plotly.io as pio
+
+    defaults = getattr(pio, 'defaults', None)
+    options = {}
+    for name in ('plotlyjs', 'mathjax', 'headers'):
+        value = getattr(defaults, name, None)
+        if value:
+            options[name] = value
+    return options
+
+
+class ImageExporter:
+    """
+    Export many Plotly figures as static images through one kaleido renderer.
+
+    Use it as a context manager, or call ``close`` when done, so the renderer
+    is stopped.
+
+    Attributes:
+    -----------
+    timings : list of dict
+        One entry per image written, in order, with the keys file, seconds
+        (the export time), ok, and first (True for the first image, whose
+        time includes starting the renderer)
+    mode : str
+        'unstarted' before the first image, then 'persistent' (one renderer
+        for all images), 'per_image' (a renderer per image, kaleido 1.0) or
+        'unavailable' (kaleido or Chrome is missing)
+    """
+
+    def __init__(self):
+        self.timings = []
+        self.mode = 'unstarted'
+        self._server_started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, fig, output_file, width=None, height=None, scale=None):
+        """
+        Export a figure as a static image.
+
+        Parameters:
+        -----------
+        fig : plotly.graph_objects.Figure
+            The figure to export
+        output_file : str
+            Path of the image; the format follows the extension (.png, .svg, .pdf, ...)
+        width, height : int, optional
+            Size of the image in layout pixels (default: None, the figure's or plotly's default)
+        scale : float, optional
+            Resolution factor (default: None, plotly's default)
+
+        Returns:
+        --------
+        bool
+            True if successful, False otherwise
+        """
+        if self.mode == 'unavailable':
+            self.timings.append({'file': output_file, 'seconds': 0.0, 'ok': False, 'first': False})
+            return False
+
+        first = self.mode == 'unstarted'
+        start = time.perf_counter()
+        error = self._export(fig, output_file, width, height, scale)
+        if error is not None and not isinstance(error, OSError) and self._server_started:
+            # The renderer may have died; start one for each of the remaining images
+            print("Warning: The kaleido renderer failed; starting a new renderer for every image")
+            self._stop_server()
+            self.mode = 'per_image'
+            error = self._export(fig, output_file, width, height, scale)
+        ok = error is None
+        self.timings.append({'file': output_file, 'seconds': time.perf_counter() - start, 'ok': ok,
+                             'first': first})
+
+        if first and ok:
+            self._start_renderer()
+        elif first and not isinstance(error, OSError):
+            print("Skipping the remaining images: static image export needs the kaleido package "
+                  "(and Chrome for kaleido 1.0 and later; pip install -U kaleido)")
+            self.mode = 'unavailable'
+        return ok
+
+    def _export(self, fig, output_file, width, height, scale):
+        """Write one image, returning the exception if it failed, or None"""
+        try:
+            with stage('write_png', traces=len(fig.data)):
+                fig.write_image(output_file, width=width, height=height, scale=scale)
+        except Exception as e:
+            print(f"Error exporting {output_file}: {e}")
+            return e
+        return None
+
+    def _start_renderer(self):
+        """Keep a kaleido renderer running for the images after the first"""
+        import kaleido
+
+        if hasattr(kaleido, 'start_sync_server'):
+            try:
+                kaleido.start_sync_server(silence_warnings=True, **kaleido_options())
+            except Exception as e:
+                print(f"Warning: Could not start a persistent kaleido renderer: {e}")
+                self.mode = 'per_image'
+                return
+            self._server_started = True
+            self.mode = 'persistent'
+        elif hasattr(kaleido, 'scopes'):
+            # kaleido 0.2 keeps the renderer of its scope running between images
+            self.mode = 'persistent'
+        else:
+            print("Note: kaleido 1.0 starts a renderer for every image; "
+                  "upgrade to kaleido 1.1 or later to keep one running (pip install -U kaleido)")
+            self.mode = 'per_image'
+
+    def _stop_server(self):
+        """Stop the renderer started by this exporter"""
+        if self._server_started:
+            import kaleido
+            try:
+                kaleido.stop_sync_server(silence_warnings=True)
+            except Exception:
+                pass
+            self._server_started = False
+
+    def close(self):
+        """Stop the renderer; later images would start a new one"""
+        self._stop_server()
+        if self.mode == 'persistent':
+            self.mode = 'unstarted'
+
+    def print_summary(self, file=None):
+        """Print the export time of every image (see print_export_summary)"""
+        print_export_summary(self.timings, file=file)
+
+
+def print_export_summary(timings, file=None):
+    """
+    Print the time each image took to export, and the totals.
+
+    Parameters:
+    -----------
+    timings : list of dict
+        Entries like those of ImageExporter.timings, e.g. collected from
+        several worker processes
+    file : file object, optional
+        Where to print (default: sys.stdout)
+    """
+    file = file or sys.stdout
+    if not timings:
+        return
+    print("\n" + "-"*60, file=file)
+    print("IMAGE EXPORT", file=file)
+    print("-"*60, file=file)
+    for entry in timings:
+        status = "ok" if entry['ok'] else "FAILED"
+        print(f"{entry['seconds']:>8.2f}s  {status:<6}  {entry['file']}", file=file)
+
+    exported = [entry for entry in timings if entry['ok']]
+    print("-"*60, file=file)
+    print(f"{len(exported)} of {len(timings)} images exported in {sum(entry['seconds'] for entry in timings):.1f}s",
+          file=file)
+    first = [entry['seconds'] for entry in exported if entry.get('first')]
+    rest = [entry['seconds'] for entry in exported if not entry.get('first')]
+    if first and rest:
+        print(f"First image of each renderer: {sum(first) / len(first):.2f}s on average (includes starting it); "
+              f"other images: {sum(rest) / len(rest):.2f}s", file=file)
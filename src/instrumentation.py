@@ -0,0 +1,393 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Stage-level timing and memory instrumentation for the TMS Conference Planner.
+
+The pipeline marks its stages (finding and reading the data, normalizing the
+times, scoring, filtering, conflict detection, building figures, writing
+files) with ``stage``:
+
+    with stage('read_excel') as timing:
+        df = read_excel_cached(file_path)
+        timing.add(rows=len(df))
+
+Stages cost next to nothing until instrumentation is switched on, either by
+``enable`` (the ``--timings`` option of the command-line tools) or by
+registering a hook with ``add_hook``. Each finished stage is then recorded
+with its wall time, CPU time, the peak memory Python allocated above the
+level at its start (tracemalloc, only with ``enable(memory=True)``) and its
+counts (rows, traces, ...). Stages nest; the recorded stages are printed as a
+summary table (print_summary) or written as a Chrome trace that
+chrome://tracing and https://ui.perfetto.dev display (write_chrome_trace).
+
+tracemalloc slows down allocation-heavy code, so the wall times of a run
+with memory tracking are only comparable with other runs that track memory.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+_records = []
+_hooks = []
+_recording = False
+_track_memory = False
+_started_tracemalloc = False
+_local = threading.local()
+
+# Perf counter readings are converted to epoch microseconds for the trace,
+# so stages recorded in worker processes line up with the parent's
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+class StageTiming:
+    """
+    A running stage, yielded by ``stage`` so the code in it can add counts.
+
+    Attributes:
+    -----------
+    name : str
+        Stage name
+    counts : dict
+        Counts describing the work done, e.g. {"rows": 600}
+    """
+
+    def __init__(self, name, counts):
+        self.name = name
+        self.counts = counts
+        self.peak_memory = 0
+
+    def add(self, **counts):
+        """Set counts of the stage, e.g. ``timing.add(rows=len(df))``"""
+        self.counts.update(counts)
+
+
+class _NullTiming:
+    """Stand-in for StageTiming while instrumentation is off"""
+
+    name = None
+    counts = {}
+
+    def add(self, **counts):
+        pass
+
+
+_NULL_TIMING = _NullTiming()
+
+
+def _stack():
+    """The stages running in the current thread, innermost last"""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def stage(name, **counts):
+    """
+    Time a pipeline stage.
+
+    Parameters:
+    -----------
+    name : str
+        Stage name, e.g. 'score' (stages with the same name are combined in the summary)
+    **counts : int, optional
+        Counts known when the stage starts, e.g. rows=len(df); more can be
+        added with the ``add`` method of the yielded StageTiming
+
+    Yields:
+    -------
+    StageTiming
+        The running stage (a no-op stand-in while instrumentation is off)
+    """
+    if not (_recording or _hooks):
+        yield _NULL_TIMING
+        return
+
+    stack = _stack()
+    timing = StageTiming(name, counts)
+    start_memory = 0
+    if _track_memory and tracemalloc.is_tracing():
+        # The peak of the enclosing stage so far, before starting a new peak window
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].peak_memory = max(stack[-1].peak_memory, peak)
+        tracemalloc.reset_peak()
+        start_memory = current
+        timing.peak_memory = current
+
+    stack.append(timing)
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - start_cpu
+        stack.pop()
+        record = {
+            'name': name,
+            'start': _EPOCH_OFFSET + start,
+            'wall': wall,
+            'cpu': cpu,
+            'depth': len(stack),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'counts': dict(timing.counts),
+        }
+        if _track_memory and tracemalloc.is_tracing():
+            peak = max(timing.peak_memory, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, peak)
+            record['peak_memory'] = peak - start_memory
+        _finish(record)
+
+
+def _finish(record):
+    """Store a finished stage and pass it to the hooks"""
+    if _recording:
+        _records.append(record)
+    for hook in list(_hooks):
+        hook(record)
+
+
+def enable(memory=True):
+    """
+    Start recording stages.
+
+    Parameters:
+    -----------
+    memory : bool, optional
+        Also record the peak memory of each stage with tracemalloc (default: True)
+    """
+    global _recording, _track_memory, _started_tracemalloc
+    _recording = True
+    _track_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+
+
+def disable():
+    """Stop recording stages (the recorded ones are kept until reset)"""
+    global _recording, _track_memory, _started_tracemalloc
+    _recording = False
+    _track_memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    """Whether stages are being recorded"""
+    return _recording
+
+
+def reset():
+    """Forget the recorded stages"""
+    _records.clear()
+
+
+def records():
+    """
+    Get the recorded stages.
+
+    Returns:
+    --------
+    list of dict
+        One dictionary per finished stage, in the order they finished, with
+        the keys name, start (epoch seconds), wall and cpu (seconds), depth,
+        pid, tid, counts and, with memory tracking, peak_memory (bytes)
+    """
+    return list(_records)
+
+
+def add_records(stage_records):
+    """
+    Add stages recorded elsewhere, e.g. returned by a worker process.
+
+    Parameters:
+    -----------
+    stage_records : list of dict
+        Records as returned by ``records``
+    """
+    for record in stage_records:
+        _finish(record)
+
+
+def add_hook(callback):
+    """
+    Call a function with every finished stage, as a dictionary like those of ``records``.
+
+    Stages are measured while any hook is registered, even if recording is
+    off (memory is only tracked after ``enable(memory=True)``).
+
+    Parameters:
+    -----------
+    callback : callable
+        Function taking one stage record
+    """
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    """Stop calling a function added with add_hook"""
+    if callback in _hooks:
+        _hooks.remove(callback)
+
+
+def summarize(stage_records=None):
+    """
+    Combine the records of each stage name.
+
+    Parameters:
+    -----------
+    stage_records : list of dict, optional
+        Records to combine (default: None, the recorded stages)
+
+    Returns:
+    --------
+    list of dict
+        Per stage name, in the order the stages first started: name, depth
+        (of the first call), calls, wall, cpu, peak_memory (the largest of
+        any call, or None without memory tracking) and the summed counts
+    """
+    if stage_records is None:
+        stage_records = _records
+    summary = {}
+    for record in sorted(stage_records, key=lambda r: r['start']):
+        entry = summary.get(record['name'])
+        if entry is None:
+            entry = summary[record['name']] = {'name': record['name'], 'depth': record['depth'], 'calls': 0,
+                                               'wall': 0.0, 'cpu': 0.0, 'peak_memory': None, 'counts': {}}
+        entry['calls'] += 1
+        entry['wall'] += record['wall']
+        entry['cpu'] += record['cpu']
+        if 'peak_memory' in record:
+            entry['peak_memory'] = max(entry['peak_memory'] or 0, record['peak_memory'])
+        for key, value in record['counts'].items():
+            entry['counts'][key] = entry['counts'].get(key, 0) + value
+    return list(summary.values())
+
+
+def print_summary(stage_records=None, file=None):
+    """
+    Print a table of the time and memory spent in each stage.
+
+    Nested stages are indented under the stage they ran in, and their time is
+    included in it.
+
+    Parameters:
+    -----------
+    stage_records : list of dict, optional
+        Records to summarize (default: None, the recorded stages)
+    file : file object, optional
+        Where to print (default: sys.stdout)
+    """
+    file = file or sys.stdout
+    summary = summarize(stage_records)
+    print("\n" + "-"*88, file=file)
+    print("STAGE TIMINGS", file=file)
+    print("-"*88, file=file)
+    if not summary:
+        print("No stages were recorded", file=file)
+        return
+    print(f"{'stage':<28} {'calls':>5} {'wall':>9} {'cpu':>9} {'peak mem':>10}  counts", file=file)
+    for entry in summary:
+        name = "  " * entry['depth'] + entry['name']
+        memory = "" if entry['peak_memory'] is None else f"{entry['peak_memory'] / 1e6:7.1f} MB"
+        counts = ", ".join(f"{key}={value}" for key, value in entry['counts'].items())
+        print(f"{name:<28} {entry['calls']:>5} {entry['wall']:>8.3f}s {entry['cpu']:>8.3f}s {memory:>10}  {counts}",
+              file=file)
+
+
+def chrome_trace(stage_records=None):
+    """
+    Convert stage records to the Chrome trace event format.
+
+    Parameters:
+    -----------
+    stage_records : list of dict, optional
+        Records to convert (default: None, the recorded stages)
+
+    Returns:
+    --------
+    dict
+        Trace with one complete ('X') event per stage
+    """
+    if stage_records is None:
+        stage_records = _records
+    events = []
+    for pid in sorted({record['pid'] for record in stage_records}):
+        label = "main" if pid == os.getpid() else f"worker {pid}"
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': label}})
+    for record in stage_records:
+        args = {'cpu_ms': round(record['cpu'] * 1000, 3)}
+        if 'peak_memory' in record:
+            args['peak_memory_mb'] = round(record['peak_memory'] / 1e6, 3)
+        args.update(record['counts'])
+        events.append({
+            'name': record['name'],
+            'cat': 'tms',
+            'ph': 'X',
+            'ts': round(record['start'] * 1e6, 1),
+            'dur': round(record['wall'] * 1e6, 1),
+            'pid': record['pid'],
+            'tid': record['tid'],
+            'args': args,
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(path, stage_records=None):
+    """
+    Write stage records as a Chrome trace JSON file.
+
+    Parameters:
+    -----------
+    path : str
+        File to write
+    stage_records : list of dict, optional
+        Records to write (default: None, the recorded stages)
+
+    Returns:
+    --------
+    bool
+        True if successful, False otherwise
+    """
+    try:
+        with open(path, 'w') as f:
+            json.dump(chrome_trace(stage_records), f)
+    except OSError as e:
+        print(f"Error: Could not write the timing trace {path}: {e}")
+        return False
+    print(f"Timing trace saved to {path} (open it in chrome://tracing or https://ui.perfetto.dev)")
+    return True
+
+
+def add_timings_argument(parser):
+    """Add the --timings option to a command-line parser"""
+    parser.add_argument("--timings", nargs="?", const=True, default=None, metavar="TRACE_FILE",
+                      help="Print the time and peak memory of each stage (memory tracking slows the run "
+                           "down); with a file name, also save them as a Chrome trace (JSON)")
+
+
+def start_timings(args):
+    """Start recording stages if --timings was given"""
+    if args.timings:
+        enable(memory=True)
+
+
+def finish_timings(args):
+    """Print the stage summary and write the trace file requested with --timings"""
+    if not args.timings:
+        return
+    disable()
+    print_summary()
+    if isinstance(args.timings, str):
+        write_chrome_trace(args.timings)
@@ -0,0 +1,151 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Multi-pattern keyword matcher for large interest profiles.
+
+A KeywordAutomaton is compiled once per profile and finds every keyword hit
+in a session's text in a single pass, instead of one substring scan per
+keyword. The keywords are arranged in a trie that is compiled into one regular
+expression, so the scan runs inside the regex engine: at each position the
+trie follows at most one branch per character, like an Aho-Corasick goto
+function. The expression is wrapped in a lookahead so overlapping hits are
+found, and it reports the longest keyword starting at each position; the
+shorter keywords starting there are exactly its prefixes that are keywords
+too, which are added from a precomputed table.
+"""
+
+import re
+
+import numpy as np
+
+
+def _trie_regex(keywords):
+    """Compile a list of literal keywords into a trie-shaped regex pattern"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True  # End-of-keyword marker
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: make the longer continuations optional (greedy, so longest wins)
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """
+    Compiled matcher for all keywords of a set of focus areas.
+
+    Keywords are matched case-insensitively as substrings, exactly like
+    ``keyword.lower() in text.lower()``. Each distinct lowercased keyword gets
+    an integer ID (its position in ``keywords``).
+
+    Parameters:
+    -----------
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+    """
+
+    def __init__(self, focus_areas):
+        self.focus_areas = focus_areas
+
+        # Distinct lowercased keywords; the list position is the keyword ID
+        self.keywords = list(dict.fromkeys(keyword.lower() for keywords in focus_areas.values()
+                                           for keyword in keywords))
+        self.keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        # Keyword IDs per area, in the area's keyword order
+        self.area_keyword_ids = {area: [self.keyword_ids[keyword.lower()] for keyword in keywords]
+                                 for area, keywords in focus_areas.items()}
+
+        # For each keyword, the IDs of all keywords that are prefixes of it (itself included)
+        self._prefix_ids = {keyword: [self.keyword_ids[other] for other in self.keywords
+                                      if keyword.startswith(other)]
+                            for keyword in self.keywords}
+
+        # The empty string is a substring of everything and cannot go in the trie
+        self._always_ids = {self.keyword_ids['']} if '' in self.keyword_ids else set()
+        trie_keywords = [keyword for keyword in self.keywords if keyword]
+        self._pattern = re.compile('(?=(' + _trie_regex(trie_keywords) + '))') if trie_keywords else None
+
+    def find(self, text):
+        """
+        Find every keyword contained in a lowercased text.
+
+        Parameters:
+        -----------
+        text : str
+            Lowercased session text
+
+        Returns:
+        --------
+        set
+            IDs of the keywords found in the text
+        """
+        found = set(self._always_ids)
+        if self._pattern is not None:
+            for longest in set(self._pattern.findall(text)):
+                found.update(self._prefix_ids[longest])
+        return found
+
+    def match_matrix(self, texts):
+        """
+        Match all keywords against a sequence of lowercased texts.
+
+        Parameters:
+        -----------
+        texts : iterable of str
+            Lowercased session texts
+
+        Returns:
+        --------
+        numpy ndarray
+            Boolean matrix of shape (len(texts), len(keywords))
+        """
+        texts = list(texts)
+        matrix = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        for row, text in enumerate(texts):
+            ids = self.find(text)
+            if ids:
+                matrix[row, list(ids)] = True
+        return matrix
+
+    def area_matches(self, text, found=None):
+        """
+        Group the keywords found in a text by focus area.
+
+        The result has the same shape as the ``interest_matches`` entries built
+        by user_customized_featurizer: only areas with at least one match, each
+        listing its matched keywords as spelled in the profile.
+
+        Parameters:
+        -----------
+        text : str
+            Lowercased session text
+        found : set, optional
+            Keyword IDs already returned by find() for this text
+
+        Returns:
+        --------
+        dict
+            Dictionary mapping focus areas to lists of matched keywords
+        """
+        if found is None:
+            found = self.find(text)
+
+        matches = {}
+        for area, keywords in self.focus_areas.items():
+            area_hits = [keyword for keyword, keyword_id in zip(keywords, self.area_keyword_ids[area])
+                         if keyword_id in found]
+            if area_hits:
+                matches[area] = area_hits
+        return matches
@@ -0,0 +1,228 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Keyword hit cache shared by every scorer of a corpus.
+
+The research profiles (built-in and custom) and the NVIDIA product keyword
+tables share many keywords, e.g. "titanium", "defect", "tem", "coating" or
+"simulation". A KeywordHitCache stores which sessions contain each keyword
+that has been matched so far as a packed bitset, so any later profile or
+table only scans the corpus for keywords it has not seen yet.
+
+Caches are identified by a fingerprint of the session text: every
+SessionCorpus built from the same data shares one cache (see
+shared_hit_cache), and a cache saved to disk is only loaded back for the
+same data. The cache holds at most ``max_keywords`` keywords and evicts the
+least recently used ones first. Caches are safe to use from several threads.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Default number of keywords kept per cache
+DEFAULT_MAX_KEYWORDS = 4096
+
+# Number of corpora whose caches are kept in memory by shared_hit_cache
+MAX_SHARED_CACHES = 4
+
+_shared_caches = OrderedDict()
+_shared_caches_lock = threading.Lock()
+
+
+def corpus_fingerprint(text):
+    """
+    Identify a corpus by its session text.
+
+    Parameters:
+    -----------
+    text : pandas Series
+        Lowercased session text, as returned by scoring.build_session_text
+
+    Returns:
+    --------
+    str
+        Hex digest that changes whenever any session text or the session order changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(text)).encode('utf-8'))
+    for session_text in text:
+        digest.update(b'\0')
+        digest.update(session_text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class KeywordHitCache:
+    """
+    Bounded LRU mapping from lowercased keywords to session hit arrays.
+
+    Supports the dictionary operations keyword_match_matrix uses for its
+    ``hits`` cache: ``needle in cache``, ``cache[needle]`` (a boolean array
+    over the sessions), ``cache.get(needle)`` and ``cache.update(hits)``.
+
+    Parameters:
+    -----------
+    fingerprint : str
+        Fingerprint of the corpus the hits belong to (see corpus_fingerprint)
+    n_sessions : int
+        Number of sessions in the corpus
+    max_keywords : int, optional
+        Number of keywords to keep before evicting the least recently used
+        (default: DEFAULT_MAX_KEYWORDS)
+    """
+
+    def __init__(self, fingerprint, n_sessions, max_keywords=DEFAULT_MAX_KEYWORDS):
+        self.fingerprint = fingerprint
+        self.n_sessions = n_sessions
+        self.max_keywords = max_keywords
+        self._bits = OrderedDict()
+        # Reading a keyword reorders _bits, so every access takes the lock
+        self._lock = threading.Lock()
+        # True when keywords were added since the cache was loaded or saved
+        self.modified = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __contains__(self, needle):
+        with self._lock:
+            return needle in self._bits
+
+    def __getitem__(self, needle):
+        with self._lock:
+            bits = self._bits[needle]
+            self._bits.move_to_end(needle)
+        return np.unpackbits(bits, count=self.n_sessions).astype(bool)
+
+    def get(self, needle, default=None):
+        """The hit array of a keyword, or default if it is not cached"""
+        with self._lock:
+            bits = self._bits.get(needle)
+            if bits is None:
+                return default
+            self._bits.move_to_end(needle)
+        return np.unpackbits(bits, count=self.n_sessions).astype(bool)
+
+    def __setitem__(self, needle, hits):
+        bits = np.packbits(np.asarray(hits, dtype=bool))
+        with self._lock:
+            self._bits[needle] = bits
+            self._bits.move_to_end(needle)
+            self.modified = True
+            while len(self._bits) > self.max_keywords:
+                self._bits.popitem(last=False)
+
+    def update(self, hits):
+        """Add the hit arrays of several keywords"""
+        for needle, needle_hits in hits.items():
+            self[needle] = needle_hits
+
+    def save(self, path):
+        """
+        Write the cache to a compressed .npz file.
+
+        Parameters:
+        -----------
+        path : str
+            File to write
+
+        Returns:
+        --------
+        bool
+            True if successful, False otherwise
+        """
+        with self._lock:
+            keywords = list(self._bits)
+            rows = [self._bits[needle] for needle in keywords]
+        bits = (np.stack(rows) if keywords
+                else np.zeros((0, (self.n_sessions + 7) // 8), dtype=np.uint8))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, fingerprint=np.array(self.fingerprint),
+                                    keywords=np.array(keywords, dtype=str), bits=bits)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write keyword cache {path}: {e}")
+            return False
+        self.modified = False
+        return True
+
+    def load(self, path):
+        """
+        Add the hits saved in a file, if they belong to the same corpus.
+
+        Parameters:
+        -----------
+        path : str
+            File written by save
+
+        Returns:
+        --------
+        int
+            Number of keywords loaded (0 if the file is missing, unreadable
+            or was saved for other data)
+        """
+        try:
+            with np.load(path) as data:
+                if str(data['fingerprint']) != self.fingerprint:
+                    return 0
+                keywords, bits = data['keywords'].tolist(), data['bits']
+        except (OSError, ValueError, KeyError):
+            return 0
+
+        # Keep the keywords already in memory as the most recently used
+        with self._lock:
+            loaded = OrderedDict((needle, row) for needle, row in zip(keywords, bits) if needle not in self._bits)
+            loaded.update(self._bits)
+            self._bits = loaded
+            while len(self._bits) > self.max_keywords:
+                self._bits.popitem(last=False)
+        return len(keywords)
+
+
+def shared_hit_cache(text, max_keywords=DEFAULT_MAX_KEYWORDS):
+    """
+    Get the hit cache shared by every corpus with this session text.
+
+    Parameters:
+    -----------
+    text : pandas Series
+        Lowercased session text of the corpus
+    max_keywords : int, optional
+        Keyword limit of a newly created cache (default: DEFAULT_MAX_KEYWORDS)
+
+    Returns:
+    --------
+    KeywordHitCache
+        The existing cache for the same text, or a new empty one
+    """
+    fingerprint = corpus_fingerprint(text)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(fingerprint)
+        if cache is None:
+            cache = KeywordHitCache(fingerprint, len(text), max_keywords)
+            _shared_caches[fingerprint] = cache
+            while len(_shared_caches) > MAX_SHARED_CACHES:
+                _shared_caches.popitem(last=False)
+        else:
+            _shared_caches.move_to_end(fingerprint)
+    return cache
+
+
+def clear_shared_caches():
+    """Forget the hit caches shared between corpora (e.g. to time scoring from scratch)"""
+    with _shared_caches_lock:
+        _shared_caches.clear()
@@ -7,38 +7,16 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import gzip
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.io as pio
 from pathlib import Path
 
 # Import from analyze_tms module
-from analyze_tms import score_session_relevance, find_data_file
-
-def time_to_float(time_str):
-    """Convert time string to float hours (e.g., '09:30' → 9.5)"""
-    try:
-        if isinstance(time_str, str):
-            if ':' in time_str:
-                hours, minutes = map(int, time_str.split(':'))
-                # Handle 24-hour format correctly
-                # Make sure to constrain hours to 0-23 range
-                if hours < 0 or hours > 23:
-                    print(f"Warning: Invalid hour in time format: {time_str}, constraining to valid range")
-                    hours = max(0, min(hours, 23))
-                return hours + minutes / 60.0
-            else:
-                print(f"Warning: Unexpected time format: {time_str}, using default")
-                return 12.0
-        elif hasattr(time_str, 'hour') and hasattr(time_str, 'minute'):
-            return time_str.hour + time_str.minute / 60.0
-        else:
-            print(f"Warning: Unknown time format: {time_str}, using default")
-            return 12.0
-    except Exception as e:
-        print(f"Error parsing time '{time_str}': {e}")
-        return 12.0
+from analyze_tms import find_data_file
+from scoring import area_match_matrix, matched_keywords, top_k_positions
+from corpus import as_corpus
+from conflicts import conflict_counts
+from instrumentation import stage, add_timings_argument, start_timings, finish_timings
 
 def get_focus_area_colors(focus_areas):
     """Generate distinct colors for each focus area"""
@@ -75,80 +53,82 @@ def wrap_text(text, width=80):
     import textwrap
     return "<br>".join(textwrap.wrap(text, width=width))
 
-def generate_symposium_report(df, focus_areas=None, min_score=3):
+def generate_symposium_report(df, focus_areas=None, min_score=3, top=None):
     """
     Generate a report of suggested symposiums to attend based on interest matches.
     
     Parameters:
     -----------
-    df : pandas DataFrame
+    df : SessionCorpus or pandas DataFrame
         Conference data
     focus_areas : dict
         Dictionary mapping focus areas to lists of keywords
     min_score : int
         Minimum relevance score to include sessions
+    top : int, optional
+        Only report the symposiums with the top highest average scores; the
+        others are neither sorted nor summarized (default: None, all)
         
     Returns:
     --------
     dict
-        A dictionary with symposium information and ratings
+        A dictionary with symposium information and ratings, best average score first
     """
     if df is None or df.empty:
         print("No data available to analyze.")
         return None
     
+    corpus = as_corpus(df)
+    
     # Score sessions based on focus areas
     if focus_areas:
-        df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+        scored = corpus.scored(focus_areas)
+        area_matches = scored.area_matches
         # Filter by minimum score
-        relevant_df = df[df['relevance_score'] >= min_score].copy()
+        relevant_df = scored.select(min_score=min_score).frame()
     else:
-        relevant_df = df.copy()
-        relevant_df['relevance_score'] = 1
+        relevant_df = corpus.df.assign(relevance_score=1)
     
     if relevant_df.empty:
         print(f"No sessions with relevance score >= {min_score} found.")
         return None
     
-    # Group by symposium
-    symposium_data = {}
+    # Per-symposium metrics in one grouped pass
+    symposiums = relevant_df['Symposium']
+    stats = relevant_df.groupby(symposiums).agg(
+        total_sessions=('relevance_score', 'size'),
+        avg_score=('relevance_score', 'mean'),
+        max_score=('relevance_score', 'max'),
+        rooms=('Location', 'unique'),
+    )
+    date_counts = relevant_df.groupby([symposiums, corpus.days.loc[relevant_df.index]]).size()
+    if focus_areas:
+        area_counts = area_matches.loc[relevant_df.index, list(focus_areas)].groupby(symposiums).sum()
     
-    for symposium, group in relevant_df.groupby('Symposium'):
-        # Calculate metrics for this symposium
-        total_sessions = len(group)
-        avg_score = group['relevance_score'].mean()
-        max_score = group['relevance_score'].max()
-        session_count_by_date = group.groupby(group['Date'].dt.date).size().to_dict()
-        
-        # Get room info
-        rooms = group['Location'].unique()
+    # Rank the symposiums by average score and keep the best ones
+    ranked = stats.index[top_k_positions(stats['avg_score'].to_numpy(), len(stats) if top is None else top)]
+    
+    # Assemble the report of the selected symposiums, best average score first
+    symposium_data = {}
+    for symposium in ranked:
+        row = stats.loc[symposium]
         
-        # Get matching focus areas
+        # Count the sessions matching each focus area
         focus_area_matches = {}
         if focus_areas:
-            for area, keywords in focus_areas.items():
-                # Count sessions matching this area
-                matches = sum(1 for _, row in group.iterrows() if any(
-                    keyword.lower() in ' '.join([str(val) for val in row.values if isinstance(val, str)]).lower()
-                    for keyword in keywords
-                ))
-                if matches > 0:
-                    focus_area_matches[area] = matches
+            counts = area_counts.loc[symposium]
+            focus_area_matches = {area: int(count) for area, count in counts.items() if count > 0}
         
-        # Store symposium data
         symposium_data[symposium] = {
-            'total_sessions': total_sessions,
-            'avg_score': avg_score,
-            'max_score': max_score,
-            'sessions_by_date': session_count_by_date,
-            'rooms': list(rooms),
+            'total_sessions': int(row['total_sessions']),
+            'avg_score': row['avg_score'],
+            'max_score': row['max_score'],
+            'sessions_by_date': date_counts.loc[symposium].to_dict(),
+            'rooms': list(row['rooms']),
             'focus_area_matches': focus_area_matches
         }
     
-    # Sort symposiums by average score
-    sorted_symposiums = sorted(symposium_data.items(), key=lambda x: x[1]['avg_score'], reverse=True)
-    
-    return dict(sorted_symposiums)
+    return symposium_data
 
 def export_sessions_to_csv(df, focus_areas=None, min_score=3, output_file=None):
     """
@@ -156,7 +136,7 @@ def export_sessions_to_csv(df, focus_areas=None, min_score=3, output_file=None):
     
     Parameters:
     -----------
-    df : pandas DataFrame
+    df : SessionCorpus or pandas DataFrame
         Conference data
     focus_areas : dict
         Dictionary mapping focus areas to lists of keywords
@@ -174,37 +154,33 @@ def export_sessions_to_csv(df, focus_areas=None, min_score=3, output_file=None):
         print("No data available to export.")
         return False
     
+    corpus = as_corpus(df)
+    
     # Score sessions based on focus areas
     if focus_areas:
-        df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+        scored = corpus.scored(focus_areas)
+        area_matches = scored.area_matches
         # Filter by minimum score
-        relevant_df = df[df['relevance_score'] >= min_score].copy()
+        relevant_df = scored.select(min_score=min_score).frame()
     else:
-        relevant_df = df.copy()
-        relevant_df['relevance_score'] = 1
+        relevant_df = corpus.df.assign(relevance_score=1)
     
     if relevant_df.empty:
         print(f"No sessions with relevance score >= {min_score} found.")
         return False
     
-    # Add a column for matched focus areas
-    def get_matched_areas(row):
-        if not focus_areas:
-            return ""
-        
-        session_text = ' '.join([str(val) for val in row.values if isinstance(val, str)]).lower()
-        matched = []
-        
-        for area, keywords in focus_areas.items():
-            if any(kw.lower() in session_text for kw in keywords):
-                matched.append(area)
+    with stage('filter_sort', rows=len(relevant_df)):
+        # Add a column for matched focus areas
+        if focus_areas:
+            relevant_area_matches = area_matches.loc[relevant_df.index]
+            area_names = relevant_area_matches.columns
+            relevant_df['matched_areas'] = [", ".join(area_names[row])
+                                            for row in relevant_area_matches.to_numpy()]
+        else:
+            relevant_df['matched_areas'] = ""
         
-        return ", ".join(matched)
-    
-    relevant_df['matched_areas'] = relevant_df.apply(get_matched_areas, axis=1)
-    
-    # Sort by date, start time, and relevance score
-    sorted_df = relevant_df.sort_values(['Date', 'Start', 'relevance_score'], ascending=[True, True, False])
+        # Sort by date, start time, and relevance score
+        sorted_df = relevant_df.sort_values(['Date', 'Start', 'relevance_score'], ascending=[True, True, False])
     
     # Select columns for export
     export_columns = ['Date', 'Start', 'End', 'Location', 'Symposium', 'Session', 'Title', 
@@ -219,21 +195,268 @@ def export_sessions_to_csv(df, focus_areas=None, min_score=3, output_file=None):
     
     # Export to CSV
     try:
-        sorted_df[actual_columns].to_csv(output_file, index=False)
+        with stage('write_csv', rows=len(sorted_df)):
+            sorted_df[actual_columns].to_csv(output_file, index=False)
         print(f"Successfully exported {len(sorted_df)} sessions to {output_file}")
         return True
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
         return False
 
+# Ways of drawing the session blocks of create_interactive_calendar
+CALENDAR_RENDERERS = ('batched', 'traces', 'webgl')
+
+# Shared session details of compact HTML exports, next to the plotly.js bundle;
+# named after the data they were written from (see write_session_table)
+SESSION_TABLE_FILE = "tms_sessions-{signature}.js"
+
+# Columns shown in the session hover text
+SESSION_DETAIL_COLUMNS = ['Title', 'Start', 'End', 'Location', 'Symposium', 'Speaker',
+                          'SpeakerAffiliation', 'Description']
+
+def session_hover_parts(session):
+    """
+    Get the profile-independent parts of a session's hover text.
+    
+    Parameters:
+    -----------
+    session : pandas Series
+        One session of the conference data
+    
+    Returns:
+    --------
+    tuple of (str, str)
+        The details shown before the profile-specific lines (title, time,
+        room, symposium, speaker, affiliation) and after them (the wrapped
+        description)
+    """
+    speaker = f"<br><b>Speaker:</b> {session['Speaker']}" if 'Speaker' in session and pd.notna(session['Speaker']) else ""
+    affiliation = f"<br><b>Affiliation:</b> {session['SpeakerAffiliation']}" if 'SpeakerAffiliation' in session and pd.notna(session['SpeakerAffiliation']) else ""
+    
+    # Include symposium information
+    symposium = f"<br><b>Symposium:</b> {session['Symposium']}" if 'Symposium' in session and pd.notna(session['Symposium']) else ""
+    
+    # Wrap description text for better readability
+    description = ""
+    if 'Description' in session and pd.notna(session['Description']):
+        description = f"<br><br>{wrap_text(session['Description'], width=60)}"
+    
+    head = f"<b>{session['Title']}</b><br>" + \
+           f"<b>Time:</b> {session['Start']} - {session['End']}<br>" + \
+           f"<b>Room:</b> {session['Location']}" + \
+           symposium + \
+           speaker + \
+           affiliation
+    return head, description
+
+def add_calendar_blocks(fig, col, blocks, color, name, showlegend=True, renderer='batched',
+                        width=0.8, font_size=9, compact_hover=False):
+    """
+    Draw calendar blocks (sessions or symposiums) of one color on a day's subplot.
+    
+    Parameters:
+    -----------
+    fig : plotly.graph_objects.Figure
+        Figure with one subplot column per day
+    col : int
+        Subplot column of the day (starting at 1)
+    blocks : list of dict
+        Blocks to draw, each with 'x' (room position), 'start' and 'end' (float
+        hours), 'hover' (hover text), 'label' (text shown in the block, empty for
+        none) and 'outline' (line style dict)
+    color : str
+        Fill color of the blocks
+    name : str
+        Legend entry of the blocks; blocks and labels are toggled together
+    showlegend : bool
+        Whether to show this legend entry (only once per name)
+    renderer : str
+        'batched' draws all blocks as one bar trace, with the hover text as
+        customdata, plus one trace for their labels; 'webgl' draws the same
+        with WebGL (Scattergl) traces; 'traces' draws two traces per block
+        (default: 'batched')
+    width : float
+        Block width in room positions (default: 0.8)
+    font_size : int
+        Label font size (default: 9)
+    compact_hover : bool
+        If True and every block has a 'session' ID, the figure only keeps each
+        block's 'extra' (profile-specific) hover lines with the session ID as
+        customdata; the rest is filled in from the shared session table of a
+        compact HTML export. Not used by the 'traces' renderer (default: False)
+    """
+    import plotly.graph_objects as go
+    
+    label_font = dict(size=font_size, color="black", family="Arial, sans-serif")
+    
+    if renderer == 'traces':
+        for block_idx, block in enumerate(blocks):
+            x, start, end = block['x'], block['start'], block['end']
+            legend_trace = showlegend and block_idx == 0
+            fig.add_trace(
+                go.Scatter(
+                    x=[x - width/2, x + width/2, x + width/2, x - width/2, x - width/2],
+                    y=[start, start, end, end, start],
+                    fill="toself",
+                    fillcolor=color,
+                    line=block['outline'],
+                    opacity=0.7,
+                    mode="lines",
+                    hoverinfo="text",
+                    hoveron="fills",
+                    text=block['hover'],
+                    name=name,
+                    showlegend=bool(legend_trace),
+                    legendgroup=name,
+                    # Fix for legend showing half-colored items
+                    marker=dict(color=color) if legend_trace else dict(),
+                ),
+                row=1, col=col
+            )
+            if block['label']:
+                fig.add_trace(
+                    go.Scatter(
+                        x=[x],
+                        y=[(start + end) / 2],
+                        mode="text",
+                        text=block['label'],
+                        textposition="middle center",
+                        textfont=label_font,
+                        marker=dict(opacity=0),
+                        hoverinfo="none",
+                        showlegend=False,
+                        legendgroup=name,
+                    ),
+                    row=1, col=col
+                )
+        return
+    
+    # Round the times (to well under a second) to keep the figure JSON short
+    blocks = [dict(block, start=round(block['start'], 4), end=round(block['end'], 4)) for block in blocks]
+    labelled = [block for block in blocks if block['label']]
+    
+    # Hover text of the blocks, or the session references of a compact export
+    if compact_hover and all(block.get('session') is not None for block in blocks):
+        hover = dict(customdata=[[str(block['session']), block['extra']] for block in blocks],
+                     hovertemplate="%{hovertext}<extra></extra>")
+    else:
+        hover = dict(customdata=[block['hover'] for block in blocks],
+                     hovertemplate="%{customdata}<extra></extra>")
+    
+    if renderer == 'webgl':
+        # Group the block outlines by style; the most common one is drawn with
+        # the fill and the others (e.g. clashes) on top of it
+        outlines = {}
+        for block in blocks:
+            outlines.setdefault((block['outline']['color'], block['outline']['width']), []).append(block)
+        styles = sorted(outlines, key=lambda style: len(outlines[style]), reverse=True)
+        
+        def polygons(style_blocks):
+            # Rectangles separated by None, so they are filled one by one
+            x, y = [], []
+            for block in style_blocks:
+                left, right = block['x'] - width/2, block['x'] + width/2
+                x += [left, right, right, left, left, None]
+                y += [block['start'], block['start'], block['end'], block['end'], block['start'], None]
+            return x, y
+        
+        x, y = polygons(blocks)
+        fig.add_trace(
+            go.Scattergl(
+                x=x,
+                y=y,
+                fill="toself",
+                fillcolor=color,
+                mode="lines",
+                line=dict(color=styles[0][0], width=styles[0][1]),
+                opacity=0.7,
+                hoverinfo="skip",
+                name=name,
+                showlegend=bool(showlegend),
+                legendgroup=name,
+            ),
+            row=1, col=col
+        )
+        for line_color, line_width in styles[1:]:
+            x, y = polygons(outlines[(line_color, line_width)])
+            fig.add_trace(
+                go.Scattergl(
+                    x=x,
+                    y=y,
+                    mode="lines",
+                    line=dict(color=line_color, width=line_width),
+                    hoverinfo="skip",
+                    showlegend=False,
+                    legendgroup=name,
+                ),
+                row=1, col=col
+            )
+        
+        # WebGL fills have no hover, so the hover text and labels sit on an
+        # invisible marker in the middle of each block
+        fig.add_trace(
+            go.Scattergl(
+                x=[block['x'] for block in blocks],
+                y=[round((block['start'] + block['end']) / 2, 4) for block in blocks],
+                mode="markers+text",
+                marker=dict(size=12, color=color, opacity=0),
+                text=[block['label'] for block in blocks],
+                textposition="middle center",
+                textfont=label_font,
+                name=name,
+                showlegend=False,
+                legendgroup=name,
+                **hover
+            ),
+            row=1, col=col
+        )
+        return
+    
+    # Bars from the start to the end time, with per-block outlines if they differ
+    outline = dict(color=[block['outline']['color'] for block in blocks],
+                   width=[block['outline']['width'] for block in blocks])
+    if len(set(outline['color'])) == 1 and len(set(outline['width'])) == 1:
+        outline = blocks[0]['outline']
+    fig.add_trace(
+        go.Bar(
+            x=[block['x'] for block in blocks],
+            y=[round(block['end'] - block['start'], 4) for block in blocks],
+            base=[block['start'] for block in blocks],
+            width=width,
+            marker=dict(color=color, line=outline),
+            opacity=0.7,
+            name=name,
+            showlegend=bool(showlegend),
+            legendgroup=name,
+            **hover
+        ),
+        row=1, col=col
+    )
+    if labelled:
+        fig.add_trace(
+            go.Scatter(
+                x=[block['x'] for block in labelled],
+                y=[round((block['start'] + block['end']) / 2, 4) for block in labelled],
+                mode="text",
+                text=[block['label'] for block in labelled],
+                textposition="middle center",
+                textfont=label_font,
+                hoverinfo="none",
+                showlegend=False,
+                legendgroup=name,
+            ),
+            row=1, col=col
+        )
+
 def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Conference Schedule", 
-                               symposium_view=False, selected_areas=None):
+                               symposium_view=False, selected_areas=None, flag_conflicts=False,
+                               renderer='batched', compact_hover=False):
     """
     Create an interactive Plotly visualization of the conference schedule.
     
     Parameters:
     -----------
-    df : pandas DataFrame
+    df : SessionCorpus or pandas DataFrame
         Conference data
     min_score : int
         Minimum relevance score to include sessions
@@ -245,21 +468,39 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
         If True, group sessions by symposium instead of showing individual sessions
     selected_areas : list
         List of specific focus areas to display (if None, show all)
+    flag_conflicts : bool
+        If True, outline sessions that overlap another displayed session in red
+        and note the clash in their hover text (standard view only)
+    renderer : str
+        'batched' draws one trace per focus area and day (default); 'webgl'
+        does the same with WebGL traces, which stay responsive with the full
+        program; 'traces' draws separate traces for every session, which is
+        slow for large schedules
+    compact_hover : bool
+        If True, leave the session details out of the hover text; they are
+        filled in from the shared session table when the figure is saved with
+        write_compact_html (batched and webgl renderers, standard view only)
         
     Returns:
     --------
     fig : plotly.graph_objects.Figure
         Interactive Plotly figure
     """
+    from plotly.subplots import make_subplots
+    
+    if renderer not in CALENDAR_RENDERERS:
+        print(f"Error: Unknown renderer '{renderer}'. Choose from: {', '.join(CALENDAR_RENDERERS)}")
+        return None
+    compact_hover = compact_hover and renderer != 'traces'
+    
     if df is None or df.empty:
         print("No data available to visualize.")
         return None
     
-    # Convert date strings to datetime if needed
-    df['Date'] = pd.to_datetime(df['Date'])
+    corpus = as_corpus(df)
     
     # Get unique dates for subplots
-    unique_dates = sorted(df['Date'].dt.date.unique())
+    unique_dates = sorted(corpus.days.unique())
     
     if not unique_dates:
         print("No valid dates found in the schedule.")
@@ -267,45 +508,22 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
     
     # Score sessions based on focus areas
     if focus_areas:
-        df['relevance_score'] = df.apply(lambda row: score_session_relevance(row, focus_areas), axis=1)
+        scores, keyword_matches = corpus.score(focus_areas)
+        area_matches = area_match_matrix(keyword_matches)
         # Filter by minimum score
         if min_score > 0:
-            df = df[df['relevance_score'] >= min_score].copy()
+            corpus = corpus.subset(scores >= min_score)
     else:
         # If no focus areas, just include all sessions
-        df['relevance_score'] = 1
+        scores = pd.Series(1, index=corpus.index)
     
-    if df.empty:
+    if corpus.empty:
         print(f"No sessions with relevance score >= {min_score} found.")
         return None
     
-    # Fix any time issues - ensure start time is before end time
-    def fix_times(row):
-        start_float = time_to_float(row['Start'])
-        end_float = time_to_float(row['End'])
-        
-        # If end time appears to be before start time (possible AM/PM confusion)
-        if end_float < start_float:
-            # This likely means end time is PM when it's a small number like 1:00 or 2:00
-            # Add 12 hours to end time to correct this
-            print(f"Fixed reversed time: {row['Start']} - {row['End']} → {row['Start']} - {float_to_time(end_float + 12)} for session: {row['Title']}")
-            end_float += 12.0
-            # Store the fixed float value to be used later
-            row['end_time_float'] = end_float
-        else:
-            row['end_time_float'] = end_float
-            
-        row['start_time_float'] = start_float
-        return row
-    
-    # Helper function to convert float time back to string for display
-    def float_to_time(float_time):
-        hours = int(float_time)
-        minutes = int((float_time - hours) * 60)
-        return f"{hours:02d}:{minutes:02d}"
-    
-    # Apply time fixing to all rows
-    df = df.apply(fix_times, axis=1)
+    # Start and end times as float hours (reversed times were fixed when loading)
+    df = corpus.df.assign(relevance_score=scores.loc[corpus.index],
+                          start_time_float=corpus.start_hours, end_time_float=corpus.end_hours)
     
     # Create a color map for focus areas
     if focus_areas:
@@ -313,23 +531,32 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
     
     # Filter by selected focus areas if specified
     if selected_areas and focus_areas:
-        # Keep track of session ids that match any of the selected areas
-        selected_sessions = set()
-        for _, row in df.iterrows():
-            session_text = ' '.join([str(val) for val in row.values if isinstance(val, str)])
-            for area in selected_areas:
-                if area in focus_areas:
-                    keywords = focus_areas[area]
-                    if any(keyword.lower() in session_text.lower() for keyword in keywords):
-                        selected_sessions.add(row.name)
-                        break
+        # Keep the sessions that match any of the selected areas
+        known_areas = [area for area in selected_areas if area in focus_areas]
+        selected_sessions = area_matches.loc[df.index, known_areas].any(axis=1)
         
-        if selected_sessions:
-            df = df.loc[list(selected_sessions)]
+        if selected_sessions.any():
+            df = df[selected_sessions]
         else:
             print(f"No sessions match the selected focus areas.")
             return None
     
+    # Session dates, aligned with the selected sessions
+    days = corpus.days.loc[df.index]
+    
+    # Count the other displayed sessions each session clashes with
+    if flag_conflicts:
+        clash_counts = conflict_counts(corpus, df.index)
+    else:
+        clash_counts = pd.Series(0, index=df.index)
+    
+    def clash_style(idx):
+        """Get the outline and hover note for a session's clashes"""
+        clashes = clash_counts[idx]
+        if not clashes:
+            return dict(color="black", width=1), ""
+        return dict(color="red", width=2), f"<br><b>⚠️ Conflicts with {clashes} other session(s)</b>"
+    
     # Create subplots - one per day
     fig = make_subplots(
         rows=1, 
@@ -350,7 +577,7 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
         
         # Process each day
         for i, date in enumerate(unique_dates):
-            day_data = df[df['Date'].dt.date == date]
+            day_data = df[days == date]
             if day_data.empty:
                 continue
             
@@ -361,6 +588,9 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
             unique_rooms = sorted(day_data['Location'].unique())
             room_dict = {room: idx for idx, room in enumerate(unique_rooms)}
             
+            # Symposium blocks of this day, by legend entry
+            blocks_by_name = {}
+            
             # For each symposium group
             for (symposium, room), group in symposium_groups:
                 try:
@@ -369,26 +599,17 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                         continue
                     
                     # Get time range for this symposium in this room
-                    start_times = [row['start_time_float'] for _, row in group.iterrows()]
-                    end_times = [row['end_time_float'] for _, row in group.iterrows()]
-                    
-                    min_start = min(start_times)
-                    max_end = max(end_times)
+                    min_start = group['start_time_float'].min()
+                    max_end = group['end_time_float'].max()
                     
                     # Get room position
                     room_pos = room_dict.get(room, 0)
                     
-                    # Find which focus areas match this symposium
+                    # Find which focus areas match any session of this symposium
                     matching_areas = []
                     if focus_areas:
-                        # Concatenate all text in this symposium
-                        symposium_text = ' '.join([str(val) for row in group.itertuples() 
-                                                 for val in row if isinstance(val, str)])
-                        
-                        # Check which areas match
-                        for area, keywords in focus_areas.items():
-                            if any(keyword.lower() in symposium_text.lower() for keyword in keywords):
-                                matching_areas.append(area)
+                        group_area_matches = area_matches.loc[group.index].any()
+                        matching_areas = [area for area in focus_areas if group_area_matches[area]]
                     
                     # If selected areas were specified, only use matching ones
                     if selected_areas:
@@ -403,10 +624,6 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                         color = focus_area_colors[matching_areas[0]]
                         name = matching_areas[0]
                     
-                    # Create a wider rectangle for the symposium block with better spacing
-                    rect_x = [room_pos - 0.45, room_pos + 0.45, room_pos + 0.45, room_pos - 0.45, room_pos - 0.45]
-                    rect_y = [min_start, min_start, max_end, max_end, min_start]
-                    
                     # Count sessions and get avg score
                     session_count = len(group)
                     avg_score = group['relevance_score'].mean()
@@ -428,29 +645,6 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                     for _, session in top_sessions.iterrows():
                         hover_text += f"<br>• <i>{session['Title']}</i> ({session['relevance_score']:.1f})"
                     
-                    # Add rectangle for this symposium
-                    legend_trace = name not in in_legend
-                    fig.add_trace(
-                        go.Scatter(
-                            x=rect_x,
-                            y=rect_y,
-                            fill="toself",
-                            fillcolor=color,
-                            line=dict(color="black", width=1),
-                            opacity=0.7,
-                            mode="lines",
-                            hoverinfo="text",
-                            hoveron="fills",
-                            text=hover_text,
-                            name=name,
-                            showlegend=bool(legend_trace),
-                            legendgroup=name,
-                            marker=dict(color=color) if legend_trace else dict(),
-                        ),
-                        row=1, col=i+1
-                    )
-                    
-                    # Add text label in middle of symposium block
                     # Truncate symposium name for better display
                     symp_display = symposium
                     if len(symp_display) > 25:
@@ -460,35 +654,58 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                         else:
                             symp_display = symp_display[:25] + '...'
                     
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[room_pos],
-                            y=[(min_start + max_end) / 2],
-                            mode="text",
-                            text=symp_display,
-                            textposition="middle center",
-                            textfont=dict(
-                                size=10,
-                                color="black",
-                                family="Arial, sans-serif"
-                            ),
-                            marker=dict(opacity=0),
-                            hoverinfo="none",
-                            showlegend=False,
-                        ),
-                        row=1, col=i+1
+                    # A wider block for the symposium, labelled in the middle
+                    blocks_by_name.setdefault(name, (color, []))[1].append(
+                        dict(x=room_pos, start=min_start, end=max_end, hover=hover_text,
+                             label=symp_display, outline=dict(color="black", width=1))
                     )
                     
-                    # Add to legend tracker
-                    if legend_trace:
-                        in_legend.add(name)
-                    
                 except Exception as e:
                     print(f"Error processing symposium {symposium}: {e}")
                     continue
+            
+            for name, (color, blocks) in blocks_by_name.items():
+                add_calendar_blocks(fig, i + 1, blocks, color, name, showlegend=name not in in_legend,
+                                    renderer=renderer, width=0.9, font_size=10)
+                in_legend.add(name)
     
     # STANDARD VIEW - Show individual sessions
     else:
+        # Profile-independent hover details of each session, shared by its
+        # blocks in different focus areas
+        hover_parts = {}
+        
+        def session_block(session, room_pos, outline, extra_hover=""):
+            """Get the calendar block of a session, or None if it has no duration"""
+            # Use the corrected time values
+            start_float = session['start_time_float']
+            end_float = session['end_time_float']
+            
+            # Check duration
+            duration = end_float - start_float
+            if duration <= 0:
+                print(f"Warning: Invalid duration for {session['Title']}: {duration}")
+                return None
+            
+            # Prepare hover text (compact figures take the details from the session table)
+            hover_text = None
+            if not compact_hover:
+                if session.name not in hover_parts:
+                    hover_parts[session.name] = session_hover_parts(session)
+                head, description = hover_parts[session.name]
+                hover_text = head + extra_hover + description
+            
+            # Only label sessions of sufficient duration (15+ min)
+            # This significantly reduces text clutter
+            label = ""
+            if duration >= 0.25:  # 15 min = 0.25 hour
+                label = session['Title']
+                if len(label) > 25:
+                    label = label[:25] + "..."
+            
+            return dict(x=room_pos, start=start_float, end=end_float, hover=hover_text,
+                        label=label, outline=outline, session=session.name, extra=extra_hover)
+        
         # Keep track of which areas have been added to the legend
         area_in_legend = set()
         
@@ -500,12 +717,13 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                 if selected_areas and area_name not in selected_areas:
                     continue
                     
-                # Get color for this area
+                # Get color for this area and the keywords each session matched
                 color = focus_area_colors[area_name]
+                area_keywords = matched_keywords(keyword_matches, area_name)
                 
                 # For each day
                 for i, date in enumerate(unique_dates):
-                    day_data = df[df['Date'].dt.date == date]
+                    day_data = df[days == date]
                     if day_data.empty:
                         continue
                     
@@ -514,232 +732,72 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                     room_dict = {room: idx*1.5 for idx, room in enumerate(unique_rooms)}  # Multiply by 1.5 for spacing
                     
                     # Filter sessions for this area
-                    area_sessions = []
-                    for _, session in day_data.iterrows():
-                        session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-                        # Check if this session matches any keywords for this area
-                        if any(keyword.lower() in session_text.lower() for keyword in keywords):
-                            area_sessions.append(session)
+                    area_sessions = day_data[area_matches.loc[day_data.index, area_name]]
                     
                     # Skip if no sessions for this area on this day
-                    if not area_sessions:
+                    if area_sessions.empty:
                         continue
                     
                     # For each session on this day
-                    for session in area_sessions:
+                    blocks = []
+                    for idx, session in area_sessions.iterrows():
                         try:
-                            # Use the corrected time values
-                            start_float = session['start_time_float']
-                            end_float = session['end_time_float']
-                            
-                            # Check duration
-                            duration = end_float - start_float
-                            if duration <= 0:
-                                print(f"Warning: Invalid duration for {session['Title']}: {duration}")
-                                continue
-                            
-                            # Get room position
-                            room = session['Location']
-                            room_pos = room_dict.get(room, 0)
-                            
-                            # Make rectangles wider for better text display - with improved spacing
-                            rect_x = [room_pos - 0.4, room_pos + 0.4, room_pos + 0.4, room_pos - 0.4, room_pos - 0.4]
-                            rect_y = [start_float, start_float, end_float, end_float, start_float]
-                            
-                            # Prepare hover text
-                            speaker = f"<br><b>Speaker:</b> {session['Speaker']}" if 'Speaker' in session and pd.notna(session['Speaker']) else ""
-                            affiliation = f"<br><b>Affiliation:</b> {session['SpeakerAffiliation']}" if 'SpeakerAffiliation' in session and pd.notna(session['SpeakerAffiliation']) else ""
-                            
-                            # Include symposium information
-                            symposium = f"<br><b>Symposium:</b> {session['Symposium']}" if 'Symposium' in session and pd.notna(session['Symposium']) else ""
-                            
-                            # Wrap description text for better readability
-                            description = ""
-                            if 'Description' in session and pd.notna(session['Description']):
-                                description = f"<br><br>{wrap_text(session['Description'], width=60)}"
-                            
+                            outline, clash_text = clash_style(idx)
                             score_text = f"<br><b>Relevance Score:</b> {session['relevance_score']}" if 'relevance_score' in session else ""
                             
                             # Format matching keywords
-                            session_text = ' '.join([str(val) for val in session.values if isinstance(val, str)])
-                            matches = [kw for kw in keywords if kw.lower() in session_text.lower()]
+                            matches = area_keywords[idx]
                             keywords_matched = f"<br><b>Matching Keywords:</b> <br><b>{area_name}:</b> {', '.join(matches)}" if matches else ""
                             
-                            hover_text = f"<b>{session['Title']}</b><br>" + \
-                                        f"<b>Time:</b> {session['Start']} - {session['End']}<br>" + \
-                                        f"<b>Room:</b> {session['Location']}" + \
-                                        symposium + \
-                                        speaker + \
-                                        affiliation + \
-                                        score_text + \
-                                        keywords_matched + \
-                                        description
-                            
-                            # Add rectangle trace for this session
-                            legend_trace = area_name not in area_in_legend
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=rect_x,
-                                    y=rect_y,
-                                    fill="toself",
-                                    fillcolor=color,
-                                    line=dict(color="black", width=1),
-                                    opacity=0.7,
-                                    mode="lines",
-                                    hoverinfo="text",
-                                    hoveron="fills",
-                                    text=hover_text,
-                                    name=area_name,
-                                    showlegend=bool(legend_trace),
-                                    # Fix for legend showing half-colored items
-                                    marker=dict(color=color) if legend_trace else dict(),
-                                ),
-                                row=1, col=i+1
-                            )
-                            
-                            # Only add text labels for sessions of sufficient duration (15+ min)
-                            # This significantly reduces text clutter
-                            if duration >= 0.25:  # 15 min = 0.25 hour
-                                # Add text label in middle of session block with improved readability
-                                title_text = session['Title']
-                                if len(title_text) > 25:
-                                    title_text = title_text[:25] + "..."
-                                
-                                fig.add_trace(
-                                    go.Scatter(
-                                        x=[room_pos],
-                                        y=[(start_float + end_float) / 2],
-                                        mode="text",
-                                        text=title_text,
-                                        textposition="middle center",
-                                        textfont=dict(
-                                            size=9, 
-                                            color="black",
-                                            family="Arial, sans-serif"
-                                        ),
-                                        # Add background to text for better contrast
-                                        marker=dict(
-                                            opacity=0
-                                        ),
-                                        hoverinfo="none",
-                                        showlegend=False,
-                                        legendgroup=area_name,
-                                    ),
-                                    row=1, col=i+1
-                                )
-                            
-                            # Then after adding the trace if it was shown in the legend, update the tracking set:
-                            if area_name not in area_in_legend:
-                                area_in_legend.add(area_name)
+                            block = session_block(session, room_dict.get(session['Location'], 0), outline,
+                                                  score_text + clash_text + keywords_matched)
+                            if block is not None:
+                                blocks.append(block)
                             
                         except Exception as e:
                             print(f"Error processing session: {e}")
                             continue
-            else:
-                # If no focus areas, just show all sessions in one color
-                color = 'rgba(70,130,180,0.7)'  # Steel blue
-                
-                # For each day
-                for i, date in enumerate(unique_dates):
-                    day_data = df[df['Date'].dt.date == date]
-                    if day_data.empty:
-                        continue
                     
-                    # Get unique rooms
-                    unique_rooms = sorted(day_data['Location'].unique())
-                    room_dict = {room: idx*1.5 for idx, room in enumerate(unique_rooms)}  # Multiply by 1.5 for spacing
+                    if blocks:
+                        add_calendar_blocks(fig, i + 1, blocks, color, area_name,
+                                            showlegend=area_name not in area_in_legend, renderer=renderer,
+                                            compact_hover=compact_hover)
+                        area_in_legend.add(area_name)
+        else:
+            # If no focus areas, just show all sessions in one color
+            color = 'rgba(70,130,180,0.7)'  # Steel blue
+            
+            # For each day
+            for i, date in enumerate(unique_dates):
+                day_data = df[days == date]
+                if day_data.empty:
+                    continue
+                
+                # Get unique rooms
+                unique_rooms = sorted(day_data['Location'].unique())
+                room_dict = {room: idx*1.5 for idx, room in enumerate(unique_rooms)}  # Multiply by 1.5 for spacing
+                
+                # Process each session
+                blocks = []
+                for idx, session in day_data.iterrows():
+                    try:
+                        outline, clash_text = clash_style(idx)
+                        block = session_block(session, room_dict.get(session['Location'], 0), outline, clash_text)
+                        if block is not None:
+                            blocks.append(block)
                     
-                    # Process each session
-                    for _, session in day_data.iterrows():
-                        try:
-                            # Use the corrected time values
-                            start_float = session['start_time_float']
-                            end_float = session['end_time_float']
-                            
-                            # Check duration
-                            duration = end_float - start_float
-                            if duration <= 0:
-                                print(f"Warning: Invalid duration for {session['Title']}: {duration}")
-                                continue
-                            
-                            # Get room position
-                            room = session['Location']
-                            room_pos = room_dict.get(room, 0)
-                            
-                            # Create a rectangle (calendar block) for this session - with improved spacing
-                            rect_x = [room_pos - 0.4, room_pos + 0.4, room_pos + 0.4, room_pos - 0.4, room_pos - 0.4]
-                            rect_y = [start_float, start_float, end_float, end_float, start_float]
-                            
-                            # Prepare hover text
-                            speaker = f"<br><b>Speaker:</b> {session['Speaker']}" if 'Speaker' in session and pd.notna(session['Speaker']) else ""
-                            affiliation = f"<br><b>Affiliation:</b> {session['SpeakerAffiliation']}" if 'SpeakerAffiliation' in session and pd.notna(session['SpeakerAffiliation']) else ""
-                            
-                            # Include symposium info
-                            symposium = f"<br><b>Symposium:</b> {session['Symposium']}" if 'Symposium' in session and pd.notna(session['Symposium']) else ""
-                            
-                            # Wrap description text for better readability
-                            description = ""
-                            if 'Description' in session and pd.notna(session['Description']):
-                                description = f"<br><br>{wrap_text(session['Description'], width=60)}"
-                            
-                            hover_text = f"<b>{session['Title']}</b><br>" + \
-                                        f"<b>Time:</b> {session['Start']} - {session['End']}<br>" + \
-                                        f"<b>Room:</b> {session['Location']}" + \
-                                        symposium + \
-                                        speaker + \
-                                        affiliation + \
-                                        description
-                            
-                            # Add rectangle trace for this session
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=rect_x,
-                                    y=rect_y,
-                                    fill="toself",
-                                    fillcolor=color,
-                                    line=dict(color="black", width=1),
-                                    opacity=0.7,
-                                    mode="lines",
-                                    hoverinfo="text",
-                                    hoveron="fills",
-                                    text=hover_text,
-                                    name='Sessions',
-                                    showlegend=bool(i==0 and _==day_data.index[0]),  # Convert to Python bool
-                                ),
-                                row=1, col=i+1
-                            )
-                            
-                            # Only add text for sessions with sufficient duration
-                            if duration >= 0.25:  # 15 min = 0.25 hour
-                                # Add text label in middle of rectangle
-                                title_text = session['Title']
-                                if len(title_text) > 25:
-                                    title_text = title_text[:25] + "..."
-                                
-                                fig.add_trace(
-                                    go.Scatter(
-                                        x=[room_pos],
-                                        y=[(start_float + end_float) / 2],
-                                        mode="text",
-                                        text=title_text,
-                                        textposition="middle center",
-                                        textfont=dict(
-                                            size=9, 
-                                            color="black",
-                                            family="Arial, sans-serif"
-                                        ),
-                                        marker=dict(
-                                            opacity=0
-                                        ),
-                                        hoverinfo="none",
-                                        showlegend=False,
-                                    ),
-                                    row=1, col=i+1
-                                )
-                        
-                        except Exception as e:
-                            print(f"Error processing session: {e}")
-                            continue
+                    except Exception as e:
+                        print(f"Error processing session: {e}")
+                        continue
+                
+                if blocks:
+                    add_calendar_blocks(fig, i + 1, blocks, color, 'Sessions',
+                                        showlegend='Sessions' not in area_in_legend, renderer=renderer,
+                                        compact_hover=compact_hover)
+                    area_in_legend.add('Sessions')
+    
+    # Overlapping blocks are drawn on top of each other, not side by side
+    fig.update_layout(barmode='overlay')
     
     # Final layout adjustments
     fig.update_layout(
@@ -773,8 +831,9 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
     )
     
     # Annotate room numbers with larger, more visible text
+    room_labels = []
     for day_idx, date in enumerate(unique_dates):
-        day_data = df[df['Date'].dt.date == date]
+        day_data = df[days == date]
         if day_data.empty:
             continue
             
@@ -783,7 +842,7 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
         
         # Add room labels at top of columns
         for i, room in enumerate(unique_rooms):
-            fig.add_annotation(
+            room_labels.append(dict(
                 x=i,
                 y=time_min - 0.25,  # Position just above the top of the chart
                 text=f"Room {room}",
@@ -796,7 +855,11 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
                 borderwidth=1,
                 borderpad=4,
                 opacity=0.9
-            )
+            ))
+    
+    # Add the labels in one layout update (each add_annotation call copies
+    # every annotation added so far)
+    fig.update_layout(annotations=list(fig.layout.annotations) + room_labels)
     
     # Configure layout
     fig.update_layout(
@@ -835,7 +898,7 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
     # Configure axes
     for i in range(1, len(unique_dates) + 1):
         # X-axis (rooms)
-        day_data = df[df['Date'].dt.date == unique_dates[i-1]]
+        day_data = df[days == unique_dates[i-1]]
         if day_data.empty:
             continue
             
@@ -902,10 +965,162 @@ def create_interactive_calendar(df, min_score=0, focus_areas=None, title="Confer
     
     return fig
 
-def export_fig_as_png(fig, output_file, width=2400, height=1600):
+# Fills in the hover text of compact figures from the shared session table and
+# the figure's own (profile-specific) hover lines
+_COMPACT_HOVER_SCRIPT = """
+var gd = document.getElementById('{plot_id}');
+var extras = %(extras)s;
+var table = document.createElement('script');
+table.src = '%(table)s';
+table.onload = function() {
+    var sessions = window.TMS_SESSIONS || {};
+    gd.data.forEach(function(trace, i) {
+        if (!trace.customdata || !Array.isArray(trace.customdata[0])) return;
+        var hovertext = trace.customdata.map(function(ref) {
+            var details = sessions[ref[0]] || ['', ''];
+            return details[0] + extras[ref[1]] + details[1];
+        });
+        Plotly.restyle(gd, {hovertext: [hovertext]}, [i]);
+    });
+};
+document.head.appendChild(table);
+"""
+
+def write_html_file(html, output_file, gzip_output=False):
+    """
+    Write an HTML page, optionally gzip-compressed.
+    
+    Parameters:
+    -----------
+    html : str
+        The HTML page
+    output_file : str
+        Path to save the HTML file
+    gzip_output : bool
+        If True, write output_file + '.gz' instead (default: False)
+    
+    Returns:
+    --------
+    str
+        Path of the written file
+    """
+    if gzip_output:
+        output_file = output_file + '.gz'
+        with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+            f.write(html)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return output_file
+
+def write_session_table(df, directory):
+    """
+    Write the shared hover details of every session for compact HTML exports.
+    
+    The table is a JavaScript file defining ``window.TMS_SESSIONS``, a JSON
+    object mapping each session ID (the row label) to its hover details (see
+    session_hover_parts). Its name holds a signature of the session IDs and
+    details, so many compact calendars in one directory share one copy, and
+    pages written before the data changed keep the table of their own data.
+    
+    Parameters:
+    -----------
+    df : SessionCorpus or pandas DataFrame
+        Conference data
+    directory : str
+        Directory of the compact HTML files
+    
+    Returns:
+    --------
+    str
+        Path of the session table
+    """
+    corpus = as_corpus(df)
+    columns = [col for col in SESSION_DETAIL_COLUMNS if col in corpus.df.columns]
+    # hash_pandas_object hashes the row labels too, which the pages refer to
+    signature = f"{int(pd.util.hash_pandas_object(corpus.df[columns]).sum()):016x}"
+    header = f"// TMS session details, data signature {signature}\n"
+    
+    table_file = os.path.join(directory, SESSION_TABLE_FILE.format(signature=signature))
+    if os.path.exists(table_file):
+        with open(table_file, 'r', encoding='utf-8') as f:
+            if f.readline() == header:
+                return table_file
+    
+    table = {str(idx): session_hover_parts(session) for idx, session in corpus.df[columns].iterrows()}
+    
+    # Write to a temporary file first, so parallel exports never read a partial table
+    temp_file = f"{table_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(f"window.TMS_SESSIONS = {json.dumps(table, ensure_ascii=False)};\n")
+    os.replace(temp_file, table_file)
+    print(f"Session table saved to {table_file}")
+    return table_file
+
+def write_compact_html(fig, output_file, df, gzip_output=False):
+    """
+    Save a figure as a compact HTML page that shares its assets with others.
+    
+    The page references the plotly.js bundle (plotly-<version>.min.js, so
+    pages written after a plotly upgrade get the matching bundle) and the
+    session table (SESSION_TABLE_FILE) in its own directory instead of
+    embedding them, and both are written only once per directory. Create
+    the figure with compact_hover=True, so its hover text only holds session
+    IDs and profile-specific lines.
+    
+    Parameters:
+    -----------
+    fig : plotly.graph_objects.Figure
+        The figure to save
+    output_file : str
+        Path to save the HTML file
+    df : SessionCorpus or pandas DataFrame
+        Conference data the figure was created from
+    gzip_output : bool
+        If True, write a gzip-compressed output_file + '.gz' (default: False)
+    
+    Returns:
+    --------
+    str
+        Path of the written file
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    
+    directory = os.path.dirname(os.path.abspath(output_file))
+    table_file = write_session_table(df, directory)
+    
+    bundle_name = f"plotly-{get_plotlyjs_version()}.min.js"
+    bundle_file = os.path.join(directory, bundle_name)
+    if not os.path.exists(bundle_file):
+        temp_file = f"{bundle_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        os.replace(temp_file, bundle_file)
+    
+    # Move the profile-specific hover lines into the script, once each: in the
+    # figure JSON every HTML tag would be escaped to several times its size
+    fig = go.Figure(fig)
+    extras = {}
+    for trace in fig.data:
+        if trace.customdata is not None and len(trace.customdata) and isinstance(trace.customdata[0], (list, tuple)):
+            trace.customdata = [[session_id, extras.setdefault(extra, len(extras))]
+                                for session_id, extra in trace.customdata]
+    script = _COMPACT_HOVER_SCRIPT % dict(table=os.path.basename(table_file),
+                                          extras=json.dumps(list(extras), ensure_ascii=False).replace('</', '<\\/'))
+    
+    html = pio.to_html(fig, include_plotlyjs=bundle_name, post_script=script)
+    return write_html_file(html, output_file, gzip_output)
+
+def export_fig_as_png(fig, output_file, width=2400, height=1600, exporter=None):
     """
     Export a Plotly figure as a PNG file using kaleido.
     
+    Exporting many figures is much faster through one ImageExporter (see
+    image_export.py), which keeps the kaleido renderer running between them.
+    
     Parameters:
     -----------
     fig : plotly.graph_objects.Figure
@@ -916,6 +1131,8 @@ def export_fig_as_png(fig, output_file, width=2400, height=1600):
         Width of the output image in pixels
     height : int
         Height of the output image in pixels
+    exporter : image_export.ImageExporter, optional
+        Exporter to write the image with (default: None, start a renderer for this image)
     
     Returns:
     --------
@@ -935,7 +1152,12 @@ def export_fig_as_png(fig, output_file, width=2400, height=1600):
         print(f"Exporting visualization to PNG: {output_file}")
         
         # Export to PNG with higher resolution
-        fig.write_image(output_file, width=width, height=height, scale=2)
+        if exporter is not None:
+            if not exporter.write(fig, output_file, width=width, height=height, scale=2):
+                return False
+        else:
+            with stage('write_png', traces=len(fig.data)):
+                fig.write_image(output_file, width=width, height=height, scale=2)
         print(f"Successfully exported to {output_file}")
         return True
     except ImportError:
@@ -948,13 +1170,16 @@ def export_fig_as_png(fig, output_file, width=2400, height=1600):
 
 def save_interactive_calendar(df=None, data_file=None, profile=None, interests_file=None, 
                             min_score=3, output_file=None, title=None, gen_csv=False, gen_symposium=False,
-                            symposium_view=False, selected_areas=None, export_png=False):
+                            symposium_view=False, selected_areas=None, export_png=False,
+                            use_cache=True, rebuild_cache=False, flag_conflicts=False,
+                            profile_data=None, profile_name=None, report_dir=None, renderer='batched',
+                            compact=False, gzip_output=False, png_exporter=None, png_width=2400, png_height=1600):
     """
     Generate and save an interactive calendar visualization of the conference schedule.
     
     Parameters:
     -----------
-    df : pandas DataFrame, optional
+    df : SessionCorpus or pandas DataFrame, optional
         Pre-loaded conference data (default: None, will load from data_file)
     data_file : str, optional
         Path to the Excel data file (default: None, will auto-detect)
@@ -978,6 +1203,30 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
         List of specific focus areas to display (default: None, show all)
     export_png : bool
         Whether to export the figure as a PNG file in addition to HTML (default: False)
+    use_cache : bool, optional
+        Whether to use the binary data cache when loading data_file (default: True)
+    rebuild_cache : bool, optional
+        Rebuild the binary data cache from the Excel file (default: False)
+    flag_conflicts : bool, optional
+        Highlight sessions that overlap another displayed session (default: False)
+    profile_data : dict, optional
+        Already loaded {"interests": ..., "weights": ...} profile to use instead
+        of profile/interests_file (default: None)
+    profile_name : str, optional
+        Name of profile_data, used for titles and report file names (default: None)
+    report_dir : str, optional
+        Directory for the CSV export and symposium report (default: None, current directory)
+    renderer : str, optional
+        How session blocks are drawn, one of CALENDAR_RENDERERS (default: 'batched')
+    compact : bool, optional
+        Write a compact HTML file that shares the plotly.js bundle and the
+        session details with the other compact files in its directory (default: False)
+    gzip_output : bool, optional
+        Write a gzip-compressed HTML file (output_file + '.gz') (default: False)
+    png_exporter : image_export.ImageExporter, optional
+        Exporter for the PNG file when rendering many calendars (default: None)
+    png_width, png_height : int, optional
+        Size of the PNG file in layout pixels, exported at scale 2 (default: 2400x1600)
     
     Returns:
     --------
@@ -998,7 +1247,7 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
             
             print(f"Loading data from: {data_file}")
             from analyze_tms import load_conference_data
-            df = load_conference_data(data_file)
+            df = load_conference_data(data_file, use_cache=use_cache, rebuild_cache=rebuild_cache)
             
             if df is None:
                 print("Error: Failed to load conference data.")
@@ -1007,9 +1256,22 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
         # Get user interests
         user_interests = None
         user_weights = None
-        profile_name = None
         
-        if profile and profile in RESEARCH_PROFILES:
+        if profile_data is not None:
+            profile_name = profile_name or "custom"
+            user_interests = profile_data["interests"]
+            user_weights = profile_data.get("weights")
+            
+            # Set default title if not specified
+            if title is None:
+                title = f"TMS 2025 - {profile_name.title()} Focus Areas"
+                
+            # Set default output file if not specified
+            if output_file is None:
+                view_suffix = "_symposiums" if symposium_view else ""
+                output_file = f"{profile_name}_calendar{view_suffix}.html"
+                
+        elif profile and profile in RESEARCH_PROFILES:
             profile_name = profile
             print(f"Using predefined '{profile}' profile")
             user_interests = RESEARCH_PROFILES[profile]["interests"]
@@ -1057,18 +1319,24 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
         # Generate CSV if requested
         if gen_csv:
             csv_file = f"{profile_name}_sessions.csv" if profile_name else "sessions_export.csv"
+            if report_dir:
+                csv_file = os.path.join(report_dir, csv_file)
             print(f"Generating CSV export to: {csv_file}")
-            export_sessions_to_csv(df, user_interests, min_score, csv_file)
+            with stage('csv_export'):
+                export_sessions_to_csv(df, user_interests, min_score, csv_file)
         
         # Generate symposium report if requested
         if gen_symposium:
             symposium_file = f"{profile_name}_symposiums.txt" if profile_name else "symposium_report.txt"
+            if report_dir:
+                symposium_file = os.path.join(report_dir, symposium_file)
             print(f"Generating symposium report to: {symposium_file}")
             
-            symposium_data = generate_symposium_report(df, user_interests, min_score)
+            with stage('symposium_report'):
+                symposium_data = generate_symposium_report(df, user_interests, min_score, top=10)
             
             if symposium_data:
-                with open(symposium_file, 'w') as f:
+                with open(symposium_file, 'w') as f, stage('write_report', symposia=len(symposium_data)):
                     f.write(f"TMS 2025 SYMPOSIUM RECOMMENDATIONS\n")
                     f.write(f"Based on {profile_name if profile_name else 'custom'} interests\n")
                     f.write(f"Minimum score: {min_score}\n\n")
@@ -1077,9 +1345,6 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
                     f.write("--------------------------\n\n")
                     
                     for i, (symposium, data) in enumerate(symposium_data.items(), 1):
-                        if i > 10:  # Top 10 symposiums
-                            break
-                            
                         f.write(f"{i}. {symposium}\n")
                         f.write(f"   Average relevance score: {data['avg_score']:.2f}\n")
                         f.write(f"   Number of relevant sessions: {data['total_sessions']}\n")
@@ -1102,28 +1367,42 @@ def save_interactive_calendar(df=None, data_file=None, profile=None, interests_f
         print(f"Generating interactive visualization with minimum score: {min_score}" + 
               (", symposium view" if symposium_view else ""))
         
-        fig = create_interactive_calendar(
-            df, 
-            min_score=min_score, 
-            focus_areas=user_interests, 
-            title=title,
-            symposium_view=symposium_view,
-            selected_areas=selected_areas
-        )
+        with stage('figure_build') as timing:
+            fig = create_interactive_calendar(
+                df, 
+                min_score=min_score, 
+                focus_areas=user_interests, 
+                title=title,
+                symposium_view=symposium_view,
+                selected_areas=selected_areas,
+                flag_conflicts=flag_conflicts,
+                renderer=renderer,
+                compact_hover=compact
+            )
+            if fig is not None:
+                timing.add(traces=len(fig.data))
         
         if fig is None:
             print("Error: Failed to generate the visualization.")
             return False
         
         # Save the figure to HTML
+        import plotly.io as pio
         print(f"Saving interactive visualization to: {output_file}")
-        pio.write_html(fig, output_file, auto_open=False)
-        print(f"Successfully saved to {output_file}")
+        with stage('write_html', traces=len(fig.data)):
+            if compact:
+                saved_file = write_compact_html(fig, output_file, df, gzip_output)
+            elif gzip_output:
+                saved_file = write_html_file(pio.to_html(fig), output_file, gzip_output)
+            else:
+                pio.write_html(fig, output_file, auto_open=False)
+                saved_file = output_file
+        print(f"Successfully saved to {saved_file}")
         
         # Export to PNG if requested
         if export_png:
             png_file = output_file.replace('.html', '.png')
-            export_fig_as_png(fig, png_file)
+            export_fig_as_png(fig, png_file, width=png_width, height=png_height, exporter=png_exporter)
         
         return True
     
@@ -1163,10 +1442,27 @@ def main():
                       help="Group sessions by symposium in the visualization")
     parser.add_argument("--areas", nargs="+", 
                       help="Specific focus areas to display (space-separated)")
+    parser.add_argument("--conflicts", action="store_true",
+                      help="Highlight sessions that overlap another displayed session")
+    parser.add_argument("--renderer", choices=CALENDAR_RENDERERS, default="batched",
+                      help="Draw one trace per focus area and day (batched, default), "
+                           "the same with WebGL for very large schedules (webgl), "
+                           "or separate traces for every session (traces)")
+    parser.add_argument("--compact", action="store_true",
+                      help="Share plotly.js and the session details with other compact files "
+                           "in the output directory instead of embedding them")
+    parser.add_argument("--gzip", action="store_true",
+                      help="Write a gzip-compressed HTML file (.html.gz)")
     parser.add_argument("--export-png", action="store_true",
                       help="Export as PNG in addition to HTML (requires kaleido package)")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Read the Excel file directly, without the binary data cache")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                      help="Rebuild the binary data cache from the Excel file")
+    add_timings_argument(parser)
     
     args = parser.parse_args()
+    start_timings(args)
     
     # Generate and save the visualization
     success = save_interactive_calendar(
@@ -1180,11 +1476,18 @@ def main():
         gen_symposium=args.symposium,
         symposium_view=args.symposium_view,
         selected_areas=args.areas,
-        export_png=args.export_png
+        export_png=args.export_png,
+        use_cache=not args.no_cache,
+        rebuild_cache=args.rebuild_cache,
+        flag_conflicts=args.conflicts,
+        renderer=args.renderer,
+        compact=args.compact,
+        gzip_output=args.gzip
     )
+    finish_timings(args)
     
     # Open the visualization if requested
-    if success and args.open:
+    if success and args.open and not args.gzip:
         import webbrowser
         output_file = args.output
         if output_file is None:
@@ -4,42 +4,138 @@ save_calendar.py - Generate and save calendar visualizations as PNG files
 
 This script loads conference data and generates high-quality calendar visualizations
 for specific research profiles or custom interests.
+
+With several profiles or interests files (or --batch) it runs headless: the
+conference data is loaded once, matplotlib uses the Agg backend, and every
+calendar is drawn into the same figure, which is cleared between profiles,
+so memory stays flat however many calendars are rendered.
 """
 
 import os
 import sys
+import json
+import time
 import argparse
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.analyze_tms import (
-    load_conference_data, 
-    visualize_schedule_calendar, 
-    find_data_file
+from analyze_tms import (
+    load_conference_data,
+    visualize_schedule_calendar,
+    find_data_file,
+    load_pyplot,
+    MATPLOTLIB_RENDERERS
 )
+from instrumentation import add_timings_argument, start_timings, finish_timings, stage
+
+# Import predefined research profiles from tms_planner.py (it only needs the
+# standard library at import time)
+from tms_planner import RESEARCH_PROFILES
+
+def load_focus_areas(profile=None, interests_file=None):
+    """
+    Get the focus areas of a predefined profile or of a custom interests file.
+
+    Parameters:
+    -----------
+    profile : str, optional
+        Name of a predefined research profile (default: None)
+    interests_file : str, optional
+        Path to a JSON file with custom interests, in the "interests" or the
+        legacy "user_interests" format (default: None)
+
+    Returns:
+    --------
+    tuple
+        (focus_areas, label): the dictionary mapping focus areas to keywords
+        and a name for file names and titles, or (None, None) on error
+    """
+    # If a profile is specified, use the predefined focus areas
+    if profile:
+        if profile not in RESEARCH_PROFILES:
+            print(f"Error: Unknown profile '{profile}'.")
+            print(f"Available profiles: {', '.join(RESEARCH_PROFILES.keys())}")
+            return None, None
+        return RESEARCH_PROFILES[profile]["interests"], profile
+
+    # If an interests file is specified, load the custom focus areas
+    if interests_file:
+        try:
+            with open(interests_file, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading interests file: {e}")
+            return None, None
+
+        if "interests" in data:
+            # New format
+            focus_areas = data["interests"]
+        elif "user_interests" in data:
+            # Legacy format
+            focus_areas = data["user_interests"]
+        else:
+            print(f"Error: Interests file {interests_file} doesn't contain 'interests' or 'user_interests' key.")
+            return None, None
+        return focus_areas, os.path.splitext(os.path.basename(interests_file))[0]
+
+    print("Error: Either a profile or an interests file must be specified.")
+    return None, None
 
-# Import predefined research profiles from tms_planner.py
-try:
-    from src.tms_planner import RESEARCH_PROFILES
-except ImportError:
-    # If importing fails, define a minimal set
-    RESEARCH_PROFILES = {
-        "battery": {
-            "Battery Materials": ["battery", "lithium", "cathode", "anode", "electrolyte", "energy storage", "solid-state"],
-            "Characterization": ["XRD", "XPS", "TEM", "SEM", "spectroscopy", "in-situ", "operando"],
-            "Manufacturing": ["coating", "roll-to-roll", "scale-up", "production", "synthesis"]
-        }
-    }
+def default_title(label, min_score):
+    """Title of the calendar of a profile"""
+    return f"TMS Conference Schedule - {label.title()} Focus (min score: {min_score})"
+
+def render_calendar_png(df, focus_areas, output_file, min_score=5, dpi=300, title="Conference Schedule",
+                        renderer='collection', fig=None):
+    """
+    Draw one calendar and save it as a PNG file.
+
+    Parameters:
+    -----------
+    df : SessionCorpus or pandas DataFrame
+        The conference data
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+    output_file : str
+        Path to save the PNG file
+    min_score : int, optional
+        Minimum relevance score (default: 5)
+    dpi : int, optional
+        Resolution of the output image (default: 300)
+    title : str, optional
+        Title of the visualization (default: "Conference Schedule")
+    renderer : str, optional
+        How to draw the sessions (default: 'collection', see visualize_schedule_calendar)
+    fig : matplotlib Figure, optional
+        Figure to draw into, cleared first (default: None, a new pyplot figure
+        that the caller has to close)
+
+    Returns:
+    --------
+    matplotlib Figure or None
+        The saved figure, or None if there was nothing to draw or saving failed
+    """
+    with stage('figure_build') as timing:
+        fig = visualize_schedule_calendar(df, min_score=min_score, focus_areas=focus_areas, title=title,
+                                          renderer=renderer, fig=fig)
+        if fig is not None:
+            timing.add(labels=sum(len(ax.texts) for ax in fig.axes))
+
+    if fig is None:
+        print("Error: Failed to generate the visualization.")
+        return None
+
+    try:
+        with stage('write_png'):
+            fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    except OSError as e:
+        print(f"Error: Could not save {output_file}: {e}")
+        return None
+    return fig
 
 def save_calendar_visualization(data_file=None, profile=None, interests_file=None,
-                              min_score=5, output_file=None, dpi=300, 
-                              title=None, nvidia_focus=False):
+                              min_score=5, output_file=None, dpi=300,
+                              title=None, nvidia_focus=False, renderer='collection', show=True):
     """Generate and save a calendar visualization as a PNG file.
-    
+
     Parameters:
     -----------
     data_file : str, optional
@@ -58,6 +154,10 @@ def save_calendar_visualization(data_file=None, profile=None, interests_file=Non
         Custom title for the visualization (default: derived from profile/interests)
     nvidia_focus : bool, optional
         Highlight NVIDIA product relevance (default: False)
+    renderer : str, optional
+        How to draw the sessions (default: 'collection', see visualize_schedule_calendar)
+    show : bool, optional
+        Also display the figure with an interactive matplotlib backend (default: True)
     """
     # Auto-detect the data file if not specified
     if data_file is None:
@@ -65,114 +165,203 @@ def save_calendar_visualization(data_file=None, profile=None, interests_file=Non
         if data_file is None:
             print("Error: Could not find the conference data file.")
             sys.exit(1)
-    
+
+    # Determine the focus areas
+    focus_areas, label = load_focus_areas(profile, interests_file)
+    if focus_areas is None:
+        sys.exit(1)
+
     # Load the conference data
     print(f"Loading data from: {data_file}")
     df = load_conference_data(data_file)
     if df is None:
         print("Error: Failed to load the conference data.")
         sys.exit(1)
-    
-    # Determine the focus areas
-    focus_areas = None
-    
-    # If a profile is specified, use the predefined focus areas
-    if profile:
-        if profile in RESEARCH_PROFILES:
-            focus_areas = RESEARCH_PROFILES[profile]
-            label = profile
-        else:
-            print(f"Error: Unknown profile '{profile}'.")
-            print(f"Available profiles: {', '.join(RESEARCH_PROFILES.keys())}")
-            sys.exit(1)
-    
-    # If an interests file is specified, load the custom focus areas
-    elif interests_file:
-        try:
-            import json
-            with open(interests_file, 'r') as f:
-                data = json.load(f)
-            
-            if "interests" in data:
-                # New format
-                focus_areas = data["interests"]
-            elif "user_interests" in data:
-                # Legacy format
-                focus_areas = data["user_interests"]
-            else:
-                print("Error: Interests file doesn't contain 'interests' or 'user_interests' key.")
-                sys.exit(1)
-            
-            label = os.path.splitext(os.path.basename(interests_file))[0]
-        except Exception as e:
-            print(f"Error loading interests file: {e}")
-            sys.exit(1)
-    else:
-        print("Error: Either a profile or an interests file must be specified.")
-        sys.exit(1)
-    
+
     # Determine the output file if not specified
     if output_file is None:
         output_file = f"calendar_{label}_score{min_score}.png"
-    
+
     # Determine the title if not specified
     if title is None:
-        title = f"TMS Conference Schedule - {label.title()} Focus (min score: {min_score})"
-    
-    # Generate the visualization
+        title = default_title(label, min_score)
+
+    # Generate the visualization and save the figure
     print(f"Generating visualization with minimum score: {min_score}")
-    fig = visualize_schedule_calendar(df, min_score=min_score, focus_areas=focus_areas, title=title)
-    
+    fig = render_calendar_png(df, focus_areas, output_file, min_score=min_score, dpi=dpi, title=title,
+                              renderer=renderer)
     if fig is None:
-        print("Error: Failed to generate the visualization.")
         sys.exit(1)
-    
-    # Save the figure
-    print(f"Saving visualization to: {output_file}")
-    fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
     print(f"Successfully saved to {output_file}")
-    
-    # Also display it if running interactively
-    plt.show()
+    df.save_keyword_cache()
+
+    # Also display it if running interactively, then free the figure
+    plt = load_pyplot()
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def save_calendar_batch(df, profiles, min_score=5, output_dir=".", dpi=300, renderer='collection'):
+    """
+    Render the calendars of many profiles from one loaded corpus, headless.
+
+    Switches matplotlib to the Agg backend and draws every calendar into one
+    figure that is not registered with pyplot, clearing it between profiles,
+    so no figure is left open and memory stays flat over long runs.
+
+    Parameters:
+    -----------
+    df : SessionCorpus or pandas DataFrame
+        The conference data, loaded once
+    profiles : dict
+        Dictionary mapping labels (used in the file names and titles) to focus
+        areas, i.e. dictionaries mapping focus areas to lists of keywords
+    min_score : int, optional
+        Minimum relevance score (default: 5)
+    output_dir : str, optional
+        Directory for the PNG files, named calendar_{label}_score{min_score}.png (default: ".")
+    dpi : int, optional
+        Resolution of the output images (default: 300)
+    renderer : str, optional
+        How to draw the sessions (default: 'collection', see visualize_schedule_calendar)
+
+    Returns:
+    --------
+    dict
+        Dictionary mapping the labels of the saved calendars to their files
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    os.makedirs(output_dir, exist_ok=True)
+    fig = Figure()
+    FigureCanvasAgg(fig)
+
+    saved = {}
+    start = time.perf_counter()
+    for label, focus_areas in profiles.items():
+        output_file = os.path.join(output_dir, f"calendar_{label}_score{min_score}.png")
+        with stage('render_profile'):
+            rendered = render_calendar_png(df, focus_areas, output_file, min_score=min_score, dpi=dpi,
+                                           title=default_title(label, min_score), renderer=renderer, fig=fig)
+        if rendered is not None:
+            saved[label] = output_file
+            print(f"Saved {output_file}")
+        else:
+            print(f"Skipped profile '{label}'")
+    fig.clear()
+
+    elapsed = time.perf_counter() - start
+    per_calendar = elapsed / len(profiles) if profiles else 0.0
+    print(f"\nSaved {len(saved)} of {len(profiles)} calendars to {output_dir} in {elapsed:.1f} s "
+          f"({per_calendar:.2f} s per profile)")
+    return saved
 
 def main():
     """Main function to parse command line arguments and generate the visualization."""
     parser = argparse.ArgumentParser(
         description="Generate and save calendar visualizations as PNG files"
     )
-    
+
     # Input options
     parser.add_argument("--file", "-f", help="Path to the conference data Excel file")
-    
+
     # Content selection options
-    profile_group = parser.add_mutually_exclusive_group(required=True)
-    profile_group.add_argument("--profile", "-p", help="Use a predefined research profile")
-    profile_group.add_argument("--interests", "-i", help="Path to a JSON file with custom interests")
-    
+    parser.add_argument("--profile", "-p", nargs="+", metavar="PROFILE",
+                      help="Use predefined research profiles ('all' for every profile; several run in batch mode)")
+    parser.add_argument("--interests", "-i", nargs="+", metavar="FILE",
+                      help="Paths to JSON files with custom interests (several run in batch mode)")
+
     # Visualization options
-    parser.add_argument("--min-score", "-m", type=int, default=5, 
+    parser.add_argument("--min-score", "-m", type=int, default=5,
                       help="Minimum relevance score (default: 5)")
     parser.add_argument("--output", "-o", help="Path to save the PNG file")
-    parser.add_argument("--dpi", type=int, default=300, 
+    parser.add_argument("--dpi", type=int, default=300,
                       help="Resolution of the output image (default: 300)")
     parser.add_argument("--title", "-t", help="Custom title for the visualization")
-    parser.add_argument("--nvidia", action="store_true", 
+    parser.add_argument("--nvidia", action="store_true",
                       help="Highlight NVIDIA product relevance")
-    
+    parser.add_argument("--renderer", choices=MATPLOTLIB_RENDERERS, default="collection",
+                      help="Draw each day's sessions as one collection, labeling the blocks large enough "
+                           "(collection, default), or every session as a separate patch (patches)")
+    parser.add_argument("--no-show", action="store_true",
+                      help="Only save the PNG file, without displaying the figure")
+
+    # Batch options
+    parser.add_argument("--batch", action="store_true",
+                      help="Render headless with the Agg backend, even for a single profile")
+    parser.add_argument("--output-dir", default=".",
+                      help="Directory for the PNG files in batch mode (default: current directory)")
+    add_timings_argument(parser)
+
     # Parse the arguments
     args = parser.parse_args()
-    
-    # Generate and save the visualization
-    save_calendar_visualization(
-        data_file=args.file,
-        profile=args.profile,
-        interests_file=args.interests,
-        min_score=args.min_score,
-        output_file=args.output,
-        dpi=args.dpi,
-        title=args.title,
-        nvidia_focus=args.nvidia
-    )
+
+    profile_names = list(args.profile or [])
+    if "all" in profile_names:
+        profile_names = list(RESEARCH_PROFILES.keys())
+    interests_files = list(args.interests or [])
+    if not profile_names and not interests_files:
+        parser.error("one of the arguments --profile/-p --interests/-i is required")
+
+    batch_mode = args.batch or len(profile_names) + len(interests_files) > 1
+    if not batch_mode:
+        start_timings(args)
+
+        # Generate and save the visualization
+        save_calendar_visualization(
+            data_file=args.file,
+            profile=profile_names[0] if profile_names else None,
+            interests_file=interests_files[0] if interests_files else None,
+            min_score=args.min_score,
+            output_file=args.output,
+            dpi=args.dpi,
+            title=args.title,
+            nvidia_focus=args.nvidia,
+            renderer=args.renderer,
+            show=not args.no_show
+        )
+        finish_timings(args)
+        return
+
+    if args.output or args.title:
+        parser.error("--output and --title take one calendar; use --output-dir in batch mode")
+
+    # Collect the focus areas of every profile before loading the data. The
+    # label names the PNG file, so two profiles with the same label would
+    # overwrite each other's calendar
+    requested = [(name, {'profile': name}) for name in dict.fromkeys(profile_names)]
+    requested += [(file_path, {'interests_file': file_path}) for file_path in dict.fromkeys(interests_files)]
+    profiles = {}
+    sources = {}
+    for source, kwargs in requested:
+        focus_areas, label = load_focus_areas(**kwargs)
+        if focus_areas is None:
+            sys.exit(1)
+        if label in profiles:
+            print(f"Error: '{source}' and '{sources[label]}' would both be saved as "
+                  f"calendar_{label}_score{args.min_score}.png; rename one of the interests files.")
+            sys.exit(1)
+        profiles[label] = focus_areas
+        sources[label] = source
+
+    start_timings(args)
+    data_file = args.file or find_data_file("TMS2025AI_Excel_02-21-2025.xlsx")
+    if data_file is None:
+        print("Error: Could not find the conference data file.")
+        sys.exit(1)
+    print(f"Loading data from: {data_file}")
+    df = load_conference_data(data_file)
+    if df is None:
+        print("Error: Failed to load the conference data.")
+        sys.exit(1)
+
+    save_calendar_batch(df, profiles, min_score=args.min_score, output_dir=args.output_dir,
+                        dpi=args.dpi, renderer=args.renderer)
+    df.save_keyword_cache()
+    finish_timings(args)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,151 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Optimal itinerary solver for the TMS Conference Planner.
+
+Picks the set of non-overlapping sessions with the highest total relevance
+(weighted interval scheduling). Sessions are processed in order of end time
+and each one is combined with the best schedule that finishes before it
+starts, found by binary search over the running best totals, so the whole
+program is solved in O(n log n). Sessions on different days never overlap, so
+a single pass gives the best schedule for every day at once.
+
+Walking time is modelled as a fixed buffer that must separate two sessions
+in different rooms; staying in the same room needs none. This is handled
+with one running-best table for all rooms and one per room.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+from corpus import normalize_times
+from conflicts import absolute_minutes
+
+
+class _BestSoFar:
+    """Running maximum of schedule totals, ordered by the end time of their last session"""
+
+    def __init__(self):
+        self.ends = []
+        self.totals = []
+        self.last = []
+
+    def add(self, end, total, last):
+        if self.totals and self.totals[-1] >= total:
+            total, last = self.totals[-1], self.last[-1]
+        self.ends.append(end)
+        self.totals.append(total)
+        self.last.append(last)
+
+    def before(self, time):
+        """Best (total, last session) among schedules ending at or before ``time``"""
+        pos = bisect_right(self.ends, time) - 1
+        if pos < 0:
+            return 0.0, -1
+        return self.totals[pos], self.last[pos]
+
+
+def optimize_schedule(sessions, score_column='user_relevance', walk_minutes=0):
+    """
+    Find the non-overlapping sessions with the highest total relevance.
+
+    Parameters:
+    -----------
+    sessions : pandas DataFrame
+        Candidate sessions with Date, Location and score columns and the
+        normalized start_minutes/end_minutes columns (or Start and End, which
+        are then normalized here), e.g. as returned by user_customized_featurizer
+    score_column : str, optional
+        Column with the value of attending each session (default: 'user_relevance')
+    walk_minutes : int, optional
+        Minutes needed to move between two different rooms (default: 0)
+
+    Returns:
+    --------
+    pandas DataFrame
+        The chosen sessions in chronological order, with a 'RoomChange' column
+        that is True where the session is in a different room than the previous
+        one on the same day
+    """
+    if sessions is None or sessions.empty:
+        return sessions
+
+    dates = pd.to_datetime(sessions['Date'])
+    if 'start_minutes' in sessions.columns and 'end_minutes' in sessions.columns:
+        start_minutes, end_minutes = sessions['start_minutes'], sessions['end_minutes']
+    else:
+        start_minutes, end_minutes, _ = normalize_times(sessions)
+
+    starts = absolute_minutes(dates, start_minutes)
+    ends = absolute_minutes(dates, end_minutes)
+    scores = sessions[score_column].to_numpy(dtype=float)
+    rooms = sessions['Location'].to_numpy()
+
+    # Sessions that cannot add value or have no duration are never chosen
+    candidates = np.flatnonzero((scores > 0) & (ends > starts))
+    order = candidates[np.lexsort((starts[candidates], ends[candidates]))]
+
+    best_any = _BestSoFar()
+    best_by_room = {}
+    previous = {}
+
+    for pos in order:
+        start, room = starts[pos], rooms[pos]
+        room_best = best_by_room.setdefault(room, _BestSoFar())
+
+        # Another room needs a walking buffer; the same room can be back to back
+        total, last = best_any.before(start - walk_minutes)
+        same_room_total, same_room_last = room_best.before(start)
+        if same_room_total > total:
+            total, last = same_room_total, same_room_last
+
+        previous[pos] = last
+        total += scores[pos]
+        best_any.add(ends[pos], total, pos)
+        room_best.add(ends[pos], total, pos)
+
+    # Walk back from the best final session to recover the schedule
+    chosen = []
+    pos = best_any.last[-1] if best_any.last else -1
+    while pos >= 0:
+        chosen.append(pos)
+        pos = previous[pos]
+    chosen.reverse()
+
+    itinerary = sessions.iloc[chosen].copy()
+    day = dates.iloc[chosen].dt.date
+    itinerary['RoomChange'] = (day.eq(day.shift()) & itinerary['Location'].ne(itinerary['Location'].shift())).to_numpy()
+    return itinerary
+
+
+def print_itinerary(itinerary, score_column='user_relevance'):
+    """
+    Print an optimized itinerary day by day.
+
+    Parameters:
+    -----------
+    itinerary : pandas DataFrame
+        Itinerary returned by optimize_schedule
+    score_column : str, optional
+        Column with the relevance of each session (default: 'user_relevance')
+    """
+    print("\n" + "-"*80)
+    print("OPTIMIZED ITINERARY (NO OVERLAPPING SESSIONS)")
+    print("-"*80)
+
+    if itinerary is None or itinerary.empty:
+        print("\nNo sessions could be scheduled.")
+        return
+
+    for date, day_sessions in itinerary.groupby(pd.to_datetime(itinerary['Date']).dt.date):
+        print(f"\n{date.strftime('%A, %B %d, %Y').upper()} "
+              f"({len(day_sessions)} sessions, total relevance: {day_sessions[score_column].sum():.1f})")
+        print("-" * 50)
+        for _, session in day_sessions.iterrows():
+            move = "  → change rooms" if session['RoomChange'] else ""
+            print(f"{session['Start']} - {session['End']} | Room {session['Location']}{move}")
+            print(f"   {session['Title']} (relevance: {session[score_column]:.1f})")
+
+    print(f"\nTotal: {len(itinerary)} sessions, relevance {itinerary[score_column].sum():.1f}")
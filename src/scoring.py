@@ -0,0 +1,432 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Vectorized keyword scoring engine for the TMS Conference Planner.
+
+The per-row scorer in analyze_tms (score_session_relevance) rebuilds and
+lowercases the session text for every row and every keyword. The functions
+in this module build the lowercased text column once and then test every
+keyword against all sessions in a single vectorized pass, producing both the
+relevance scores and a sessions x keywords match matrix.
+"""
+
+import numpy as np
+import pandas as pd
+
+from keyword_automaton import KeywordAutomaton
+
+# Profiles with at least this many distinct keywords are matched with a
+# KeywordAutomaton (one pass per session) instead of one scan per keyword
+AUTOMATON_MIN_KEYWORDS = 100
+
+
+def build_session_text(df):
+    """
+    Build one lowercased searchable text string per session.
+
+    The text is the space-joined string values of each row, matching what
+    score_session_relevance builds from ``row.values``.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Conference data
+
+    Returns:
+    --------
+    pandas Series
+        Lowercased session text, indexed like ``df``
+    """
+    # Numeric, boolean and datetime columns can never hold strings
+    text_df = df.select_dtypes(exclude=['number', 'bool', 'datetime', 'datetimetz', 'timedelta'])
+
+    texts = [' '.join([val for val in row if isinstance(val, str)]).lower()
+             for row in text_df.itertuples(index=False, name=None)]
+
+    return pd.Series(texts, index=df.index, dtype=object)
+
+
+def keyword_match_matrix(text, focus_areas, method='auto', search_index=None, hits=None):
+    """
+    Test every keyword of every focus area against all sessions.
+
+    Each distinct (lowercased) keyword is matched once, even if it appears in
+    several focus areas, and keywords already in ``hits`` are not matched
+    again.
+
+    Parameters:
+    -----------
+    text : pandas Series
+        Lowercased session text, as returned by build_session_text
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+    method : str, optional
+        'substring' scans the texts once per keyword, 'automaton' scans each
+        text once for all keywords with a KeywordAutomaton, 'index' only
+        checks the sessions a SearchIndex finds all of the keyword's n-grams
+        in, and 'auto' uses the index when one is given, otherwise the
+        automaton for profiles with AUTOMATON_MIN_KEYWORDS or more distinct
+        keywords (default: 'auto')
+    search_index : SearchIndex, optional
+        Index built over the same ``text`` (default: None)
+    hits : dict or KeywordHitCache, optional
+        Cache mapping lowercased keywords to their boolean hit arrays over
+        ``text``; the newly matched keywords are added to it (default: None)
+
+    Returns:
+    --------
+    pandas DataFrame
+        Boolean match matrix indexed like ``text`` with one column per
+        (area, keyword) pair
+    """
+    needles = list(dict.fromkeys(keyword.lower() for keywords in focus_areas.values() for keyword in keywords))
+    return _match_frame(_cached_keyword_hits(text, needles, method, search_index, hits), text.index, focus_areas)
+
+
+def _cached_keyword_hits(text, needles, method, search_index, hits):
+    """Like _keyword_hits, but only matches the needles missing from the ``hits`` cache"""
+    if hits is None:
+        return _keyword_hits(text, needles, method, search_index)
+    # Read the cached hits before adding new ones: the update may evict them
+    found = {needle: hits.get(needle) for needle in needles}
+    missing = [needle for needle, needle_hits in found.items() if needle_hits is None]
+    new_hits = _keyword_hits(text, missing, method, search_index) if missing else {}
+    hits.update(new_hits)
+    found.update(new_hits)
+    return found
+
+
+def _keyword_hits(text, needles, method='auto', search_index=None):
+    """Match each distinct lowercased keyword against all texts, returning keyword -> bool array"""
+    if method == 'auto':
+        if search_index is not None:
+            method = 'index'
+        else:
+            method = 'automaton' if len(needles) >= AUTOMATON_MIN_KEYWORDS else 'substring'
+
+    if method == 'index':
+        if search_index is None:
+            raise ValueError("The 'index' matching method needs a search index")
+        return {needle: search_index.contains_mask(needle) for needle in needles}
+
+    texts = text.tolist()
+    if method == 'automaton':
+        automaton = KeywordAutomaton({'keywords': needles})
+        hit_matrix = automaton.match_matrix(texts)
+        return {needle: hit_matrix[:, automaton.keyword_ids[needle]] for needle in needles}
+    if method == 'substring':
+        return {needle: np.fromiter((needle in t for t in texts), dtype=bool, count=len(texts))
+                for needle in needles}
+    raise ValueError(f"Unknown matching method: {method}")
+
+
+def _match_frame(hits, index, focus_areas):
+    """Assemble the (area, keyword) match matrix of one profile from keyword hits"""
+    columns = [(area, keyword) for area, keywords in focus_areas.items() for keyword in keywords]
+    if columns:
+        data = np.column_stack([hits[keyword.lower()] for _, keyword in columns])
+    else:
+        data = np.zeros((len(index), 0), dtype=bool)
+
+    return pd.DataFrame(
+        data,
+        index=index,
+        columns=pd.MultiIndex.from_tuples(columns, names=['area', 'keyword'])
+    )
+
+
+def area_match_matrix(matches):
+    """
+    Collapse a keyword match matrix to one boolean column per focus area.
+
+    Parameters:
+    -----------
+    matches : pandas DataFrame
+        Match matrix returned by keyword_match_matrix
+
+    Returns:
+    --------
+    pandas DataFrame
+        True where a session matches at least one keyword of the area
+    """
+    areas = list(dict.fromkeys(matches.columns.get_level_values('area')))
+    return pd.DataFrame(
+        {area: matches.xs(area, axis=1, level='area').any(axis=1) for area in areas},
+        index=matches.index,
+        columns=areas
+    )
+
+
+def score_sessions(df, focus_areas, weights=None, text=None, method='auto', search_index=None):
+    """
+    Score all sessions against the focus areas in one vectorized pass.
+
+    Without weights this returns the same scores as applying
+    score_session_relevance to every row: one point per matching keyword.
+    With weights, each area's keyword count is multiplied by its weight and
+    the areas are summed in order, as in user_customized_featurizer.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Conference data
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+    weights : dict, optional
+        Dictionary mapping focus areas to weights (default: None, unweighted)
+    text : pandas Series, optional
+        Pre-built session text (default: None, built from ``df``)
+    method : str, optional
+        Keyword matching method passed to keyword_match_matrix (default: 'auto')
+    search_index : SearchIndex, optional
+        Index over ``text`` to match keywords with (default: None)
+
+    Returns:
+    --------
+    tuple of (pandas Series, pandas DataFrame)
+        The relevance score per session and the per-keyword match matrix
+    """
+    if text is None:
+        text = build_session_text(df)
+
+    matches = keyword_match_matrix(text, focus_areas, method=method, search_index=search_index)
+    return scores_from_matches(matches, focus_areas, weights), matches
+
+
+def area_keyword_counts(matches, focus_areas):
+    """
+    Count the matched keywords of each focus area per session.
+
+    Parameters:
+    -----------
+    matches : pandas DataFrame
+        Match matrix returned by keyword_match_matrix
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+
+    Returns:
+    --------
+    pandas DataFrame
+        Integer counts with one column per focus area, in the order of ``focus_areas``
+    """
+    data = matches.to_numpy()
+    areas = matches.columns.get_level_values('area')
+    counts = {area: data[:, areas == area].sum(axis=1) for area in focus_areas}
+    return pd.DataFrame(counts, index=matches.index, columns=list(focus_areas), dtype=int)
+
+
+def scores_from_area_counts(counts, weights=None):
+    """
+    Compute relevance scores from per-area keyword counts.
+
+    Re-weighting a profile only needs this step, not a new keyword scan.
+
+    Parameters:
+    -----------
+    counts : pandas DataFrame
+        Counts returned by area_keyword_counts
+    weights : dict, optional
+        Dictionary mapping focus areas to weights (default: None, unweighted)
+
+    Returns:
+    --------
+    pandas Series
+        The relevance score per session
+    """
+    if weights is None:
+        return pd.Series(counts.to_numpy().sum(axis=1), index=counts.index, dtype=int)
+
+    scores = np.zeros(len(counts), dtype=float)
+    for area in counts.columns:
+        scores += counts[area].to_numpy() * weights.get(area, 1.0)
+    return pd.Series(scores, index=counts.index)
+
+
+def scores_from_matches(matches, focus_areas, weights=None):
+    """
+    Compute relevance scores from a keyword match matrix.
+
+    Parameters:
+    -----------
+    matches : pandas DataFrame
+        Match matrix returned by keyword_match_matrix
+    focus_areas : dict
+        Dictionary mapping focus areas to lists of keywords
+    weights : dict, optional
+        Dictionary mapping focus areas to weights (default: None, unweighted)
+
+    Returns:
+    --------
+    pandas Series
+        The relevance score per session
+    """
+    return scores_from_area_counts(area_keyword_counts(matches, focus_areas), weights)
+
+
+def score_profiles(df, profiles, text=None, method='auto', search_index=None, hits=None):
+    """
+    Score all sessions against several interest profiles in one pass.
+
+    The distinct keywords of all profiles are merged into one combined index
+    and each is matched against the sessions once; every profile's match
+    matrix and scores are then assembled from the shared keyword hits.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Conference data
+    profiles : dict
+        Dictionary mapping profile names to {"interests": ..., "weights": ...}
+        dictionaries, as in RESEARCH_PROFILES (weights are optional)
+    text : pandas Series, optional
+        Pre-built session text (default: None, built from ``df``)
+    method : str, optional
+        Keyword matching method, as in keyword_match_matrix (default: 'auto',
+        decided by the size of the combined index)
+    search_index : SearchIndex, optional
+        Index over ``text`` to match keywords with (default: None)
+    hits : dict, optional
+        Keyword hit cache, as in keyword_match_matrix (default: None)
+
+    Returns:
+    --------
+    dict
+        Dictionary mapping profile names to (scores, matches) tuples, as
+        returned by score_sessions with the profile's weights
+    """
+    if text is None:
+        text = build_session_text(df)
+
+    needles = list(dict.fromkeys(keyword.lower() for profile in profiles.values()
+                                 for keywords in profile["interests"].values() for keyword in keywords))
+    hits = _cached_keyword_hits(text, needles, method, search_index, hits)
+
+    results = {}
+    for name, profile in profiles.items():
+        matches = _match_frame(hits, text.index, profile["interests"])
+        results[name] = (scores_from_matches(matches, profile["interests"], profile.get("weights")), matches)
+    return results
+
+
+def matched_keywords(matches, area):
+    """
+    List the keywords of one focus area matched by each session.
+
+    Parameters:
+    -----------
+    matches : pandas DataFrame
+        Match matrix returned by keyword_match_matrix
+    area : str
+        Focus area name
+
+    Returns:
+    --------
+    pandas Series
+        List of matched keywords per session
+    """
+    area_matches = matches.xs(area, axis=1, level='area')
+    keywords = np.array(area_matches.columns, dtype=object)
+    return pd.Series([list(keywords[row]) for row in area_matches.to_numpy()], index=matches.index)
+
+
+def interest_matches(matches):
+    """
+    Build the per-session interest match lists from a match matrix.
+
+    Parameters:
+    -----------
+    matches : pandas DataFrame
+        Match matrix returned by keyword_match_matrix
+
+    Returns:
+    --------
+    pandas Series
+        One dictionary per session mapping each matched focus area to its
+        matched keywords (areas without matches are omitted)
+    """
+    areas = matches.columns.get_level_values('area')
+    keywords = matches.columns.get_level_values('keyword')
+    result = []
+    for row in matches.to_numpy():
+        session_matches = {}
+        for col in np.flatnonzero(row):
+            session_matches.setdefault(areas[col], []).append(keywords[col])
+        result.append(session_matches)
+    return pd.Series(result, index=matches.index, dtype=object)
+
+
+def top_k_positions(scores, k, groups=None):
+    """
+    Find the positions of the k highest scores without sorting all of them.
+
+    Candidates are selected with np.argpartition and only those are sorted,
+    best first; equal scores keep their original order, as a stable
+    descending sort would.
+
+    Parameters:
+    -----------
+    scores : array-like
+        Scores to rank
+    k : int
+        Number of positions to return (per group when ``groups`` is given)
+    groups : array-like, optional
+        Group label per score, e.g. the session day; the k best positions of
+        each group are returned, groups in order of first appearance
+        (default: None, rank all scores together)
+
+    Returns:
+    --------
+    numpy ndarray
+        Integer positions into ``scores``
+    """
+    values = np.asarray(scores)
+    if groups is not None:
+        codes, _ = pd.factorize(pd.Series(groups))
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(codes.max(initial=-1) + 2))
+        parts = [order[start:end][top_k_positions(values[order[start:end]], k)]
+                 for start, end in zip(bounds[:-1], bounds[1:])]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    n = len(values)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k == n:
+        return np.argsort(-values, kind='stable')
+
+    # Everything above the k-th highest score, plus the first of the ties with it
+    kth = values[np.argpartition(-values, k - 1)[k - 1]]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    chosen = np.sort(np.concatenate([above, ties]))
+    return chosen[np.argsort(-values[chosen], kind='stable')]
+
+
+def iter_ranked_positions(scores, first=20):
+    """
+    Yield positions in order of decreasing score, ranking only as far as consumed.
+
+    The first ``first`` positions are selected with top_k_positions and the
+    following blocks double in size, so showing the best results needs no
+    full sort, and consuming everything costs about two sorts.
+
+    Parameters:
+    -----------
+    scores : array-like
+        Scores to rank
+    first : int, optional
+        Size of the first block of positions to rank (default: 20)
+
+    Yields:
+    -------
+    int
+        Positions into ``scores``, best first (ties in original order)
+    """
+    values = np.asarray(scores)
+    done, k = 0, max(1, first)
+    while done < len(values):
+        ranked = top_k_positions(values, k)
+        for position in ranked[done:]:
+            yield int(position)
+        done, k = len(ranked), k * 2
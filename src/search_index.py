@@ -0,0 +1,298 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+"""
+Inverted index over the conference sessions.
+
+The index is built once per SessionCorpus and answers three kinds of lookups
+without rescanning every session:
+
+- Substring search (what search_sessions and the keyword scorers need): every
+  3-character n-gram (trigram) of the session text points to the sessions
+  containing it, so a keyword only has to be checked against the sessions
+  that contain all of its trigrams.
+- Word search: every token of the searchable fields (Title, Description,
+  Symposium, speakers, ...) points to the sessions and positions where it
+  occurs, which also answers exact phrase queries.
+- Multi-term queries combining words and "quoted phrases" with AND, OR and
+  parentheses (adjacent terms are combined with AND).
+
+Postings are stored as flat numpy arrays sorted by trigram or token, so the
+index is built with a few sorts instead of millions of dictionary inserts.
+Trigrams are packed into one integer each (three 21-bit code points).
+"""
+
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# Fields covered by the word index and the per-field substring search
+SEARCH_FIELDS = ['Track', 'Symposium', 'Session', 'Title', 'Description',
+                 'Speaker', 'SpeakerAffiliation', 'AllAuthors']
+
+_TOKEN_RE = re.compile(r'\w+')
+_QUERY_RE = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+
+
+def tokenize(text):
+    """
+    Split a text into lowercased word tokens.
+
+    Parameters:
+    -----------
+    text : str
+        Text to split
+
+    Returns:
+    --------
+    list of str
+        The word tokens in order
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigram_codes(text):
+    """Distinct trigrams of a text, each packed into one integer"""
+    chars = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(chars) < 3:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique((chars[:-2] << np.uint64(42)) | (chars[1:-1] << np.uint64(21)) | chars[2:])
+
+
+def _group_offsets(keys, n_keys):
+    """Start offsets of each key's run in a sorted key array (length n_keys + 1)"""
+    return np.searchsorted(keys, np.arange(n_keys + 1))
+
+
+class SearchIndex:
+    """
+    N-gram and positional word index over a set of sessions.
+
+    Row positions (0 to n-1, in the order of the corpus) are used internally;
+    the public search methods return session index labels.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        The conference data
+    text : pandas Series
+        Lowercased session text, as returned by scoring.build_session_text
+    fields : list, optional
+        Columns covered by the word index (default: SEARCH_FIELDS present in ``df``)
+    """
+
+    def __init__(self, df, text, fields=None):
+        self.labels = df.index
+        self.texts = text.tolist()
+        if fields is None:
+            fields = [field for field in SEARCH_FIELDS if field in df.columns]
+        self.fields = list(fields)
+
+        # Lowercased string values of each field (other values never match)
+        self.field_texts = {field: [value.lower() if isinstance(value, str) else '' for value in df[field]]
+                            for field in self.fields}
+
+        # Trigram postings of the full session text: the rows of trigram k are
+        # _trigram_rows[_trigram_offsets[k]:_trigram_offsets[k + 1]]
+        codes = [_trigram_codes(session_text) for session_text in self.texts]
+        rows = np.repeat(np.arange(len(codes), dtype=np.int32), [len(row_codes) for row_codes in codes])
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.uint64)
+        order = np.argsort(codes, kind='stable')
+        self._trigrams, trigram_ids = np.unique(codes[order], return_inverse=True)
+        self._trigram_rows = rows[order]
+        self._trigram_offsets = _group_offsets(trigram_ids, len(self._trigrams))
+
+        # Word postings: one entry per token occurrence, sorted by token, then
+        # row, field and position within the field
+        tokens = []
+        token_rows, token_fields, token_positions = [], [], []
+        for field_id, field in enumerate(self.fields):
+            field_tokens = [tokenize(field_text) for field_text in self.field_texts[field]]
+            lengths = np.array([len(row_tokens) for row_tokens in field_tokens], dtype=np.int64)
+            n_tokens = int(lengths.sum())
+            tokens.extend(chain.from_iterable(field_tokens))
+            token_rows.append(np.repeat(np.arange(len(field_tokens), dtype=np.int64), lengths))
+            token_fields.append(np.full(n_tokens, field_id, dtype=np.int64))
+            row_starts = np.cumsum(lengths) - lengths
+            token_positions.append(np.arange(n_tokens, dtype=np.int64) - np.repeat(row_starts, lengths))
+
+        def combine(arrays):
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+
+        token_rows, token_fields, token_positions = map(combine, (token_rows, token_fields, token_positions))
+        token_ids, vocabulary = pd.factorize(pd.Series(tokens, dtype=object))
+        self._vocabulary = {token: token_id for token_id, token in enumerate(vocabulary)}
+        order = np.lexsort((token_positions, token_fields, token_rows, token_ids))
+        self._token_rows = token_rows[order]
+        self._token_fields = token_fields[order]
+        self._token_positions = token_positions[order]
+        self._token_offsets = _group_offsets(token_ids[order], len(self._vocabulary))
+
+    def __len__(self):
+        return len(self.texts)
+
+    # Substring search
+
+    def _candidate_rows(self, needle):
+        """Rows whose text contains every trigram of the needle (a superset of the matches)"""
+        codes = _trigram_codes(needle)
+        if not len(codes):
+            return None  # Too short to narrow down: every row is a candidate
+
+        ids = np.searchsorted(self._trigrams, codes)
+        if (ids >= len(self._trigrams)).any() or (self._trigrams[np.minimum(ids, len(self._trigrams) - 1)] != codes).any():
+            return np.empty(0, dtype=np.int32)  # A trigram that no session contains
+
+        # Intersect the shortest posting lists first
+        postings = sorted((self._trigram_rows[self._trigram_offsets[i]:self._trigram_offsets[i + 1]] for i in ids),
+                          key=len)
+        candidates = postings[0]
+        for rows in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return candidates
+
+    def contains_mask(self, needle, field=None):
+        """
+        Find the sessions containing a substring, like ``needle in text.lower()``.
+
+        Parameters:
+        -----------
+        needle : str
+            Substring to look for (matched case-insensitively)
+        field : str, optional
+            Only search this column (default: None, the full session text)
+
+        Returns:
+        --------
+        numpy ndarray
+            Boolean mask over the sessions, in corpus order
+        """
+        needle = needle.lower()
+        texts = self.texts if field is None else self.field_texts[field]
+
+        mask = np.zeros(len(texts), dtype=bool)
+        candidates = self._candidate_rows(needle)
+        if candidates is None:
+            candidates = range(len(texts))
+        for row in candidates:
+            if needle in texts[row]:
+                mask[row] = True
+        return mask
+
+    # Word and phrase search
+
+    def _occurrences(self, token, field_ids):
+        """Rows, fields and positions where a token occurs in the given fields"""
+        token_id = self._vocabulary.get(token)
+        if token_id is None:
+            return (np.empty(0, dtype=np.int64),) * 3
+        span = slice(self._token_offsets[token_id], self._token_offsets[token_id + 1])
+        rows, fields, positions = self._token_rows[span], self._token_fields[span], self._token_positions[span]
+        keep = np.isin(fields, field_ids)
+        return rows[keep], fields[keep], positions[keep]
+
+    def _phrase_rows(self, tokens, field_ids):
+        """Rows where the tokens occur consecutively within one field"""
+        if not tokens:
+            return set()
+
+        # Identify each possible phrase start as (row, field, position) packed
+        # into one integer, and keep the starts at which every token is found
+        stride = int(self._token_positions.max()) + 1 if len(self._token_positions) else 1
+        starts = None
+        for offset, token in enumerate(tokens):
+            rows, fields, positions = self._occurrences(token, field_ids)
+            positions = positions - offset
+            valid = positions >= 0
+            keys = (rows[valid] * len(self.fields) + fields[valid]) * stride + positions[valid]
+            starts = keys if starts is None else np.intersect1d(starts, keys)
+            if not len(starts):
+                return set()
+        return set((starts // stride // len(self.fields)).tolist())
+
+    def _parse(self, query, field_ids):
+        """Evaluate a query to a set of rows (recursive descent: OR < AND < term)"""
+        items = []
+        for phrase, open_paren, close_paren, word in _QUERY_RE.findall(query):
+            if open_paren or close_paren:
+                items.append(open_paren or close_paren)
+            elif word in ('AND', 'OR'):
+                items.append(word)
+            else:
+                items.append(('phrase', tokenize(phrase or word)))
+        pos = 0
+
+        def parse_or():
+            nonlocal pos
+            rows = parse_and()
+            while pos < len(items) and items[pos] == 'OR':
+                pos += 1
+                rows = rows | parse_and()
+            return rows
+
+        def parse_and():
+            nonlocal pos
+            rows = parse_term()
+            while pos < len(items) and items[pos] not in ('OR', ')'):
+                if items[pos] == 'AND':
+                    pos += 1
+                rows = rows & parse_term()
+            return rows
+
+        def parse_term():
+            nonlocal pos
+            if pos >= len(items):
+                raise ValueError(f"Incomplete search query: {query}")
+            item = items[pos]
+            pos += 1
+            if item == '(':
+                rows = parse_or()
+                if pos >= len(items) or items[pos] != ')':
+                    raise ValueError(f"Missing closing parenthesis in search query: {query}")
+                pos += 1
+                return rows
+            if item in ('AND', 'OR', ')'):
+                raise ValueError(f"Unexpected '{item}' in search query: {query}")
+            return self._phrase_rows(item[1], field_ids)
+
+        if not items:
+            return set()
+        rows = parse_or()
+        if pos < len(items):
+            raise ValueError(f"Unexpected '{items[pos]}' in search query: {query}")
+        return rows
+
+    def search(self, query, fields=None):
+        """
+        Find the sessions matching a multi-term query.
+
+        Words match whole tokens case-insensitively; "quoted phrases" (and
+        words like 'solid-state' that split into several tokens) match
+        consecutive tokens within one field. Terms are combined with AND and
+        OR (AND binds tighter; adjacent terms are ANDed) and can be grouped
+        with parentheses, e.g. ``battery AND ("machine learning" OR ai)``.
+
+        Parameters:
+        -----------
+        query : str
+            The search query
+        fields : list, optional
+            Columns to search (default: None, all indexed fields)
+
+        Returns:
+        --------
+        pandas Index
+            Labels of the matching sessions, in corpus order
+
+        Raises:
+        -------
+        ValueError
+            If the query is malformed
+        """
+        fields = self.fields if fields is None else fields
+        field_ids = [self.fields.index(field) for field in fields if field in self.fields]
+        rows = sorted(self._parse(query, field_ids))
+        return self.labels[rows]
@@ -0,0 +1,215 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+#!/usr/bin/env python3
+# tms_client.py
+# Thin command-line client for the TMS planner server (tms_server.py)
+
+import sys
+import json
+import argparse
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def request(url, endpoint, payload=None, timeout=60):
+    """
+    Send a request to the planner server.
+
+    Parameters:
+    -----------
+    url : str
+        Base URL of the server
+    endpoint : str
+        Endpoint path, e.g. '/score'
+    payload : dict, optional
+        JSON body; sends a POST if given, otherwise a GET (default: None)
+    timeout : float, optional
+        Seconds to wait for the response (default: 60)
+
+    Returns:
+    --------
+    dict, str or None
+        The decoded JSON response, the HTML text for /calendar, or None on error
+    """
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url.rstrip('/') + endpoint, data=data,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            body = response.read().decode('utf-8')
+            if response.headers.get_content_type() == 'application/json':
+                return json.loads(body)
+            return body
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode('utf-8')).get('error', e.reason)
+        except ValueError:
+            message = e.reason
+        print(f"Error: {message}")
+    except urllib.error.URLError as e:
+        print(f"Error: Could not reach the planner server at {url}: {e.reason}")
+    return None
+
+
+def stream_request(url, endpoint, payload, timeout=60):
+    """
+    Send a streaming request and yield the results as they arrive.
+
+    Parameters:
+    -----------
+    url : str
+        Base URL of the server
+    endpoint : str
+        Endpoint path, e.g. '/score'
+    payload : dict
+        JSON body, including "stream": true
+    timeout : float, optional
+        Seconds to wait for each line of the response (default: 60)
+
+    Yields:
+    -------
+    dict
+        One decoded JSON object per line of the response (nothing more
+        after an error, which is printed)
+    """
+    req = urllib.request.Request(url.rstrip('/') + endpoint, data=json.dumps(payload).encode('utf-8'),
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            for line in response:
+                if line.strip():
+                    record = json.loads(line)
+                    if 'error' in record:
+                        print(f"Error: {record['error']}")
+                        return
+                    yield record
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode('utf-8')).get('error', e.reason)
+        except ValueError:
+            message = e.reason
+        print(f"Error: {message}")
+    except urllib.error.URLError as e:
+        print(f"Error: Could not reach the planner server at {url}: {e.reason}")
+
+
+def profile_payload(args):
+    """Build the profile part of a request from --profile or --interests"""
+    if args.interests:
+        with open(args.interests, 'r') as f:
+            data = json.load(f)
+        return {'interests': data['interests'], 'weights': data.get('weights')}
+    return {'profile': args.profile}
+
+
+def print_sessions(sessions, score_column=None):
+    """Print sessions one per line"""
+    for session in sessions:
+        score = f" | Score: {session[score_column]:.1f}" if score_column else ""
+        print(f"{session.get('Date')} {session.get('Start')} - {session.get('End')} | "
+              f"Room {session.get('Location')}{score}")
+        print(f"   {session.get('Title')}")
+
+
+def main():
+    """Command-line interface for the planner server"""
+    parser = argparse.ArgumentParser(description="Query a running TMS planner server")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Server URL (default: {DEFAULT_URL})")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON response")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("health", help="Check that the server is up")
+
+    def add_profile_arguments(subparser):
+        group = subparser.add_mutually_exclusive_group(required=True)
+        group.add_argument("-p", "--profile", help="Use a pre-defined research profile")
+        group.add_argument("-i", "--interests", help="Path to a JSON file with custom interests")
+        subparser.add_argument("-m", "--min-score", type=float, default=3,
+                               help="Minimum relevance score (default: 3)")
+
+    score_parser = subparsers.add_parser("score", help="Score sessions against a profile")
+    add_profile_arguments(score_parser)
+    score_parser.add_argument("-n", "--limit", type=int, help="Only show the N best sessions")
+    score_parser.add_argument("--stream", action="store_true",
+                              help="Print the sessions best first as the server ranks them")
+
+    search_parser = subparsers.add_parser("search", help="Search sessions")
+    search_parser.add_argument("query", help='Query such as: battery AND ("machine learning" OR ai)')
+    search_parser.add_argument("--substring", action="store_true",
+                               help="Match the query as a literal substring instead")
+    search_parser.add_argument("--field", help="Only search this column")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Get a personalized schedule")
+    add_profile_arguments(schedule_parser)
+    schedule_parser.add_argument("--optimize", action="store_true",
+                                 help="Also get the best itinerary without overlapping sessions")
+    schedule_parser.add_argument("--walk-minutes", type=int, default=5,
+                                 help="Minutes needed to change rooms (default: 5)")
+
+    calendar_parser = subparsers.add_parser("calendar", help="Render an interactive calendar to an HTML file")
+    add_profile_arguments(calendar_parser)
+    calendar_parser.add_argument("-o", "--output", required=True, help="Path to save the HTML file")
+    calendar_parser.add_argument("--symposium-view", action="store_true",
+                                 help="Group sessions by symposium")
+    calendar_parser.add_argument("-t", "--title", help="Custom title for the visualization")
+    calendar_parser.add_argument("--renderer", choices=["batched", "traces", "webgl"], default="batched",
+                                 help="How session blocks are drawn (default: batched)")
+
+    args = parser.parse_args()
+
+    if args.command == "health":
+        result = request(args.url, '/health')
+    elif args.command == "score" and args.stream:
+        payload = dict(profile_payload(args), min_score=args.min_score, limit=args.limit, stream=True)
+        for session in stream_request(args.url, '/score', payload):
+            if args.json:
+                print(json.dumps(session))
+            else:
+                print_sessions([session], 'score')
+            sys.stdout.flush()
+        return 0
+    elif args.command == "score":
+        result = request(args.url, '/score', dict(profile_payload(args), min_score=args.min_score, limit=args.limit))
+    elif args.command == "search":
+        if args.substring:
+            payload = {'keyword': args.query, 'field': args.field}
+        else:
+            payload = {'query': args.query, 'fields': [args.field] if args.field else None}
+        result = request(args.url, '/search', payload)
+    elif args.command == "schedule":
+        result = request(args.url, '/schedule', dict(profile_payload(args), min_score=args.min_score,
+                                                     optimize=args.optimize, walk_minutes=args.walk_minutes))
+    else:
+        result = request(args.url, '/calendar', dict(profile_payload(args), min_score=args.min_score,
+                                                     symposium_view=args.symposium_view, title=args.title,
+                                                     renderer=args.renderer))
+        if result is not None:
+            with open(args.output, 'w') as f:
+                f.write(result)
+            print(f"Calendar saved to {args.output}")
+            return 0
+
+    if result is None:
+        return 1
+
+    if args.json or args.command == "health":
+        print(json.dumps(result, indent=2))
+    elif args.command == "score":
+        print(f"{result['count']} sessions with score >= {result['min_score']} ({result['profile']} profile)")
+        print_sessions(result['sessions'], 'score')
+    elif args.command == "search":
+        print(f"{result['count']} matching sessions")
+        print_sessions(result['sessions'])
+    elif args.command == "schedule":
+        print(f"{result['count']} relevant sessions ({result['profile']} profile)")
+        print_sessions(result['sessions'], 'user_relevance')
+        if 'itinerary' in result:
+            print(f"\nOptimized itinerary ({len(result['itinerary'])} sessions):")
+            print_sessions(result['itinerary'], 'user_relevance')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,15 @@
 
 import argparse
 import json
-import pandas as pd
-import numpy as np
 import os
 import sys
-from analyze_tms import load_conference_data, user_customized_featurizer, visualize_schedule_calendar, find_data_file
+import time
+
+from instrumentation import add_timings_argument, start_timings, finish_timings, stage
+
+# The data and plotting modules (pandas, numpy, matplotlib) are imported by
+# the functions that need them, so --list-profiles and --template start
+# without loading them
 
 # Pre-defined research profiles
 RESEARCH_PROFILES = {
@@ -104,6 +108,46 @@ def load_interests_from_file(file_path):
         print(f"Error loading interests file: {e}")
         return None, None
 
+def select_profiles(profile_names=None, interests_files=None):
+    """
+    Collect several interest profiles for batch scoring.
+
+    Parameters:
+    -----------
+    profile_names : list, optional
+        Names of pre-defined profiles, or ["all"] for every profile in RESEARCH_PROFILES
+    interests_files : list, optional
+        Paths to custom interests JSON files; each is named after its file
+        name without the extension and a trailing "_profile"
+
+    Returns:
+    --------
+    dict or None
+        Dictionary mapping profile names to {"interests": ..., "weights": ...}
+        dictionaries, or None if a profile could not be found or loaded
+    """
+    profiles = {}
+    
+    names = profile_names or []
+    if "all" in names:
+        names = list(RESEARCH_PROFILES.keys())
+    for name in names:
+        if name not in RESEARCH_PROFILES:
+            print(f"Error: Unknown profile '{name}'. Available profiles: {', '.join(RESEARCH_PROFILES.keys())}")
+            return None
+        profiles[name] = RESEARCH_PROFILES[name]
+    
+    for file_path in interests_files or []:
+        interests, weights = load_interests_from_file(file_path)
+        if interests is None:
+            return None
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if name.endswith("_profile"):
+            name = name[:-len("_profile")]
+        profiles[name] = {"interests": interests, "weights": weights}
+    
+    return profiles
+
 def save_template_interests(file_path, profile="battery"):
     """Save a template interests file for users to customize"""
     if profile not in RESEARCH_PROFILES:
@@ -119,6 +163,94 @@ def save_template_interests(file_path, profile="battery"):
     except Exception as e:
         print(f"Error saving template file: {e}")
 
+def run_batch(df, args):
+    """
+    Generate schedules for several profiles from one scoring pass.
+
+    Parameters:
+    -----------
+    df : SessionCorpus
+        The conference data
+    args : argparse.Namespace
+        Parsed command-line arguments
+    """
+    from analyze_tms import user_customized_featurizer
+    from schedule_optimizer import optimize_schedule, print_itinerary
+    
+    profile_names = list(args.profiles or [])
+    if args.profile:
+        profile_names.append(args.profile)
+    profiles = select_profiles(profile_names, args.interests)
+    if not profiles:
+        return
+    
+    # Match the keywords of all profiles against the sessions at once; the
+    # corpus keeps the results, so the per-profile schedules reuse them
+    print(f"Scoring {len(profiles)} profiles in one pass: {', '.join(profiles)}")
+    df.score_profiles(profiles)
+    
+    for name, profile in profiles.items():
+        print("\n\n" + "#"*80)
+        print(f"PROFILE: {name}")
+        print("#"*80)
+        
+        result_df = user_customized_featurizer(df, profile["interests"], profile.get("weights"),
+                                               min_score=args.min_score, show_calendar=False, top_k=args.top)
+        
+        if args.optimize and result_df is not None and not result_df.empty:
+            with stage('optimize', rows=len(result_df)):
+                itinerary = optimize_schedule(result_df, walk_minutes=args.walk_minutes)
+            print_itinerary(itinerary)
+
+def watch_interests(df, file_path, args, interval=1.0):
+    """
+    Print the schedule again every time an interests file is saved.
+
+    The corpus keeps the hits of every keyword matched so far, so each
+    update only matches newly added keywords, and a weight change is just
+    a recombination of the cached per-area counts.
+
+    Parameters:
+    -----------
+    df : SessionCorpus
+        The conference data
+    file_path : str
+        Path to the JSON interests file to watch
+    args : argparse.Namespace
+        Parsed command-line arguments
+    interval : float, optional
+        Seconds between checks for changes (default: 1.0)
+    """
+    from analyze_tms import user_customized_featurizer
+    from schedule_optimizer import optimize_schedule, print_itinerary
+    
+    print(f"\nWatching {file_path} for changes (press Ctrl+C to stop)...")
+    last_modified = os.path.getmtime(file_path)
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                modified = os.path.getmtime(file_path)
+            except OSError:
+                continue  # The file is being replaced by an editor
+            if modified == last_modified:
+                continue
+            last_modified = modified
+            
+            interests, weights = load_interests_from_file(file_path)
+            if interests is None:
+                continue
+            
+            start = time.perf_counter()
+            result_df = user_customized_featurizer(df, interests, weights, min_score=args.min_score,
+                                                   show_calendar=False, top_k=args.top)
+            if args.optimize and result_df is not None and not result_df.empty:
+                print_itinerary(optimize_schedule(result_df, walk_minutes=args.walk_minutes))
+            print(f"\nRescored in {(time.perf_counter() - start) * 1000:.0f} ms. "
+                  f"Watching {file_path} for changes...")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
 def main():
     """Command-line interface for the TMS planner"""
     parser = argparse.ArgumentParser(description="Generate personalized TMS conference schedules")
@@ -130,14 +262,19 @@ def main():
     interests_group = parser.add_argument_group("Interests options (choose one)")
     interests_group.add_argument("-p", "--profile", choices=list(RESEARCH_PROFILES.keys()),
                                help="Use a pre-defined research profile")
-    interests_group.add_argument("-i", "--interests", 
-                               help="Path to a JSON file with custom interests")
+    interests_group.add_argument("-i", "--interests", nargs="+",
+                               help="Path to a JSON file with custom interests (several files run in batch mode)")
+    interests_group.add_argument("--profiles", nargs="+", metavar="PROFILE",
+                               help="Batch mode: score several pre-defined profiles ('all' for every profile) "
+                                    "together with any --interests files in one pass")
     interests_group.add_argument("-t", "--template", 
                                help="Generate a template interests file at the specified path")
     
     # Additional options
     parser.add_argument("-m", "--min-score", type=int, default=5,
                       help="Minimum relevance score to include a session (default: 5)")
+    parser.add_argument("-k", "--top", type=int, metavar="K",
+                      help="Only show the K highest scoring sessions of each day")
     parser.add_argument("-l", "--list-profiles", action="store_true",
                       help="List available pre-defined profiles")
     parser.add_argument("-c", "--calendar", action="store_true", default=False,
@@ -146,6 +283,17 @@ def main():
                       help="Disable calendar visualization")
     parser.add_argument("-o", "--output", 
                       help="Save the calendar visualization to an image file (PNG format)")
+    parser.add_argument("--optimize", action="store_true",
+                      help="Also print the best itinerary without overlapping sessions")
+    parser.add_argument("--walk-minutes", type=int, default=5,
+                      help="Minutes needed to change rooms in the optimized itinerary (default: 5)")
+    parser.add_argument("-w", "--watch", action="store_true",
+                      help="Keep running and print the schedule again whenever the interests file changes")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Read the Excel file directly, without the binary data cache")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                      help="Rebuild the binary data cache from the Excel file")
+    add_timings_argument(parser)
     
     args = parser.parse_args()
     
@@ -164,12 +312,24 @@ def main():
         save_template_interests(args.template, profile)
         return
     
+    # Several profiles are scored together in batch mode
+    batch_mode = bool(args.profiles) or (args.interests is not None and len(args.interests) > 1)
+    
     # Make sure we have interests defined
-    if not args.profile and not args.interests:
+    if not args.profile and not args.interests and not args.profiles:
         print("Error: You must specify either a pre-defined profile (-p) or a custom interests file (-i)")
         parser.print_help()
         return
     
+    if args.watch and (batch_mode or not args.interests):
+        print("Error: --watch needs exactly one custom interests file (-i)")
+        return
+    
+    from analyze_tms import load_conference_data, user_customized_featurizer, visualize_schedule_calendar, find_data_file
+    from schedule_optimizer import optimize_schedule, print_itinerary
+    
+    start_timings(args)
+    
     # Determine file path - use find_data_file if no path provided
     file_path = args.file
     if not file_path:
@@ -180,15 +340,21 @@ def main():
     
     # Load conference data
     print("Loading TMS conference data...")
-    df = load_conference_data(file_path)
+    df = load_conference_data(file_path, use_cache=not args.no_cache, rebuild_cache=args.rebuild_cache)
     
     if df is None:
         print(f"Error: Could not load conference data from {file_path}")
         return
     
+    if batch_mode:
+        run_batch(df, args)
+        df.save_keyword_cache()
+        finish_timings(args)
+        return
+    
     # Get interests and weights
     if args.interests:
-        interests, weights = load_interests_from_file(args.interests)
+        interests, weights = load_interests_from_file(args.interests[0])
         if interests is None:
             return
     else:  # Use profile
@@ -199,19 +365,37 @@ def main():
     # Determine whether to show calendar
     show_calendar = args.calendar and not args.no_calendar
     
-    # Generate personalized schedule
-    result_df = user_customized_featurizer(df, interests, weights, min_score=args.min_score, show_calendar=show_calendar)
+    # Generate personalized schedule; with --output the calendar is only drawn
+    # once, for the file, below
+    result_df = user_customized_featurizer(df, interests, weights, min_score=args.min_score,
+                                           show_calendar=show_calendar and not args.output, top_k=args.top)
+    
+    # Pick the best set of non-overlapping sessions if requested
+    if args.optimize and result_df is not None and not result_df.empty:
+        with stage('optimize', rows=len(result_df)):
+            itinerary = optimize_schedule(result_df, walk_minutes=args.walk_minutes)
+        print_itinerary(itinerary)
     
     # Save visualization if requested
     if args.output and show_calendar and result_df is not None and not result_df.empty:
         import matplotlib.pyplot as plt
         print(f"\nSaving calendar visualization to {args.output}...")
-        fig = visualize_schedule_calendar(result_df, min_score=args.min_score, focus_areas=interests, 
-                               title=f"Your Personalized TMS Schedule (min score: {args.min_score})")
+        with stage('figure_build') as timing:
+            fig = visualize_schedule_calendar(result_df, min_score=args.min_score, focus_areas=interests, 
+                                   title=f"Your Personalized TMS Schedule (min score: {args.min_score})")
+            if fig:
+                timing.add(labels=sum(len(ax.texts) for ax in fig.axes))
         if fig:
-            fig.savefig(args.output, dpi=300, bbox_inches='tight')
+            with stage('write_png'):
+                fig.savefig(args.output, dpi=300, bbox_inches='tight')
             print(f"Calendar visualization saved to {args.output}")
             plt.close(fig)
+    
+    df.save_keyword_cache()
+    finish_timings(args)
+    if args.watch:
+        watch_interests(df, args.interests[0], args)
+        df.save_keyword_cache()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,350 @@
+# Copyright 2025 NVIDIA Corporation. All rights reserved.
+# Licensed under the Apache License, Version 2.0
+#!/usr/bin/env python3
+# tms_server.py
+# Long-running local server that keeps the conference data warm in memory
+
+"""
+Local HTTP/JSON server for the TMS Conference Planner.
+
+The server loads the conference data, builds the search index and scores the
+pre-defined research profiles once at startup, then answers requests from the
+warm corpus, so each request only pays for its own work. Use tms_client.py
+(or any HTTP client) to talk to it.
+
+Endpoints (all responses are JSON, except /calendar which returns HTML):
+
+- GET  /health    Number of sessions and available profiles
+- POST /score     Sessions scored against a profile: {"profile": NAME} or
+                  {"interests": {...}, "weights": {...}}, plus optional
+                  "min_score" (default 3) and "limit"; with "stream": true
+                  the sessions are sent best first as they are ranked, one
+                  JSON object per line (application/x-ndjson), and an error
+                  while streaming ends the stream with an {"error": ...} line
+- POST /search    Multi-term query {"query": ..., "fields": [...]} or
+                  substring search {"keyword": ..., "field": ...}
+- POST /schedule  Relevant sessions of a profile and, with "optimize": true,
+                  the best non-overlapping itinerary ("walk_minutes", default 5)
+- POST /calendar  Interactive calendar of a profile as a standalone HTML page
+                  ("min_score", "symposium_view", "title", "renderer")
+"""
+
+import sys
+import json
+import math
+import types
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from analyze_tms import load_conference_data, find_data_file
+from tms_planner import RESEARCH_PROFILES
+from schedule_optimizer import optimize_schedule
+from plotly_viz import create_interactive_calendar, CALENDAR_RENDERERS
+
+DEFAULT_PORT = 8765
+
+# Session columns included in JSON responses
+SESSION_COLUMNS = ['Date', 'Start', 'End', 'Location', 'Symposium', 'Session', 'Title',
+                   'Speaker', 'SpeakerAffiliation', 'Type']
+
+
+class RequestError(Exception):
+    """A client error, answered with HTTP 400"""
+
+
+def number_param(request, name, default, integer=False, minimum=None):
+    """
+    Get a numeric request parameter.
+
+    Parameters:
+    -----------
+    request : dict
+        The JSON request
+    name : str
+        Parameter name
+    default : int, float or None
+        Value used when the parameter is missing or null
+    integer : bool, optional
+        Require a whole number (default: False)
+    minimum : int or float, optional
+        Smallest allowed value (default: None, no limit)
+
+    Returns:
+    --------
+    int, float or None
+        The parameter value
+
+    Raises:
+    -------
+    RequestError
+        If the value is not a (whole) number or is below the minimum
+    """
+    value = request.get(name)
+    if value is None:
+        return default
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"'{name}' must be a number, not {json.dumps(value)}")
+    if not math.isfinite(number) or (integer and not number.is_integer()):
+        raise RequestError(f"'{name}' must be a {'whole' if integer else 'finite'} number, not {json.dumps(value)}")
+    if minimum is not None and number < minimum:
+        raise RequestError(f"'{name}' must be at least {minimum}")
+    return int(number) if integer or isinstance(value, int) else number
+
+
+def session_records(df, extra_columns=()):
+    """
+    Convert sessions to JSON-ready dictionaries.
+
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Sessions to convert
+    extra_columns : sequence, optional
+        Additional columns to include, e.g. the score (default: none)
+
+    Returns:
+    --------
+    list of dict
+        One dictionary per session, with missing values as None
+    """
+    columns = [col for col in SESSION_COLUMNS if col in df.columns] + list(extra_columns)
+    records = df[columns].astype(object).where(df[columns].notna(), None).to_dict('records')
+    for record, session_id in zip(records, df.index):
+        record['id'] = session_id.item() if isinstance(session_id, np.generic) else session_id
+        if hasattr(record.get('Date'), 'strftime'):
+            record['Date'] = record['Date'].strftime('%Y-%m-%d')
+        for key, value in record.items():
+            if isinstance(value, np.generic):
+                record[key] = value.item()
+            elif not isinstance(value, (str, int, float, bool, type(None))):
+                record[key] = str(value)
+    return records
+
+
+class PlannerService:
+    """
+    Warm conference data and the request handlers that use it.
+
+    Parameters:
+    -----------
+    corpus : SessionCorpus
+        The loaded conference data
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def resolve_profile(self, request):
+        """Get (name, interests, weights) from a request's profile or interests"""
+        if 'profile' in request:
+            name = request['profile']
+            if name not in RESEARCH_PROFILES:
+                raise RequestError(f"Unknown profile '{name}'. Available profiles: "
+                                   f"{', '.join(RESEARCH_PROFILES.keys())}")
+            profile = RESEARCH_PROFILES[name]
+            return name, profile['interests'], profile.get('weights')
+        if 'interests' in request:
+            interests, weights = request['interests'], request.get('weights')
+            if not isinstance(interests, dict) or not all(
+                    isinstance(keywords, list) and all(isinstance(keyword, str) for keyword in keywords)
+                    for keywords in interests.values()):
+                raise RequestError("'interests' must map focus areas to lists of keywords")
+            if weights is not None:
+                if not isinstance(weights, dict):
+                    raise RequestError("'weights' must map focus areas to numbers")
+                weights = {area: number_param(weights, area, 1.0) for area in weights}
+            return 'custom', interests, weights
+        raise RequestError("Specify either 'profile' or 'interests'")
+
+    def score(self, request):
+        name, interests, weights = self.resolve_profile(request)
+        min_score = number_param(request, 'min_score', 3)
+        limit = number_param(request, 'limit', None, integer=True, minimum=0)
+        scored = self.corpus.scored(interests, weights).select(min_score=min_score)
+        if limit is None:
+            limit = len(scored)
+        if request.get('stream'):
+            return self.stream_ranked(scored, limit)
+        sessions = scored.top(limit).frame('score')
+        return {'profile': name, 'min_score': min_score, 'count': len(sessions),
+                'sessions': session_records(sessions, ['score'])}
+
+    def stream_ranked(self, scored, limit):
+        """Yield the session records of a ScoredView best first, ranking them as they are sent"""
+        for rank, (session_id, score) in enumerate(scored.ranked()):
+            if rank >= limit:
+                break
+            yield session_records(self.corpus.df.loc[[session_id]].assign(score=score), ['score'])[0]
+
+    def search(self, request):
+        if 'query' in request:
+            try:
+                matches = self.corpus.search(request['query'], request.get('fields'))
+            except ValueError as e:
+                raise RequestError(str(e))
+            sessions = matches.df
+        elif 'keyword' in request:
+            field = request.get('field')
+            if field is not None and field not in self.corpus.search_index.fields:
+                raise RequestError(f"Unknown field '{field}'")
+            sessions = self.corpus.df[self.corpus.search_index.contains_mask(request['keyword'], field)]
+        else:
+            raise RequestError("Specify either 'query' or 'keyword'")
+        return {'count': len(sessions), 'sessions': session_records(sessions)}
+
+    def schedule(self, request):
+        name, interests, weights = self.resolve_profile(request)
+        min_score = number_param(request, 'min_score', 3)
+        walk_minutes = number_param(request, 'walk_minutes', 5, minimum=0)
+        if weights is None:
+            weights = {interest: 1.0 for interest in interests}
+        relevant = self.corpus.scored(interests, weights).select(min_score=min_score).frame('user_relevance')
+        relevant = relevant.sort_values(['Date', 'Start', 'user_relevance'], ascending=[True, True, False])
+        result = {'profile': name, 'min_score': min_score, 'count': len(relevant),
+                  'sessions': session_records(relevant, ['user_relevance'])}
+        if request.get('optimize'):
+            itinerary = optimize_schedule(relevant, walk_minutes=walk_minutes)
+            result['itinerary'] = session_records(itinerary, ['user_relevance', 'RoomChange'])
+        return result
+
+    def calendar(self, request):
+        name, interests, _ = self.resolve_profile(request)
+        min_score = number_param(request, 'min_score', 3)
+        renderer = request.get('renderer', 'batched')
+        if renderer not in CALENDAR_RENDERERS:
+            raise RequestError(f"Unknown renderer '{renderer}'. Choose from: {', '.join(CALENDAR_RENDERERS)}")
+        fig = create_interactive_calendar(
+            self.corpus,
+            min_score=min_score,
+            focus_areas=interests,
+            title=request.get('title') or f"TMS 2025 - {name.title()} Focus Areas",
+            symposium_view=bool(request.get('symposium_view')),
+            renderer=renderer
+        )
+        if fig is None:
+            raise RequestError(f"No sessions with relevance score >= {min_score} to display")
+        return fig.to_html(include_plotlyjs='cdn', full_html=True)
+
+    def health(self):
+        return {'status': 'ok', 'sessions': len(self.corpus), 'profiles': list(RESEARCH_PROFILES.keys())}
+
+
+def make_handler(service):
+    """Create a request handler class bound to a PlannerService"""
+    routes = {
+        '/score': service.score,
+        '/search': service.search,
+        '/schedule': service.schedule,
+        '/calendar': service.calendar,
+    }
+
+    class PlannerRequestHandler(BaseHTTPRequestHandler):
+        def send_body(self, status, body, content_type):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_json(self, status, payload):
+            self.send_body(status, json.dumps(payload), 'application/json')
+
+        def send_stream(self, records):
+            # No Content-Length: the response ends when the connection closes
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            try:
+                for record in records:
+                    self.wfile.write(json.dumps(record).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading
+                return
+            except Exception as e:
+                # The status line is already sent, so end the stream with an error record
+                self.log_error("Error while streaming %s: %s", self.path, e)
+                self.wfile.write(json.dumps({'error': f"{type(e).__name__}: {e}"}).encode('utf-8') + b'\n')
+
+        def do_GET(self):
+            if self.path == '/health':
+                self.send_json(200, service.health())
+            else:
+                self.send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+        def do_POST(self):
+            handler = routes.get(self.path)
+            if handler is None:
+                self.send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    raise RequestError("The request body must be a JSON object")
+                result = handler(request)
+            except (RequestError, ValueError) as e:
+                self.send_json(400, {'error': str(e)})
+                return
+            except Exception as e:
+                self.send_json(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+
+            if isinstance(result, types.GeneratorType):
+                self.send_stream(result)
+            elif isinstance(result, str):
+                self.send_body(200, result, 'text/html; charset=utf-8')
+            else:
+                self.send_json(200, result)
+
+    return PlannerRequestHandler
+
+
+def main():
+    """Command-line interface for the planner server"""
+    parser = argparse.ArgumentParser(description="Serve TMS conference scoring, search and schedules over HTTP")
+    parser.add_argument("-f", "--file", help="Path to the TMS Excel file (auto-detected if not specified)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                      help=f"Port to listen on (default: {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    file_path = args.file or find_data_file()
+    if not file_path:
+        print("Error: Could not find the Excel file. Please provide the file path with --file option.")
+        return 1
+
+    corpus = load_conference_data(file_path)
+    if corpus is None:
+        print(f"Error: Could not load conference data from {file_path}")
+        return 1
+
+    # Warm up: build the search index (load_conference_data leaves it to the
+    # first search) and score every pre-defined profile in one pass. Scoring
+    # never changes the sessions; the corpus and keyword caches it fills take
+    # their own locks, so the request threads share the corpus
+    corpus.build_search_index()
+    corpus.score_profiles(RESEARCH_PROFILES)
+    corpus.save_keyword_cache()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(PlannerService(corpus)))
+    print(f"TMS planner server with {len(corpus)} sessions listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Tests for SessionCorpus subsets sharing the caches of their parent.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Add the src and benchmarks directories to the path to import modules
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import scoring
+from corpus import SessionCorpus
+from tms_planner import RESEARCH_PROFILES
+from synthetic import make_program
+
+PROFILE = RESEARCH_PROFILES['battery']
+
+
+def test_subset_scores_from_the_parent_caches(monkeypatch):
+    """Scoring a subset slices the parent's matches instead of scanning again"""
+    df = make_program(300)
+    corpus = SessionCorpus(df)
+    scores, _ = corpus.score(PROFILE['interests'], PROFILE.get('weights'))
+
+    scanned = []
+    keyword_hits = scoring._keyword_hits
+    monkeypatch.setattr(scoring, '_keyword_hits',
+                        lambda text, needles, *args, **kwargs: scanned.extend(needles) or
+                        keyword_hits(text, needles, *args, **kwargs))
+    subset = corpus.subset(scores >= 1)
+    nested = subset.subset(subset.index[::2])
+    results = [part.score(PROFILE['interests'], PROFILE.get('weights')) for part in (subset, nested)]
+
+    assert not scanned
+    assert nested.hit_cache is corpus.hit_cache
+    monkeypatch.undo()
+    for part, (part_scores, part_matches) in zip((subset, nested), results):
+        fresh_scores, fresh_matches = SessionCorpus(df.loc[part.index]).score(PROFILE['interests'],
+                                                                            PROFILE.get('weights'))
+        pd.testing.assert_series_equal(part_scores, fresh_scores)
+        pd.testing.assert_frame_equal(part_matches, fresh_matches)
@@ -0,0 +1,64 @@
+"""
+Tests for the binary cache of the conference workbook.
+"""
+
+import os
+import sys
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import data_cache
+from data_cache import read_excel_cached, storable_frame
+
+WORKBOOK = pd.DataFrame({
+    'Date': pd.to_datetime(['2025-03-23', '2025-03-24', None]),
+    'Start': pd.Series([datetime.time(9, 30), 'TBD', np.nan], dtype=object),
+    'Title': ['Titanium alloys', 'Batteries', np.nan],
+    'Room': pd.Series([101, 'Hall B', 102], dtype=object),
+    'Seats': [100, 250, 80],
+})
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / 'program.xlsx')
+    WORKBOOK.to_excel(path, index=False)
+    return path
+
+
+def test_mixed_columns_are_cached_as_text(workbook, capsys):
+    first = read_excel_cached(workbook)
+    second = read_excel_cached(workbook)
+
+    assert 'Loaded conference data from cache' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(first, read_excel_cached(workbook, use_cache=False))
+    assert first['Room'].tolist() == ['101', 'Hall B', '102']
+    pd.testing.assert_frame_equal(first, storable_frame(pd.read_excel(workbook)))
+
+
+def test_interrupted_write_keeps_the_previous_cache(workbook, monkeypatch):
+    df = read_excel_cached(workbook)
+    meta_path, data_prefix = data_cache.cache_paths(workbook)
+    with open(data_prefix + '.npz', 'rb') as f:
+        archive = f.read()
+
+    def interrupted_savez(f, **arrays):
+        f.write(b'partial')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(data_cache.np, 'savez', interrupted_savez)
+    with pytest.raises(KeyboardInterrupt):
+        read_excel_cached(workbook, rebuild=True)
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(os.path.dirname(workbook))) == sorted(
+        os.path.basename(path) for path in (workbook, meta_path, data_prefix + '.npz'))
+    with open(data_prefix + '.npz', 'rb') as f:
+        assert f.read() == archive
+    pd.testing.assert_frame_equal(read_excel_cached(workbook), df)
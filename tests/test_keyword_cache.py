@@ -0,0 +1,92 @@
+"""
+Tests for the keyword hit cache shared by the scorers.
+"""
+
+import os
+import sys
+import random
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from keyword_cache import KeywordHitCache, corpus_fingerprint
+from scoring import keyword_match_matrix, score_profiles
+
+TEXT = pd.Series(["alpha beta", "gamma", "delta alpha", "epsilon"], dtype=object)
+
+
+def make_cache(max_keywords):
+    return KeywordHitCache(corpus_fingerprint(TEXT), len(TEXT), max_keywords=max_keywords)
+
+
+def test_rescoring_past_max_keywords_keeps_cached_hits():
+    """Adding new keywords to a full cache must not lose the cached ones still needed"""
+    hits = make_cache(3)
+    keyword_match_matrix(TEXT, {'a': ['alpha', 'beta', 'gamma']}, method='substring', hits=hits)
+    matches = keyword_match_matrix(TEXT, {'a': ['alpha', 'delta']}, method='substring', hits=hits)
+
+    assert matches[('a', 'alpha')].tolist() == [True, False, True, False]
+    assert matches[('a', 'delta')].tolist() == [False, False, True, False]
+    assert len(hits) == 3
+
+
+def test_profile_with_more_keywords_than_the_cache():
+    """A profile may have more distinct keywords than the cache holds"""
+    hits = make_cache(2)
+    focus_areas = {'a': ['alpha', 'beta', 'gamma'], 'b': ['delta', 'epsilon']}
+    matches = keyword_match_matrix(TEXT, focus_areas, method='substring', hits=hits)
+    expected = keyword_match_matrix(TEXT, focus_areas, method='substring')
+
+    pd.testing.assert_frame_equal(matches, expected)
+    assert len(hits) == 2
+
+    profiles = {'p': {'interests': focus_areas}}
+    (scores, _), = score_profiles(pd.DataFrame({'Title': TEXT}), profiles, text=TEXT, method='substring',
+                                  hits=hits).values()
+    (expected_scores, _), = score_profiles(pd.DataFrame({'Title': TEXT}), profiles, text=TEXT,
+                                           method='substring').values()
+    np.testing.assert_array_equal(np.asarray(scores), np.asarray(expected_scores))
+
+
+def test_get_refreshes_recency():
+    hits = make_cache(2)
+    hits['alpha'] = [True, False, True, False]
+    hits['beta'] = [True, False, False, False]
+    assert hits.get('alpha') is not None
+    hits['gamma'] = [False, True, False, False]
+
+    assert 'alpha' in hits and 'beta' not in hits
+    assert hits.get('beta') is None
+
+
+def test_concurrent_access_to_a_full_cache():
+    """Threads reading and adding keywords while others evict them never see a KeyError"""
+    hits = KeywordHitCache('fingerprint', 64, max_keywords=4)
+    errors = []
+
+    def work(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(20000):
+                needle = f"keyword {rng.randint(0, 7)}"
+                if hits.get(needle) is None:
+                    hits[needle] = np.ones(64, dtype=bool)
+        except Exception as e:
+            errors.append(e)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert not errors, errors[:3]
+    assert len(hits) == 4
@@ -0,0 +1,121 @@
+"""
+Tests for the planner server answering requests from several threads.
+"""
+
+import os
+import sys
+import json
+import random
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+# Add the src and benchmarks directories to the path to import modules
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+from corpus import SessionCorpus
+from keyword_cache import KeywordHitCache, corpus_fingerprint
+from tms_planner import RESEARCH_PROFILES
+from tms_server import PlannerService, make_handler
+from synthetic import make_program
+
+KEYWORDS = sorted({keyword for profile in RESEARCH_PROFILES.values()
+                   for area_keywords in profile['interests'].values() for keyword in area_keywords})
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    corpus = SessionCorpus(make_program(300))
+    corpus.build_search_index()
+    # A small keyword cache, so concurrent requests keep evicting each other's keywords
+    corpus._hits = KeywordHitCache(corpus_fingerprint(corpus.text), len(corpus), max_keywords=16)
+    return corpus
+
+
+def serve(service):
+    """Start a server for a PlannerService in a thread, returning it and its URL"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture(scope='module')
+def server_url(corpus):
+    server, url = serve(PlannerService(corpus))
+    # Switch threads often, so races between requests show up on one core too
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield url
+    sys.setswitchinterval(switch_interval)
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, endpoint, payload):
+    """POST a JSON request, returning (status, body)"""
+    request = urllib.request.Request(url + endpoint, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+
+def test_concurrent_score_requests(server_url):
+    """Random profiles scored from 8 threads at once all succeed"""
+    rng = random.Random(0)
+    requests = [{'interests': {f"Area {area}": rng.sample(KEYWORDS, rng.randint(3, 8)) for area in range(3)},
+                 'min_score': 1, 'limit': 5}
+                for _ in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda payload: post(server_url, '/score', payload), requests))
+
+    errors = [body for status, body in responses if status != 200]
+    assert not errors, errors[:3]
+
+    # Each response matches the same request answered alone
+    for payload, (_, body) in list(zip(requests, responses))[:20]:
+        assert json.loads(body) == json.loads(post(server_url, '/score', payload)[1])
+
+
+@pytest.mark.parametrize('endpoint, payload', [
+    ('/score', {'profile': 'battery', 'min_score': 'high'}),
+    ('/score', {'profile': 'battery', 'limit': 2.5}),
+    ('/score', {'profile': 'battery', 'limit': -1, 'stream': True}),
+    ('/score', {'profile': 'battery', 'min_score': 'high', 'stream': True}),
+    ('/score', {'interests': {'a': 'titanium'}}),
+    ('/score', {'interests': {'a': ['titanium']}, 'weights': {'a': 'heavy'}}),
+    ('/schedule', {'profile': 'battery', 'optimize': True, 'walk_minutes': [5]}),
+    ('/calendar', {'profile': 'battery', 'min_score': 'x'}),
+])
+def test_invalid_parameters_are_client_errors(server_url, endpoint, payload):
+    status, body = post(server_url, endpoint, payload)
+    assert status == 400, body
+    assert 'error' in json.loads(body)
+
+
+def test_error_while_streaming_ends_with_an_error_record(corpus):
+    class FailingService(PlannerService):
+        def stream_ranked(self, scored, limit):
+            for rank, record in enumerate(super().stream_ranked(scored, limit)):
+                if rank == 2:
+                    raise RuntimeError("ranking failed")
+                yield record
+
+    server, url = serve(FailingService(corpus))
+    try:
+        status, body = post(url, '/score', {'profile': 'battery', 'min_score': 0, 'stream': True})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert status == 200
+    assert len(lines) == 3 and all('id' in line for line in lines[:2])
+    assert lines[2] == {'error': "RuntimeError: ranking failed"}